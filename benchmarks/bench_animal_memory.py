@@ -0,0 +1,36 @@
+"""
+Benchmark comparing the memory used by animal dicts and compact Animal records
+"""
+
+import tracemalloc
+
+from d1_project_pitch.src.zoo_animal_management import add_new_animal
+from d1_project_pitch.src.zoo_species_data import SPECIES_HEALTH_BASELINES
+
+ANIMAL_COUNT = 200000
+
+def measure(compact):
+    """
+    Measure the memory held by a population of new animals
+    """
+    species = list(SPECIES_HEALTH_BASELINES)
+
+    tracemalloc.start()
+    animals = [add_new_animal(f"ANIMAL{i:07d}", f"Animal {i}", species[i % len(species)], i % 20 + 1, compact=compact)
+               for i in range(ANIMAL_COUNT)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size, animals
+
+def main():
+    dict_size, _ = measure(compact=False)
+    compact_size, _ = measure(compact=True)
+
+    print(f"{ANIMAL_COUNT} animals")
+    print(f"dicts:   {dict_size / 1e6:8.1f} MB ({dict_size / ANIMAL_COUNT:6.0f} bytes per animal)")
+    print(f"compact: {compact_size / 1e6:8.1f} MB ({compact_size / ANIMAL_COUNT:6.0f} bytes per animal)")
+    print(f"saving:  {1 - compact_size / dict_size:8.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark for the whole zoo 90 day feeding forecast
+"""
+
+import time
+from d1_project_pitch.src.zoo_feeding_forecast import generate_feeding_forecast
+from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule
+
+ANIMAL_COUNT = 100000
+HABITAT_COUNT = 20
+
+def make_population(count):
+    """
+    Make a mixed population spread across the habitats
+    """
+    diets = ["carnivore", "herbivore", "omnivore"]
+    statuses = ["healthy", "needs attention", "critical"]
+    animals = [{
+        "animal_id": f"ANIMAL{i:06d}",
+        "diet": diets[i % 3],
+        "weight_kg": 20 + i % 400,
+        "health_status": statuses[i % 7 % 3]
+    } for i in range(count)]
+    habitats = {f"habitat{h}": {"current_animals": [animal["animal_id"] for animal in animals[h::HABITAT_COUNT]]}
+                for h in range(HABITAT_COUNT)}
+    return animals, habitats
+
+def main():
+    animals, habitats = make_population(ANIMAL_COUNT)
+
+    start = time.perf_counter()
+    forecast = generate_feeding_forecast(animals, habitats, days=90)
+    forecast_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    meat = sum(schedule["daily_amount_kg"] for schedule in map(calculate_feeding_schedule, animals)
+               if schedule["food_type"] == "meat") * 90
+    loop_time = time.perf_counter() - start
+
+    print(f"90 day forecast for {ANIMAL_COUNT} animals: {forecast_time:.3f}s "
+          f"(meat {forecast['totals']['meat']:.0f}kg)")
+    print(f"calculate_feeding_schedule loop, one day: {loop_time:.3f}s (meat x90 {meat:.0f}kg)")
+
+if __name__ == "__main__":
+    main()
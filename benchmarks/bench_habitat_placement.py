@@ -0,0 +1,97 @@
+"""
+Benchmark for placing a large shipment of animals into many habitats at once
+"""
+
+import random
+import time
+from d1_project_pitch.src.zoo_habitat_placement import solve_placement, apply_placement
+from d1_project_pitch.src.zoo_species_data import ZOO_HABITATS, SPECIES_HEALTH_BASELINES
+
+ANIMAL_COUNT = 5000
+HABITAT_COPIES = 40
+
+MIXED_SPECIES_COUNT = 40
+MIXED_HABITAT_COUNT = 400
+
+TRAIT_KEYS = ("diet", "habitat_type", "temperament", "social_needs")
+
+def make_zoo_habitats(copies):
+    """
+    Make copies of the zoo's habitats with random capacities
+    """
+    rng = random.Random(1)
+    return {f"{habitat_name}{i}": {
+        "name": f"{habitat['name']} {i}",
+        "capacity": rng.randint(5, 60),
+        "current_animals": [],
+        "compatible_species": habitat["compatible_species"]
+    } for i in range(copies) for habitat_name, habitat in ZOO_HABITATS.items()}
+
+def make_zoo_animals(count):
+    """
+    Make a shipment of animals of the catalog species
+    """
+    rng = random.Random(2)
+    species_names = list(SPECIES_HEALTH_BASELINES)
+    animals = []
+    for i in range(count):
+        species = rng.choice(species_names)
+        data = SPECIES_HEALTH_BASELINES[species]
+        animals.append({"animal_id": f"ANIMAL{i:05d}", "name": f"Animal {i}", "species": species,
+                        **{key: data[key] for key in TRAIT_KEYS}})
+    return animals
+
+def make_mixed_zoo(species_count, habitat_count, animal_count):
+    """
+    Make made-up species with random traits, habitats that each take a random set of them and a shipment
+
+    Every habitat has its own list of species, so no two habitats are the same,
+    and there is less space than animals so the types chosen matter
+    """
+    rng = random.Random(3)
+    species = {f"Species{i:02d}": {
+        "diet": rng.choice(["carnivore", "herbivore", "omnivore"]),
+        "habitat_type": rng.choice(["savannah", "forest", "aquatic", "arctic"]),
+        "temperament": rng.choice(["calm", "aggressive", "timid"]),
+        "social_needs": rng.choice(["solitary", "territorial", "herd", "pack", "pair"])
+    } for i in range(species_count)}
+    species_names = list(species)
+
+    habitats = {f"habitat{i:03d}": {
+        "name": f"Habitat {i}",
+        "capacity": rng.randint(5, 15),
+        "current_animals": [],
+        "compatible_species": rng.sample(species_names, rng.randint(3, 12))
+    } for i in range(habitat_count)}
+
+    animals = []
+    for i in range(animal_count):
+        species_name = rng.choice(species_names)
+        animals.append({"animal_id": f"ANIMAL{i:05d}", "name": f"Animal {i}", "species": species_name,
+                        **species[species_name]})
+    return animals, habitats
+
+def run(label, animals, habitats):
+    """
+    Solve and apply one placement and print the timings
+    """
+    start = time.perf_counter()
+    placement = solve_placement(animals, habitats, animals)
+    solve_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    placed, refused = apply_placement(placement, animals, habitats, animals)
+    apply_time = time.perf_counter() - start
+
+    print(f"{label}: placed {placement['placed']} of {len(animals)} animals in {len(habitats)} habitats: "
+          f"{solve_time:.3f}s (optimal {placement['optimal']})")
+    print(f"  applied {len(placed)} assignments, {len(refused)} refused: {apply_time:.3f}s")
+
+def main():
+    run("zoo habitats", make_zoo_animals(ANIMAL_COUNT), make_zoo_habitats(HABITAT_COPIES))
+
+    animals, habitats = make_mixed_zoo(MIXED_SPECIES_COUNT, MIXED_HABITAT_COUNT, ANIMAL_COUNT)
+    run("mixed species", animals, habitats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark for loading a sharded data directory with more and more worker processes
+"""
+
+import json
+import os
+import tempfile
+import time
+from d1_project_pitch.src.zoo_sharded_storage import save_sharded_animals, load_sharded_animals
+
+ANIMAL_COUNT = 50000
+SHARD_COUNT = 32
+
+def make_animals(count):
+    """
+    Make a population of animals with a few health and feeding records each
+    """
+    return [{
+        "animal_id": f"ZEBRA{i:06d}",
+        "name": f"Zebra {i}",
+        "species": "Zebra",
+        "age": i % 20 + 1,
+        "health_records": [{"date": "2025-10-31T16:52:10.714937",
+                            "data": {"weight_kg": 300.0, "temperature_c": 37.5, "heart_rate": 70,
+                                     "vaccination_status": "current", "vet_notes": "no concerns"}}] * 3,
+        "current_medications": [],
+        "feeding_history": [{"time": "08:00", "amount_kg": 9.0, "food_type": "hay",
+                             "keeper": "Sam", "timestamp": "2025-10-31T08:01:12.191073"}] * 5,
+        "diet": "herbivore",
+        "habitat_type": "savannah",
+        "temperament": "timid",
+        "social_needs": "herd"
+    } for i in range(count)]
+
+def time_call(function, *args, **kwargs):
+    """
+    Time one call of a function
+    """
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    animals = make_animals(ANIMAL_COUNT)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        single_file = os.path.join(temp_dir, "zoo_data.json")
+        with open(single_file, 'w') as file:
+            json.dump(animals, file)
+
+        shard_dir = os.path.join(temp_dir, "zoo_shards")
+        save_sharded_animals(animals, shard_dir, SHARD_COUNT)
+
+        def load_single_file():
+            with open(single_file, 'r') as file:
+                json.load(file)
+
+        baseline = time_call(load_single_file)
+        print(f"{ANIMAL_COUNT} animals, {SHARD_COUNT} shards")
+        print(f"single file json.load: {baseline:.3f}s")
+
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            seconds = time_call(load_sharded_animals, shard_dir, max_workers=workers)
+            print(f"{workers:>3} workers: {seconds:.3f}s ({baseline / seconds:.2f}x single file)")
+            workers *= 2
+
+if __name__ == "__main__":
+    main()
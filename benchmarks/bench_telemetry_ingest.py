@@ -0,0 +1,57 @@
+"""
+Benchmark for ingesting collar telemetry from JSONL and CSV
+"""
+
+import io
+import json
+import time
+from d1_project_pitch.src.zoo_telemetry import TelemetryPipeline, read_telemetry
+
+ANIMAL_COUNT = 200
+READING_COUNT = 500000
+
+def make_animals(count):
+    """
+    Make a population of collared lions
+    """
+    return [{"animal_id": f"LION{i:04d}", "species": "Lion"} for i in range(count)]
+
+def make_telemetry(count, animal_count):
+    """
+    Make JSONL and CSV telemetry with one reading per animal every few seconds
+    """
+    json_lines = []
+    csv_lines = ["animal_id,timestamp,heart_rate,temperature_c\n"]
+
+    for i in range(count):
+        animal_id = f"LION{i % animal_count:04d}"
+        timestamp = 1735689600 + (i // animal_count) * 5
+        heart_rate = 50 + i % 20
+        temperature = 38.0 + (i % 10) / 10
+        json_lines.append(json.dumps({"animal_id": animal_id, "timestamp": timestamp,
+                                      "heart_rate": heart_rate, "temperature_c": temperature}) + "\n")
+        csv_lines.append(f"{animal_id},{timestamp},{heart_rate},{temperature}\n")
+
+    return "".join(json_lines), "".join(csv_lines)
+
+def time_ingest(animals, text, telemetry_format):
+    """
+    Time ingesting one telemetry stream and give the readings per second
+    """
+    pipeline = TelemetryPipeline(animals)
+    start = time.perf_counter()
+    pipeline.ingest(read_telemetry(io.StringIO(text), telemetry_format))
+    elapsed = time.perf_counter() - start
+    return pipeline, READING_COUNT / elapsed
+
+def main():
+    animals = make_animals(ANIMAL_COUNT)
+    json_text, csv_text = make_telemetry(READING_COUNT, ANIMAL_COUNT)
+
+    for telemetry_format, text in (("jsonl", json_text), ("csv", csv_text)):
+        pipeline, rate = time_ingest(animals, text, telemetry_format)
+        print(f"{telemetry_format:>5}: {rate:,.0f} readings/sec, {pipeline.flush()} buckets, "
+              f"{len(pipeline.alerts)} alerts")
+
+if __name__ == "__main__":
+    main()
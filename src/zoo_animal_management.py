@@ -3,6 +3,8 @@ File that is responsbile for the animal management system of the zoo
 """
 
 from d1_project_pitch.src.zoo_species_data import get_species_data, SPECIES_HEALTH_BASELINES
+from d1_project_pitch.src.zoo_animal_registry import find_animal
+from d1_project_pitch.src.zoo_animal_record import Animal
 
 def validate_animal_data(animal_id, name, species, age):
     """
@@ -29,14 +31,14 @@ def is_duplicate_animal_id(animal_id, animals_list):
     """
     Check if an animal ID already exists in the system
     """
-    for animal in animals_list: 
-        if animal["animal_id"] == animal_id: 
-            return True 
-    return False
+    return find_animal(animal_id, animals_list) is not None
 
-def add_new_animal(animal_id, name, species, age=0, existing_animals=None):
+def add_new_animal(animal_id, name, species, age=0, existing_animals=None, compact=False):
     """
     Adds a new animal to the system
+
+    With compact=True a slotted Animal record sharing its species profile is
+    returned instead of a dict
     """
 
     is_valid, error_message = validate_animal_data(animal_id, name, species, age) 
@@ -49,6 +51,9 @@ def add_new_animal(animal_id, name, species, age=0, existing_animals=None):
         print(f"Duplicate animal ID: {animal_id}") 
         return None
     
+    if compact:
+        return Animal(animal_id, name, species, age)
+
     species_data = get_species_data(species)
 
     animal = { 
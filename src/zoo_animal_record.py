@@ -0,0 +1,273 @@
+"""
+File that holds the compact animal record and the shared species profiles
+"""
+
+from collections import namedtuple
+from d1_project_pitch.src.zoo_species_data import get_species_data, get_baselines_version
+from d1_project_pitch.src.zoo_persistent_history import HistoryVector
+from d1_project_pitch.src.zoo_feeding_log import FeedingLog, FeedingRow
+
+SpeciesProfile = namedtuple("SpeciesProfile", ["diet", "habitat_type", "temperament", "social_needs"])
+
+UNKNOWN_PROFILE = SpeciesProfile("unknown", "unknown", "unknown", "unknown")
+
+TRAIT_KEYS = SpeciesProfile._fields
+FIELD_KEYS = ("animal_id", "name", "species", "age", "health_records", "current_medications", "feeding_history")
+
+_species_profiles = {}
+_profiles_version = get_baselines_version()
+
+def get_species_profile(species):
+    """
+    Get the one shared profile for a species, building it the first time it is asked for
+
+    Changing a species baseline drops the profiles built before, records made
+    earlier keep the profile they were made with, the same as a dict keeps its traits
+    """
+    global _profiles_version
+
+    if _profiles_version != get_baselines_version():
+        _species_profiles.clear()
+        _profiles_version = get_baselines_version()
+
+    profile = _species_profiles.get(species)
+
+    if profile is None:
+        species_data = get_species_data(species)
+        if species_data:
+            profile = SpeciesProfile(*(species_data[key] for key in TRAIT_KEYS))
+        else:
+            profile = UNKNOWN_PROFILE
+        _species_profiles[species] = profile
+
+    return profile
+
+class Animal:
+    """
+    Compact animal record that can be used anywhere an animal dict is used
+
+    The fields live in __slots__ and the diet, habitat type, temperament and
+    social needs are read from a species profile shared by every animal of
+    that species. Keys that are not fields or traits go in a small extra dict
+    that is only made when needed
+    """
+
+    __slots__ = FIELD_KEYS + ("profile", "extra")
+
+    def __init__(self, animal_id, name, species, age=0, health_records=None,
+                 current_medications=None, feeding_history=None, profile=None):
+        self.animal_id = animal_id
+        self.name = name
+        self.species = species
+        self.age = age
+        self.health_records = [] if health_records is None else health_records
+        self.current_medications = [] if current_medications is None else current_medications
+        self.feeding_history = [] if feeding_history is None else feeding_history
+        self.profile = get_species_profile(species) if profile is None else profile
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Make a compact record from an animal dict
+
+        Traits that match the species profile are shared, anything else is kept in extra.
+        A dict without any traits gets no profile, so it round trips unchanged
+        """
+        animal = cls.__new__(cls)
+        animal.extra = None
+        animal.profile = get_species_profile(data.get("species")) if any(key in data for key in TRAIT_KEYS) else None
+
+        for key, value in data.items():
+            animal[key] = value
+
+        return animal
+
+    def __getitem__(self, key):
+        if key in FIELD_KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+
+        if key in TRAIT_KEYS and self.profile is not None:
+            return getattr(self.profile, key)
+
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in FIELD_KEYS:
+            setattr(self, key, value)
+            return
+
+        #a trait that matches the profile does not need its own copy
+        if key in TRAIT_KEYS and self.profile is not None and getattr(self.profile, key) == value:
+            if self.extra is not None:
+                self.extra.pop(key, None)
+            return
+
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in FIELD_KEYS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+
+        #a trait read from the shared profile is copied out so the others stay when it is deleted
+        if key in TRAIT_KEYS and self.profile is not None:
+            extra = self.extra if self.extra is not None else {}
+            for trait in TRAIT_KEYS:
+                extra.setdefault(trait, getattr(self.profile, trait))
+            self.extra = extra
+            self.profile = None
+
+        if self.extra is None or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = [key for key in FIELD_KEYS if hasattr(self, key)]
+        if self.profile is not None:
+            keys.extend(TRAIT_KEYS)
+        if self.extra:
+            keys.extend(key for key in self.extra if key not in keys)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, other=(), **kwargs):
+        for key, value in dict(other, **kwargs).items():
+            self[key] = value
+
+    def copy(self):
+        """
+        Shallow copy, sharing the history lists the same way dict.copy does
+        """
+        animal = Animal.__new__(Animal)
+        for key in FIELD_KEYS:
+            if hasattr(self, key):
+                setattr(animal, key, getattr(self, key))
+        animal.profile = self.profile
+        animal.extra = None if self.extra is None else self.extra.copy()
+        return animal
+
+    def with_appended(self, key, record, make_history=HistoryVector):
+        """
+        Get a new version of the animal with a record added to one of its histories
+
+        The new version shares every field and the history with this one, and
+        this one keeps seeing the history as it was. A plain list history is
+        copied into make_history the first time, after that appends are O(1)
+        """
+        history = getattr(self, key, None)
+        if not isinstance(history, (HistoryVector, FeedingLog)):
+            history = make_history(history or ())
+
+        animal = self.copy()
+        setattr(animal, key, history.appended(record))
+        return animal
+
+    def to_dict(self):
+        """
+        Get the animal as a plain dict in the same shape add_new_animal makes
+        """
+        return {key: value.to_list() if isinstance(value, (HistoryVector, FeedingLog)) else value for key, value in self.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, Animal):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Animal({self.to_dict()!r})"
+
+def compact_animals(animals):
+    """
+    Turn a list of animal dicts into compact records
+    """
+    return [Animal.from_dict(animal) if isinstance(animal, dict) else animal for animal in animals]
+
+def append_to_history(animal, key, record, make_history=HistoryVector):
+    """
+    Get a new version of an animal with a record added to one of its histories
+
+    The animal passed in is left as it was. Compact records share their
+    history through make_history, animal dicts keep plain lists so the new
+    version gets its own copy of the list
+    """
+    if isinstance(animal, Animal):
+        return animal.with_appended(key, record, make_history)
+
+    history = animal.get(key)
+    updated_animal = animal.copy()
+    if isinstance(history, (HistoryVector, FeedingLog)):
+        updated_animal[key] = history.appended(record)
+    else:
+        updated_animal[key] = [*(history or ()), record]
+    return updated_animal
+
+def animals_to_dicts(animals):
+    """
+    Get a list of plain dicts for saving, leaving dicts that only hold plain lists as they are
+    """
+    dicts = []
+    for animal in animals:
+        if isinstance(animal, Animal):
+            animal = animal.to_dict()
+        elif any(isinstance(value, (HistoryVector, FeedingLog)) for value in animal.values()):
+            animal = {key: value.to_list() if isinstance(value, (HistoryVector, FeedingLog)) else value
+                      for key, value in animal.items()}
+        dicts.append(animal)
+    return dicts
+
+def to_json_value(value):
+    """
+    Default hook for json.dump so compact records and their histories are written as plain JSON
+    """
+    if isinstance(value, Animal):
+        return value.to_dict()
+    if isinstance(value, (HistoryVector, FeedingLog)):
+        return value.to_list()
+    if isinstance(value, FeedingRow):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
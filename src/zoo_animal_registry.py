@@ -0,0 +1,255 @@
+"""
+File that keeps the animals in insertion order with an index by animal ID
+"""
+
+from d1_project_pitch.src.zoo_change_tracking import TrackedAnimalList
+from d1_project_pitch.src.zoo_health_tracking import calculate_health_status
+from d1_project_pitch.src.zoo_health_cache import get_cached_health_status
+from d1_project_pitch.src.zoo_habitat_version import mark_habitats_changed
+
+INDEXED_TRAITS = ["species", "diet", "habitat_type", "temperament", "social_needs"]
+
+class AnimalRegistry(TrackedAnimalList):
+    """
+    List of animals with a dict index from animal_id to position
+
+    It still iterates, indexes and appends like the plain list the rest of
+    the system uses, but looking up, adding and replacing an animal by ID
+    is O(1) instead of a scan over every animal.
+
+    It also keeps secondary indexes from each trait value (and the last
+    calculated health status) to the IDs that have it, updated whenever an
+    animal is added, replaced or removed
+    """
+
+    def __init__(self, animals=()):
+        super().__init__(animals)
+        self.positions = {}
+        self.reindex()
+
+        self.indexes = {field: {} for field in INDEXED_TRAITS + ["health_status"]}
+        self.indexed_values = {}
+        for animal in self:
+            self.index_animal(animal)
+
+    def index_animal(self, animal):
+        """
+        Put an animal's traits and health status into the secondary indexes
+        """
+        animal_id = animal["animal_id"]
+        old_values = self.indexed_values.get(animal_id)
+        self.unindex_animal(animal_id)
+
+        values = {field: animal.get(field) for field in INDEXED_TRAITS}
+
+        #the habitat trait totals hold the traits an animal had when it was counted
+        if old_values is None or any(old_values[field] != values[field] for field in INDEXED_TRAITS):
+            mark_habitats_changed()
+
+        #feedings and other updates leave the health records alone, so this is usually a cache hit
+        values["health_status"] = get_cached_health_status(animal)[0]
+
+        for field, value in values.items():
+            self.indexes[field].setdefault(value, set()).add(animal_id)
+        self.indexed_values[animal_id] = values
+
+    def unindex_animal(self, animal_id):
+        """
+        Take an animal out of the secondary indexes
+        """
+        values = self.indexed_values.pop(animal_id, None)
+        if values is None:
+            return
+
+        for field, value in values.items():
+            ids = self.indexes[field][value]
+            ids.discard(animal_id)
+            if not ids:
+                del self.indexes[field][value]
+
+    def mark_changed(self, animal):
+        super().mark_changed(animal)
+        self.index_animal(animal)
+
+    def mark_removed(self, animal):
+        super().mark_removed(animal)
+        self.unindex_animal(animal["animal_id"])
+        mark_habitats_changed()
+
+    def get_health_status(self, animal_id):
+        """
+        Get the health status calculated when the animal last changed
+        """
+        values = self.indexed_values.get(animal_id)
+        return values["health_status"] if values else None
+
+    def find_ids(self, **criteria):
+        """
+        Get the set of IDs that match every field=value given
+
+        Starts from the smallest matching index entry so only matching animals are touched
+        """
+        matches = sorted((self.indexes[field].get(value, set()) for field, value in criteria.items()), key=len)
+
+        if not matches:
+            return set(self.positions)
+
+        ids = set(matches[0])
+        for other in matches[1:]:
+            ids &= other
+        return ids
+
+    def find_animals(self, **criteria):
+        """
+        Get the animals that match every field=value given, in insertion order
+
+        For example find_animals(health_status="healthy", diet="carnivore")
+        """
+        ids = sorted(self.find_ids(**criteria), key=self.positions.get)
+        return [self.get(animal_id) for animal_id in ids]
+
+    def count_animals(self, **criteria):
+        """
+        Count the animals that match every field=value given
+        """
+        return len(self.find_ids(**criteria))
+
+    def reindex(self):
+        """
+        Rebuild the index after the list was reordered or shortened
+
+        The first animal with an ID wins, the same as a scan would find
+        """
+        self.positions = {}
+        for position, animal in enumerate(self):
+            self.positions.setdefault(animal["animal_id"], position)
+
+    def get(self, animal_id, default=None):
+        """
+        Get an animal by ID
+        """
+        position = self.positions.get(animal_id)
+        if position is None:
+            return default
+        return list.__getitem__(self, position)
+
+    def has_animal(self, animal_id):
+        """
+        Check if an animal ID is already in the registry
+        """
+        return animal_id in self.positions
+
+    def replace(self, animal):
+        """
+        Swap in an updated copy of an animal that is already in the registry
+        """
+        position = self.positions.get(animal["animal_id"])
+        if position is None:
+            return False
+
+        self[position] = animal
+        return True
+
+    def put(self, animal):
+        """
+        Add an animal, or replace it if the ID is already in the registry
+        """
+        if not self.replace(animal):
+            self.append(animal)
+
+    def append(self, animal):
+        self.positions.setdefault(animal["animal_id"], len(self))
+        super().append(animal)
+
+    def __setitem__(self, index, value):
+        old_ids = [animal["animal_id"] for animal in self[index]] if isinstance(index, slice) else [self[index]["animal_id"]]
+        super().__setitem__(index, value)
+
+        #swapping in an updated copy of the same animal keeps the index as it is
+        if isinstance(index, slice) or old_ids != [value["animal_id"]]:
+            self.reindex()
+
+    def insert(self, index, animal):
+        super().insert(index, animal)
+        self.reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.reindex()
+
+    def pop(self, index=-1):
+        animal = super().pop(index)
+        self.reindex()
+        return animal
+
+    def remove(self, animal):
+        super().remove(animal)
+        self.reindex()
+
+    def clear(self):
+        super().clear()
+        self.positions = {}
+
+    def sort(self, *, key=None, reverse=False):
+        super().sort(key=key, reverse=reverse)
+        self.reindex()
+
+    def reverse(self):
+        super().reverse()
+        self.reindex()
+
+    def __iadd__(self, animals):
+        #extend goes through append, so every new animal is indexed and tracked
+        self.extend(animals)
+        return self
+
+    def __imul__(self, count):
+        animals = list(self)
+        if count <= 0:
+            self.clear()
+        else:
+            for _ in range(count - 1):
+                self.extend(animals)
+        return self
+
+def find_animal(animal_id, animals):
+    """
+    Find an animal by ID in a registry or in a plain list of animals
+    """
+    if isinstance(animals, AnimalRegistry):
+        return animals.get(animal_id)
+
+    for animal in animals:
+        if animal.get('animal_id') == animal_id:
+            return animal
+    return None
+
+def replace_animal(animals, updated_animal):
+    """
+    Put an updated copy of an animal back in place of the old one
+    """
+    if isinstance(animals, AnimalRegistry):
+        return animals.replace(updated_animal)
+
+    for i, animal in enumerate(animals):
+        if animal['animal_id'] == updated_animal['animal_id']:
+            animals[i] = updated_animal
+            return True
+    return False
+
+def find_animals_matching(animals, **criteria):
+    """
+    Find the animals matching every field=value given in a registry or a plain list
+    """
+    if isinstance(animals, AnimalRegistry):
+        return animals.find_animals(**criteria)
+
+    matches = []
+    for animal in animals:
+        values = {field: animal.get(field) for field in criteria if field != "health_status"}
+        if "health_status" in criteria:
+            values["health_status"] = calculate_health_status(animal)[0]
+        if values == criteria:
+            matches.append(animal)
+    return matches
+
@@ -1,4 +1,30 @@
 
+from d1_project_pitch.src.zoo_species_data import SPECIES_HEALTH_BASELINES, get_baselines_version
+
+COMPATIBILITY_TRAITS = ("diet", "habitat_type", "temperament", "social_needs")
+
+SOLITARY_NEEDS = frozenset(["solitary", "territorial"])
+SOCIAL_NEEDS = frozenset(["group", "pack", "herd", "pride"])
+
+#social class bits, so the social needs of a whole habitat fit in one mask
+SOLITARY_CLASS = 1
+SOCIAL_CLASS = 2
+
+#reason codes stored in the compatibility matrix, in the order the checks are made
+COMPATIBLE = 0
+INCOMPATIBLE_DIETS = 1
+INCOMPATIBLE_HABITATS = 2
+INCOMPATIBLE_TEMPERAMENTS = 3
+INCOMPATIBLE_SOCIAL_NEEDS = 4
+
+COMPATIBILITY_REASONS = {
+    COMPATIBLE: "Animals are compatible!",
+    INCOMPATIBLE_DIETS: "Animals have incompatible diets.",
+    INCOMPATIBLE_HABITATS: "Animals have incompatible habitats.",
+    INCOMPATIBLE_TEMPERAMENTS: "Animals have incompatible temperaments.",
+    INCOMPATIBLE_SOCIAL_NEEDS: "Animals have incompatible social needs."
+}
+
 def is_predator(animal):
     """
     
@@ -40,28 +66,10 @@ def check_habitat_compatibility(animal1, animal2):
     
     """
 
-    #check diets
-    if not have_compatible_diets(animal1, animal2):
-        print("Animals have incompatible diets.")
-        return False
-    
-    #check habitats
-    if not have_compatible_habitats(animal1, animal2):
-        print("Animals have incompatible habitats.")
-        return False
-    
-    #check temperaments
-    if not have_compatible_temperaments(animal1, animal2):
-        print("Animals have incompatible temperaments.")
-        return False
-    
-    #check social needs
-    if not have_compatible_social_needs(animal1, animal2):
-        print("Animals have incompatible social needs.")
-        return False
-    
-    print("Animals are compatible!")
-    return True
+    #diet, habitat, temperament and social needs are looked up in the precomputed matrix
+    compatible, reason = get_compatibility(animal1, animal2)
+    print(reason)
+    return compatible
     
 def have_compatible_temperaments(animal1, animal2):
     """
@@ -80,14 +88,159 @@ def have_compatible_social_needs(animal1, animal2):
     Check if two animals have social needs that are compatible
 
     """
-    social1 = animal1.get("social_needs") 
-    social2 = animal2.get("social_needs")
-
-    solitary_animals = ["solitary", "territorial"]
-    social_animals = ["group", "pack", "herd", "pride"]
+    social1 = get_social_class(animal1.get("social_needs"))
+    social2 = get_social_class(animal2.get("social_needs"))
 
-    if (social1 in solitary_animals and social2 in social_animals) or \
-    (social2 in solitary_animals and social1 in social_animals):
+    #a solitary animal can not live with a social one
+    if social1 | social2 == SOLITARY_CLASS | SOCIAL_CLASS:
         return False
     
     return True
+
+def get_social_class(social_needs):
+    """
+
+    Get the social class bit of some social needs, 0 if they are neither solitary nor social
+
+    """
+    if social_needs in SOLITARY_NEEDS:
+        return SOLITARY_CLASS
+    if social_needs in SOCIAL_NEEDS:
+        return SOCIAL_CLASS
+    return 0
+
+def get_trait_profile(animal):
+    """
+
+    Get the diet, habitat type, temperament and social needs of an animal as a tuple
+
+    """
+    return tuple(animal.get(trait) for trait in COMPATIBILITY_TRAITS)
+
+def get_incompatibility(profile1, profile2):
+    """
+
+    Work out the reason code for a pair of trait profiles with the pairwise checks
+
+    """
+    animal1 = dict(zip(COMPATIBILITY_TRAITS, profile1))
+    animal2 = dict(zip(COMPATIBILITY_TRAITS, profile2))
+
+    if not have_compatible_diets(animal1, animal2):
+        return INCOMPATIBLE_DIETS
+    if not have_compatible_habitats(animal1, animal2):
+        return INCOMPATIBLE_HABITATS
+    if not have_compatible_temperaments(animal1, animal2):
+        return INCOMPATIBLE_TEMPERAMENTS
+    if not have_compatible_social_needs(animal1, animal2):
+        return INCOMPATIBLE_SOCIAL_NEEDS
+    return COMPATIBLE
+
+class CompatibilityMatrix:
+    """
+
+    Reason codes for every pair of trait profiles, so a pair check is one lookup
+
+    Every species in the catalog gets a profile up front. Animals whose
+    traits do not match a catalog species, such as ones entered by hand,
+    get a profile of their own the first time they are seen
+
+    """
+
+    def __init__(self, species_data=None):
+        self.profiles = []
+        self.profile_codes = {}
+        self.species_codes = {}
+        self.reasons = bytearray()
+
+        for species_name, data in (species_data or {}).items():
+            profile = get_trait_profile(data)
+            if any(trait is not None for trait in profile):
+                self.species_codes[species_name] = self.get_profile_code(profile)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def get_profile_code(self, profile):
+        """
+
+        Get the code of a trait profile, adding a row and column for it if it is new
+
+        """
+        code = self.profile_codes.get(profile)
+        if code is not None:
+            return code
+
+        code = len(self.profiles)
+        size = code + 1
+        reasons = bytearray(size * size)
+
+        #copy the old rows into the bigger matrix and fill in the new row and column
+        for row in range(code):
+            reasons[row * size:row * size + code] = self.reasons[row * code:(row + 1) * code]
+        for other, other_profile in enumerate(self.profiles):
+            reasons[code * size + other] = get_incompatibility(profile, other_profile)
+            reasons[other * size + code] = get_incompatibility(other_profile, profile)
+        reasons[code * size + code] = get_incompatibility(profile, profile)
+
+        self.profiles.append(profile)
+        self.profile_codes[profile] = code
+        self.reasons = reasons
+        return code
+
+    def get_animal_code(self, animal):
+        """
+
+        Get the profile code of an animal
+
+        """
+        return self.get_profile_code(get_trait_profile(animal))
+
+    def get_reason_code(self, code1, code2):
+        """
+
+        Get the reason code for a pair of profile codes
+
+        """
+        return self.reasons[code1 * len(self.profiles) + code2]
+
+    def get_species_reason_code(self, species1, species2):
+        """
+
+        Get the reason code for a pair of catalog species, or None if either is unknown
+
+        """
+        code1 = self.species_codes.get(species1)
+        code2 = self.species_codes.get(species2)
+        if code1 is None or code2 is None:
+            return None
+        return self.get_reason_code(code1, code2)
+
+_compatibility_matrix = None
+_compatibility_version = None
+
+def get_compatibility_matrix():
+    """
+
+    Get the compatibility matrix, building it again if the species baselines changed
+
+    """
+    global _compatibility_matrix, _compatibility_version
+
+    if _compatibility_matrix is None or _compatibility_version != get_baselines_version():
+        _compatibility_matrix = CompatibilityMatrix(SPECIES_HEALTH_BASELINES)
+        _compatibility_version = get_baselines_version()
+
+    return _compatibility_matrix
+
+def get_compatibility(animal1, animal2):
+    """
+
+    Check if two animals can share a habitat without printing anything
+
+    Returns (compatible, reason) for bulk callers
+
+    """
+    matrix = get_compatibility_matrix()
+    reason_code = matrix.get_reason_code(matrix.get_animal_code(animal1), matrix.get_animal_code(animal2))
+    return reason_code == COMPATIBLE, COMPATIBILITY_REASONS[reason_code]
@@ -0,0 +1,156 @@
+"""
+File that keeps track of which animals have changed since the last save
+"""
+
+class TrackedAnimalList(list):
+    """
+    List of animals that counts a version per animal and remembers which
+    animals changed or were removed since the last checkpoint
+
+    It is a normal list, so code that appends to it or swaps an updated
+    animal in with animals[i] = updated_animal is tracked automatically.
+    Animals moved between habitats are marked with mark_moved, and sorting
+    or reversing the list marks it reordered
+    """
+
+    def __init__(self, animals=()):
+        super().__init__(animals)
+        self.versions = {animal["animal_id"]: 0 for animal in self}
+        self.changed = {}
+        self.removed = set()
+        self.moved = set()
+        self.reordered = False
+
+    def mark_changed(self, animal):
+        """
+        Record that an animal was added or updated
+        """
+        animal_id = animal["animal_id"]
+        self.versions[animal_id] = self.versions.get(animal_id, -1) + 1
+        self.changed[animal_id] = animal
+        self.removed.discard(animal_id)
+
+    def mark_removed(self, animal):
+        """
+        Record that an animal was taken out of the list
+        """
+        animal_id = animal["animal_id"]
+        self.versions.pop(animal_id, None)
+        self.changed.pop(animal_id, None)
+        self.removed.add(animal_id)
+
+    def mark_moved(self, animal_id):
+        """
+        Record that an animal was assigned to or removed from a habitat
+        """
+        self.moved.add(animal_id)
+
+    def append(self, animal):
+        super().append(animal)
+        self.mark_changed(animal)
+
+    def extend(self, animals):
+        for animal in animals:
+            self.append(animal)
+
+    def insert(self, index, animal):
+        super().insert(index, animal)
+        self.mark_changed(animal)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            old_animals = self[index]
+            value = list(value)
+            super().__setitem__(index, value)
+            for animal in old_animals:
+                self.mark_removed(animal)
+            for animal in value:
+                self.mark_changed(animal)
+            return
+
+        old_animal = self[index]
+        super().__setitem__(index, value)
+
+        if old_animal["animal_id"] != value["animal_id"]:
+            self.mark_removed(old_animal)
+        self.mark_changed(value)
+
+    def __delitem__(self, index):
+        old_animals = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for animal in old_animals:
+            self.mark_removed(animal)
+
+    def pop(self, index=-1):
+        animal = super().pop(index)
+        self.mark_removed(animal)
+        return animal
+
+    def remove(self, animal):
+        super().remove(animal)
+        self.mark_removed(animal)
+
+    def clear(self):
+        for animal in self:
+            self.mark_removed(animal)
+        super().clear()
+
+    def sort(self, *, key=None, reverse=False):
+        super().sort(key=key, reverse=reverse)
+        self.reordered = True
+
+    def reverse(self):
+        super().reverse()
+        self.reordered = True
+
+    def __iadd__(self, animals):
+        self.extend(animals)
+        return self
+
+    def __imul__(self, count):
+        animals = list(self)
+        if count <= 0:
+            self.clear()
+        else:
+            for _ in range(count - 1):
+                self.extend(animals)
+        return self
+
+    def get_version(self, animal_id):
+        """
+        Get how many times an animal has changed since it was loaded
+        """
+        return self.versions.get(animal_id)
+
+    def get_changed_animals(self):
+        """
+        Get the animals that changed since the last checkpoint
+        """
+        return list(self.changed.values())
+
+    def get_removed_ids(self):
+        """
+        Get the IDs of animals removed since the last checkpoint
+        """
+        return set(self.removed)
+
+    def get_moved_ids(self):
+        """
+        Get the IDs of animals moved between habitats since the last checkpoint
+        """
+        return set(self.moved)
+
+    def has_changes(self):
+        """
+        Check if anything changed since the last checkpoint
+        """
+        return bool(self.changed or self.removed or self.moved or self.reordered)
+
+    def checkpoint(self):
+        """
+        Forget the changes after they have been saved
+        """
+        self.changed.clear()
+        self.removed.clear()
+        self.moved.clear()
+        self.reordered = False
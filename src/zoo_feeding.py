@@ -3,6 +3,45 @@ File that is responsible for the feeding of an animal
 """
 
 import datetime
+from d1_project_pitch.src.zoo_animal_record import append_to_history
+from d1_project_pitch.src.zoo_feeding_log import FeedingLog
+from d1_project_pitch.src.zoo_health_cache import get_cached_health_status
+
+def get_planning_weight(animal):
+    """
+    Get the weight to plan an animal's food from, its own weight_kg or else the latest weighed health check
+
+    Returns None if the animal has never been weighed
+    """
+    weight = animal.get("weight_kg")
+    if weight is not None:
+        return weight
+
+    health_records = animal.get("health_records") or []
+    for index in range(len(health_records) - 1, -1, -1):
+        weight = health_records[index].get("data", {}).get("weight_kg")
+        if weight is not None:
+            return weight
+    return None
+
+def get_planning_status(animal):
+    """
+    Get the health status to plan an animal's food with, its own health_status or else the one its health checks give
+    """
+    health_status = animal.get("health_status")
+    if health_status is None:
+        health_status = get_cached_health_status(animal)[0]
+    return health_status
+
+def get_feeding_inputs(animal):
+    """
+    Get the diet, weight and health status an animal's food is planned from, in the shape calculate_feeding_schedule takes
+
+    An animal that has never been weighed is planned with a weight of 0
+    """
+    weight = get_planning_weight(animal)
+    return {"diet": animal.get("diet", "unknown"), "weight_kg": 0 if weight is None else weight,
+            "health_status": get_planning_status(animal)}
 
 def calculate_feeding_schedule(animal):
     """
@@ -47,16 +86,11 @@ def record_feeding(animal, feeding_details):
     """
     Record feeding for an animal
     """
-    updated_animal = animal.copy()
-
-    if "feeding_history" not in updated_animal: 
-        updated_animal["feeding_history"] = []
-
     feeding_record = feeding_details.copy() 
     feeding_record["timestamp"] = datetime.datetime.now().isoformat()
 
-    updated_animal["feeding_history"].append(feeding_record) 
-    return updated_animal
+    #a compact record's new version shares its FeedingLog arrays with the old one, dicts keep plain lists
+    return append_to_history(animal, "feeding_history", feeding_record, FeedingLog)
 
 def generate_daily_feeding_report(animals):
     """
@@ -71,7 +105,7 @@ def generate_daily_feeding_report(animals):
     }
 
     for animal in animals: 
-        schedule = calculate_feeding_schedule(animal) 
+        schedule = calculate_feeding_schedule(get_feeding_inputs(animal)) 
         
         report["feeding_schedule"].append({ 
             "animal_id": animal["animal_id"], 
@@ -85,4 +119,4 @@ def generate_daily_feeding_report(animals):
         elif schedule["food_type"] == "vegetation": 
             report["total_vegetation_kg"] += schedule["daily_amount_kg"] 
         
-        return report
+    return report
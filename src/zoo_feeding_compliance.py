@@ -0,0 +1,221 @@
+"""
+File that checks the feedings that happened against the planned feeding schedule
+"""
+
+import datetime
+from operator import itemgetter
+from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule, get_feeding_inputs, get_planning_weight
+from d1_project_pitch.src.zoo_feeding_scheduler import parse_feeding_time
+from d1_project_pitch.src.zoo_history_index import HistoryTimeline, HISTORY_TIME_KEYS
+from d1_project_pitch.src.zoo_feeding_log import FeedingLog
+from d1_project_pitch.src.zoo_timestamps import datetime_to_epoch_us, epoch_us_to_iso
+
+ISSUE_TYPES = ["missed", "late", "duplicate", "under", "over", "unplanned"]
+
+DEFAULT_LATE_MINUTES = 30
+DEFAULT_EARLY_MINUTES = 30
+DEFAULT_QUANTITY_TOLERANCE = 0.1
+
+MINUTE_US = 60 * 1000000
+
+def to_datetime(moment):
+    """
+    Turn an ISO string or datetime into a datetime
+    """
+    if isinstance(moment, datetime.datetime):
+        return moment
+    return datetime.datetime.fromisoformat(moment)
+
+def iter_planned_feedings(animal, start, end):
+    """
+    Yield (time in microseconds, planned kg) for every planned feeding of an animal from start to end
+
+    The planned amount of a feeding is the daily amount shared across the
+    day's feedings, or None if the animal's weight is not known
+    """
+    weight = get_planning_weight(animal)
+    schedule = calculate_feeding_schedule(get_feeding_inputs(animal))
+    if not schedule["feeding_times"]:
+        return
+
+    feeding_times = sorted(parse_feeding_time(feeding_time) for feeding_time in schedule["feeding_times"])
+    planned_kg = schedule["daily_amount_kg"] / len(feeding_times) if weight is not None else None
+    start_us = datetime_to_epoch_us(start)
+    end_us = datetime_to_epoch_us(end)
+
+    day = start.date()
+    while day <= end.date():
+        for feeding_time in feeding_times:
+            planned_us = datetime_to_epoch_us(datetime.datetime.combine(day, feeding_time))
+            if start_us <= planned_us <= end_us:
+                yield planned_us, planned_kg
+        day += datetime.timedelta(days=1)
+
+def iter_actual_feedings(animal, start_us, end_us, history_index=None):
+    """
+    Yield (time in microseconds, feeding record) for every recorded feeding of an animal in a window, in time order
+
+    The window is found by bisecting the feeding history's timeline, taken
+    from history_index if given, so histories that are out of order work too.
+    Without an index a FeedingLog is read with scan() instead, which never
+    makes a row or a timestamp string for the feedings outside the window
+    """
+    feeding_history = animal.get("feeding_history") or []
+
+    if history_index is None and isinstance(feeding_history, FeedingLog):
+        yield from scan_feedings(feeding_history, start_us, end_us)
+        return
+
+    if history_index is None:
+        timeline = HistoryTimeline(feeding_history, HISTORY_TIME_KEYS["feeding_history"])
+    else:
+        timeline = history_index.get_timeline(animal, "feeding_history")
+
+    view = timeline.between(start_us, end_us)
+    for index, position in enumerate(range(view.start, view.stop)):
+        yield timeline.epochs[position], view[index]
+
+def scan_feedings(feeding_log, start_us, end_us):
+    """
+    Get a list of (time in microseconds, feeding record) for the feedings of a FeedingLog in a window, in time order
+
+    Only the amount and keeper are put in the records, they are all the merge reads
+    """
+    feedings = []
+    for index, (fed_us, amount_kg, food_type, keeper) in enumerate(feeding_log.scan()):
+        #values kept in the row's extras are not in the columns, so the row is read for those
+        if fed_us is None or amount_kg is None or keeper is None:
+            row = feeding_log[index]
+            fed_us = row.get_timestamp()
+            amount_kg = row.get("amount_kg")
+            keeper = row.get("keeper")
+
+        if fed_us is not None and start_us <= fed_us <= end_us:
+            feedings.append((fed_us, {"amount_kg": amount_kg, "keeper": keeper}))
+
+    #sorting is stable, so feedings at the same time stay in the order they were recorded
+    feedings.sort(key=itemgetter(0))
+    return feedings
+
+def describe_issue(issue_type, animal_id, planned_us, planned_kg, fed_us=None, feeding_record=None):
+    """
+    Get one compliance issue as a dict
+    """
+    feeding_record = feeding_record or {}
+    return {
+        "type": issue_type,
+        "animal_id": animal_id,
+        "planned_time": epoch_us_to_iso(planned_us) if planned_us is not None else None,
+        "planned_kg": round(planned_kg, 2) if planned_kg is not None else None,
+        "time": epoch_us_to_iso(fed_us) if fed_us is not None else None,
+        "amount_kg": feeding_record.get("amount_kg"),
+        "keeper": feeding_record.get("keeper")
+    }
+
+def merge_feedings(animal_id, planned, actual, late_us, early_us, quantity_tolerance):
+    """
+    Merge-join planned and actual feedings, both in time order, into a list of issues
+
+    A feeding belongs to the planned slot it comes after, counting from
+    early_us before the slot, up to early_us before the next slot. The
+    first feeding in a slot is checked for lateness and quantity, any more
+    are duplicates and a slot without one was missed. Feedings before the
+    first slot's window, or of an animal with no plan, are unplanned
+    """
+    issues = []
+    planned = iter(planned)
+    actual = iter(actual)
+
+    slot = next(planned, None)
+    next_slot = next(planned, None)
+    feeding = next(actual, None)
+    slot_fed = False
+
+    while slot is not None:
+        slot_us, planned_kg = slot
+
+        #only feedings before the first slot's window are left over here, the later ones went to a slot
+        while feeding is not None and feeding[0] < slot_us - early_us:
+            issues.append(describe_issue("unplanned", animal_id, None, None, feeding[0], feeding[1]))
+            feeding = next(actual, None)
+
+        slot_end_us = next_slot[0] - early_us if next_slot is not None else None
+
+        while feeding is not None and (slot_end_us is None or feeding[0] < slot_end_us):
+            fed_us, feeding_record = feeding
+
+            if slot_fed:
+                issues.append(describe_issue("duplicate", animal_id, slot_us, planned_kg, fed_us, feeding_record))
+            else:
+                slot_fed = True
+                if fed_us > slot_us + late_us:
+                    issues.append(describe_issue("late", animal_id, slot_us, planned_kg, fed_us, feeding_record))
+
+                amount_kg = feeding_record.get("amount_kg")
+                if isinstance(amount_kg, (int, float)) and planned_kg is not None:
+                    if amount_kg < planned_kg * (1 - quantity_tolerance):
+                        issues.append(describe_issue("under", animal_id, slot_us, planned_kg, fed_us, feeding_record))
+                    elif amount_kg > planned_kg * (1 + quantity_tolerance):
+                        issues.append(describe_issue("over", animal_id, slot_us, planned_kg, fed_us, feeding_record))
+
+            feeding = next(actual, None)
+
+        if not slot_fed:
+            issues.append(describe_issue("missed", animal_id, slot_us, planned_kg))
+
+        slot = next_slot
+        next_slot = next(planned, None)
+        slot_fed = False
+
+    #with no slots at all nothing was planned for these feedings
+    while feeding is not None:
+        issues.append(describe_issue("unplanned", animal_id, None, None, feeding[0], feeding[1]))
+        feeding = next(actual, None)
+
+    return issues
+
+def check_feeding_compliance(animals, start, end, late_minutes=DEFAULT_LATE_MINUTES,
+                             early_minutes=DEFAULT_EARLY_MINUTES, quantity_tolerance=DEFAULT_QUANTITY_TOLERANCE,
+                             history_index=None):
+    """
+    Check every animal's feedings from start to end against its feeding schedule
+
+    start and end are ISO strings or datetimes. Returns the issues and the
+    issue counts per animal and per keeper, plus overall counts. Each
+    animal's planned and actual feedings are streamed through one merge,
+    so the work is linear in the number of feedings. With a history index
+    the feedings in the range are found without converting every timestamp
+    """
+    start = to_datetime(start)
+    end = to_datetime(end)
+    start_us = datetime_to_epoch_us(start)
+    end_us = datetime_to_epoch_us(end)
+
+    report = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "animals": {},
+        "keepers": {},
+        "totals": dict.fromkeys(["planned"] + ISSUE_TYPES, 0)
+    }
+
+    for animal in animals:
+        animal_id = animal["animal_id"]
+        planned = list(iter_planned_feedings(animal, start, end))
+        issues = merge_feedings(animal_id, planned, iter_actual_feedings(animal, start_us, end_us, history_index),
+                                late_minutes * MINUTE_US, early_minutes * MINUTE_US, quantity_tolerance)
+
+        counts = dict.fromkeys(ISSUE_TYPES, 0)
+        for issue in issues:
+            counts[issue["type"]] += 1
+            report["totals"][issue["type"]] += 1
+
+            #missed feedings have no keeper to put them against
+            if issue["keeper"] is not None:
+                keeper_counts = report["keepers"].setdefault(issue["keeper"], dict.fromkeys(ISSUE_TYPES, 0))
+                keeper_counts[issue["type"]] += 1
+
+        report["totals"]["planned"] += len(planned)
+        report["animals"][animal_id] = {"planned": len(planned), "counts": counts, "issues": issues}
+
+    return report
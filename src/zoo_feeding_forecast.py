@@ -0,0 +1,146 @@
+"""
+File that works out the food needed by the whole zoo per day, food type and habitat with NumPy
+"""
+
+import datetime
+from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule, get_feeding_inputs
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FOOD_TYPES = ["unknown", "meat", "vegetation"]
+
+#share of body weight eaten per day and food type for each diet, same as calculate_feeding_schedule
+DIET_RATES = {"carnivore": (0.04, 1), "herbivore": (0.03, 2)}
+
+HEALTH_ADJUSTMENTS = {"needs attention": 0.8, "critical": 0.6}
+
+UNASSIGNED_HABITAT = "unassigned"
+
+def get_habitat_lookup(habitats):
+    """
+    Get a dict of animal ID to habitat name from the habitats
+    """
+    lookup = {}
+    if habitats:
+        for habitat_name, habitat in habitats.items():
+            for animal_id in habitat["current_animals"]:
+                lookup[animal_id] = habitat_name
+    return lookup
+
+def collect_feeding_arrays(animals, habitats=None):
+    """
+    Pull the weight, food type, health adjustment and habitat of every animal into arrays
+
+    The weight and health status are the ones get_feeding_inputs plans
+    with, the same as the scheduler and the compliance check. Returns the arrays and the list of habitat names the habitat index refers to
+    """
+    habitat_lookup = get_habitat_lookup(habitats)
+    habitat_names = [UNASSIGNED_HABITAT] + list(habitats or ())
+    habitat_positions = {name: position for position, name in enumerate(habitat_names)}
+
+    #plain lists are filled first, setting numpy elements one by one is much slower
+    weight_kg = []
+    rate = []
+    food_index = []
+    adjustment = []
+    habitat_index = []
+
+    for animal in animals:
+        inputs = get_feeding_inputs(animal)
+        diet_rate, food = DIET_RATES.get(inputs["diet"], (0.0, 0))
+        weight_kg.append(inputs["weight_kg"])
+        rate.append(diet_rate)
+        food_index.append(food)
+        adjustment.append(HEALTH_ADJUSTMENTS.get(inputs["health_status"], 1.0))
+        habitat_index.append(habitat_positions[habitat_lookup.get(animal.get("animal_id"), UNASSIGNED_HABITAT)])
+
+    arrays = {
+        "weight_kg": np.array(weight_kg, dtype=float),
+        "rate": np.array(rate, dtype=float),
+        "food_index": np.array(food_index, dtype=np.intp),
+        "adjustment": np.array(adjustment, dtype=float),
+        "habitat_index": np.array(habitat_index, dtype=np.intp)
+    }
+    return arrays, habitat_names
+
+def calculate_daily_amounts(weight_kg, rate, adjustment):
+    """
+    Work out the daily amount of every animal at once, rounded like calculate_feeding_schedule
+    """
+    return np.round(weight_kg * rate * adjustment, 2)
+
+def sum_by_food_type(amounts, food_index):
+    """
+    Total the amounts per food type
+    """
+    totals = np.bincount(food_index, weights=amounts, minlength=len(FOOD_TYPES))
+    return {food_type: float(total) for food_type, total in zip(FOOD_TYPES, totals)}
+
+def sum_by_habitat(amounts, food_index, habitat_index, habitat_count):
+    """
+    Total the amounts per habitat and food type, as a habitats by food types array
+    """
+    return np.bincount(habitat_index * len(FOOD_TYPES) + food_index, weights=amounts,
+                       minlength=habitat_count * len(FOOD_TYPES)).reshape(habitat_count, len(FOOD_TYPES))
+
+def calculate_food_totals(animals):
+    """
+    Get the total daily amount of each food type for a list of animals
+
+    Without NumPy it adds up calculate_feeding_schedule for each animal
+    """
+    if np is None:
+        totals = dict.fromkeys(FOOD_TYPES, 0.0)
+        for animal in animals:
+            schedule = calculate_feeding_schedule(get_feeding_inputs(animal))
+            totals[schedule["food_type"]] += schedule["daily_amount_kg"]
+        return totals
+
+    arrays, _ = collect_feeding_arrays(animals)
+    amounts = calculate_daily_amounts(arrays["weight_kg"], arrays["rate"], arrays["adjustment"])
+    return sum_by_food_type(amounts, arrays["food_index"])
+
+def generate_feeding_forecast(animals, habitats=None, days=90, start_date=None, daily_factors=None):
+    """
+    Forecast the food needed each day for a number of days, for purchasing
+
+    daily_factors can scale each day's amounts, for seasonal changes in
+    appetite, and defaults to every day being the same. Returns the totals
+    per day and food type, per habitat and food type and per food type
+    over the whole forecast. by_day is a days by food types array and
+    by_habitat_day a days by habitats by food types array
+    """
+    if np is None:
+        print("NumPy is needed for feeding forecasts")
+        return None
+
+    start_date = start_date or datetime.date.today()
+    factors = np.ones(days) if daily_factors is None else np.asarray(daily_factors, dtype=float)
+    if factors.shape != (days,):
+        print(f"Need one daily factor for each of the {days} days")
+        return None
+
+    arrays, habitat_names = collect_feeding_arrays(animals, habitats)
+    amounts = calculate_daily_amounts(arrays["weight_kg"], arrays["rate"], arrays["adjustment"])
+
+    #each day is the daily total scaled, so the per animal work is done once and not once per day
+    habitat_totals = sum_by_habitat(amounts, arrays["food_index"], arrays["habitat_index"], len(habitat_names))
+    by_habitat_day = factors[:, None, None] * habitat_totals
+    by_day = by_habitat_day.sum(axis=1)
+    by_habitat = habitat_totals * factors.sum()
+
+    return {
+        "start_date": start_date.isoformat(),
+        "days": days,
+        "total_animals": len(amounts),
+        "food_types": FOOD_TYPES,
+        "habitats": habitat_names,
+        "dates": [(start_date + datetime.timedelta(days=day)).isoformat() for day in range(days)],
+        "by_day": by_day,
+        "by_habitat_day": by_habitat_day,
+        "by_habitat": {habitat_name: dict(zip(FOOD_TYPES, row.tolist())) for habitat_name, row in zip(habitat_names, by_habitat)},
+        "totals": dict(zip(FOOD_TYPES, by_day.sum(axis=0).tolist()))
+    }
@@ -0,0 +1,309 @@
+"""
+File that stores feeding history compactly in typed arrays with dictionary encoded strings
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from d1_project_pitch.src.zoo_timestamps import iso_to_epoch_us, epoch_us_to_iso
+
+STRING_FIELDS = ("time", "food_type", "keeper")
+MAX_EXACT_INT = 2 ** 53
+
+class FeedingColumns:
+    """
+    The arrays behind a feeding log, one per field
+
+    time, food_type and keeper hold codes into a shared string table and
+    each row has a layout code for the keys it has, in their order, so rows
+    come back exactly as they went in. Amounts are floats, with a flag for
+    the ones that were whole ints. Values that do not fit their column go
+    in a small per row extras dict
+    """
+
+    __slots__ = ("layouts", "times", "food_types", "keepers", "amounts", "int_amounts", "timestamps", "extras",
+                 "strings", "string_codes", "layout_keys", "layout_codes")
+
+    def __init__(self, strings=None, string_codes=None, layout_keys=None, layout_codes=None):
+        self.layouts = array('H')
+        self.times = array('H')
+        self.food_types = array('H')
+        self.keepers = array('H')
+        self.amounts = array('d')
+        self.int_amounts = array('B')
+        self.timestamps = array('q')
+        self.extras = {}
+
+        #the string and layout tables only ever grow, so branches can share them
+        self.strings = [] if strings is None else strings
+        self.string_codes = {} if string_codes is None else string_codes
+        self.layout_keys = [] if layout_keys is None else layout_keys
+        self.layout_codes = {} if layout_codes is None else layout_codes
+
+    def __len__(self):
+        return len(self.layouts)
+
+    def copy(self, length):
+        """
+        Copy the first length rows into new arrays that share the string and layout tables
+        """
+        columns = FeedingColumns(self.strings, self.string_codes, self.layout_keys, self.layout_codes)
+        for name in ("layouts", "times", "food_types", "keepers", "amounts", "int_amounts", "timestamps"):
+            getattr(columns, name).extend(getattr(self, name)[:length])
+        columns.extras = {index: extra for index, extra in self.extras.items() if index < length}
+        return columns
+
+    def get_string_code(self, value):
+        """
+        Get the code for a string, adding it to the table if it is new
+        """
+        code = self.string_codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            if code > 0xFFFF:
+                raise ValueError("Too many distinct strings in feeding log")
+            self.strings.append(value)
+            self.string_codes[value] = code
+        return code
+
+    def get_layout_code(self, keys):
+        """
+        Get the code for a tuple of keys, adding it to the table if it is new
+        """
+        code = self.layout_codes.get(keys)
+        if code is None:
+            code = len(self.layout_keys)
+            if code > 0xFFFF:
+                raise ValueError("Too many distinct feeding record layouts in feeding log")
+            self.layout_keys.append(keys)
+            self.layout_codes[keys] = code
+        return code
+
+    def append(self, feeding_record):
+        """
+        Encode one feeding record onto the end of the arrays
+        """
+        codes = {"time": 0, "food_type": 0, "keeper": 0}
+        amount = 0.0
+        int_amount = 0
+        timestamp = 0
+        extra = None
+
+        for key, value in feeding_record.items():
+            if key in codes and type(value) is str:
+                codes[key] = self.get_string_code(value)
+                continue
+
+            if key == "amount_kg" and type(value) is float:
+                amount = value
+                continue
+
+            #ints up to 2 ** 53 are exact as floats
+            if key == "amount_kg" and type(value) is int and abs(value) <= MAX_EXACT_INT:
+                amount = float(value)
+                int_amount = 1
+                continue
+
+            if key == "timestamp" and type(value) is str:
+                epoch_us = iso_to_epoch_us(value)
+
+                #only timestamps that come back as the same string are stored as numbers
+                if epoch_us is not None and epoch_us_to_iso(epoch_us) == value:
+                    timestamp = epoch_us
+                    continue
+
+            if extra is None:
+                extra = {}
+            extra[key] = value
+
+        if extra is not None:
+            self.extras[len(self.layouts)] = extra
+
+        self.layouts.append(self.get_layout_code(tuple(feeding_record)))
+        self.times.append(codes["time"])
+        self.food_types.append(codes["food_type"])
+        self.keepers.append(codes["keeper"])
+        self.amounts.append(amount)
+        self.int_amounts.append(int_amount)
+        self.timestamps.append(timestamp)
+
+def get_amount(columns, index):
+    """
+    Get the amount of one feeding as the int or float it was recorded as
+    """
+    amount = columns.amounts[index]
+    return int(amount) if columns.int_amounts[index] else amount
+
+class FeedingRow(Mapping):
+    """
+    Read-only view of one feeding that looks like a feeding record dict
+    """
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns, index):
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, key):
+        columns = self.columns
+        index = self.index
+
+        if key not in columns.layout_keys[columns.layouts[index]]:
+            raise KeyError(key)
+
+        extra = columns.extras.get(index)
+        if extra is not None and key in extra:
+            return extra[key]
+
+        if key == "time":
+            return columns.strings[columns.times[index]]
+        if key == "food_type":
+            return columns.strings[columns.food_types[index]]
+        if key == "keeper":
+            return columns.strings[columns.keepers[index]]
+        if key == "amount_kg":
+            return get_amount(columns, index)
+        return epoch_us_to_iso(columns.timestamps[index])
+
+    def __iter__(self):
+        return iter(self.columns.layout_keys[self.columns.layouts[self.index]])
+
+    def __len__(self):
+        return len(self.columns.layout_keys[self.columns.layouts[self.index]])
+
+    def get_timestamp(self):
+        """
+        Get when the feeding happened, in microseconds since 1970, without making a string
+        """
+        extra = self.columns.extras.get(self.index)
+        if extra is not None and "timestamp" in extra:
+            return iso_to_epoch_us(extra["timestamp"])
+        if "timestamp" not in self:
+            return None
+        return self.columns.timestamps[self.index]
+
+    def to_dict(self):
+        """
+        Get the feeding as a plain dict in its original shape
+        """
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"FeedingRow({self.to_dict()!r})"
+
+class FeedingLog(Sequence):
+    """
+    Append-only compact feeding history that can be used anywhere the list of feeding dicts is
+
+    Like HistoryVector, versions made with appended() share the same arrays
+    and each one only sees its own length of them, so older versions stay
+    readable. append() adds to this version in place, the way list.append does
+    """
+
+    __slots__ = ("columns", "length")
+
+    def __init__(self, feeding_records=()):
+        self.columns = FeedingColumns()
+        self.length = 0
+        for feeding_record in feeding_records:
+            self.append(feeding_record)
+
+    @classmethod
+    def from_records(cls, feeding_records):
+        """
+        Encode a list of feeding dicts, as they are stored in JSON
+        """
+        if isinstance(feeding_records, FeedingLog):
+            return feeding_records
+        return cls(feeding_records or ())
+
+    @classmethod
+    def share(cls, columns, length):
+        """
+        Make a version over existing arrays without copying them
+        """
+        log = cls.__new__(cls)
+        log.columns = columns
+        log.length = length
+        return log
+
+    def append(self, feeding_record):
+        """
+        Add a feeding to this version
+        """
+        #a newer version already appended past this one, so branch off a copy
+        if len(self.columns) != self.length:
+            self.columns = self.columns.copy(self.length)
+
+        self.columns.append(feeding_record)
+        self.length += 1
+
+    def appended(self, feeding_record):
+        """
+        Get a new version with one more feeding, leaving this one as it is
+        """
+        log = FeedingLog.share(self.columns, self.length)
+        log.append(feeding_record)
+        return log
+
+    def shares_storage_with(self, other):
+        """
+        Check if another version is built on the same arrays
+        """
+        return isinstance(other, FeedingLog) and other.columns is self.columns
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [FeedingRow(self.columns, i) for i in range(*index.indices(self.length))]
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("feeding log index out of range")
+        return FeedingRow(self.columns, index)
+
+    def __iter__(self):
+        columns = self.columns
+        for index in range(self.length):
+            yield FeedingRow(columns, index)
+
+    def __eq__(self, other):
+        if isinstance(other, (FeedingLog, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def scan(self):
+        """
+        Yield (timestamp in microseconds, amount kg, food type, keeper) for every feeding
+
+        Reads the arrays directly for reports, without making a row or dict per feeding.
+        Fields a feeding does not have, or that are kept in its extras, come back as None
+        """
+        columns = self.columns
+        strings = columns.strings
+        layout_keys = columns.layout_keys
+        extras = columns.extras
+
+        for index in range(self.length):
+            keys = layout_keys[columns.layouts[index]]
+            extra = extras.get(index)
+            yield (
+                columns.timestamps[index] if "timestamp" in keys and not (extra and "timestamp" in extra) else None,
+                get_amount(columns, index) if "amount_kg" in keys and not (extra and "amount_kg" in extra) else None,
+                strings[columns.food_types[index]] if "food_type" in keys and not (extra and "food_type" in extra) else None,
+                strings[columns.keepers[index]] if "keeper" in keys and not (extra and "keeper" in extra) else None
+            )
+
+    def to_list(self):
+        """
+        Get the feedings as a list of plain dicts, the shape stored in JSON
+        """
+        return [row.to_dict() for row in self]
+
+    def __repr__(self):
+        return f"FeedingLog({self.to_list()!r})"
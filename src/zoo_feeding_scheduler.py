@@ -0,0 +1,185 @@
+"""
+File that merges every animal's feeding times into one zoo-wide timeline of keeper work
+"""
+
+import datetime
+import heapq
+from itertools import count
+from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule, get_feeding_inputs
+from d1_project_pitch.src.zoo_feeding_forecast import get_habitat_lookup, UNASSIGNED_HABITAT
+
+def parse_feeding_time(feeding_time):
+    """
+    Turn a "HH:MM" feeding time into a time
+    """
+    hours, minutes = feeding_time.split(":")
+    return datetime.time(int(hours), int(minutes))
+
+def get_next_feeding(feeding_times, after):
+    """
+    Get the first feeding time strictly after a moment, moving on to the next day if needed
+    """
+    for feeding_time in feeding_times:
+        moment = datetime.datetime.combine(after.date(), feeding_time)
+        if moment > after:
+            return moment
+
+    return datetime.datetime.combine(after.date() + datetime.timedelta(days=1), feeding_times[0])
+
+class FeedingScheduler:
+    """
+    Min-heap holding the next feeding of every animal, popped in time order
+
+    Rescheduling an animal pushes a new entry and leaves the old one in the
+    heap, marked out of date by a per animal generation number, so it is
+    O(log n). Out of date entries are skipped when popped and the heap is
+    rebuilt once they make up most of it
+    """
+
+    def __init__(self, animals=(), habitats=None, start=None):
+        self.now = start or datetime.datetime.now()
+        self.heap = []
+        self.sequence = count()
+        self.generations = {}
+        self.plans = {}
+        self.habitat_lookup = get_habitat_lookup(habitats)
+
+        for animal in animals:
+            self.add_animal(animal)
+
+    def __len__(self):
+        return len(self.plans)
+
+    def push(self, animal_id, when):
+        """
+        Add an animal's next feeding to the heap under its current generation
+        """
+        heapq.heappush(self.heap, (when, next(self.sequence), animal_id, self.generations[animal_id]))
+
+    def add_animal(self, animal, after=None):
+        """
+        Work out an animal's feeding plan and schedule its next feeding
+
+        Animals without feeding times, such as ones with an unknown diet, are not scheduled
+        """
+        animal_id = animal["animal_id"]
+        schedule = calculate_feeding_schedule(get_feeding_inputs(animal))
+
+        self.generations[animal_id] = self.generations.get(animal_id, 0) + 1
+
+        if not schedule["feeding_times"]:
+            self.plans.pop(animal_id, None)
+            return False
+
+        feeding_times = sorted(parse_feeding_time(feeding_time) for feeding_time in schedule["feeding_times"])
+        self.plans[animal_id] = {
+            "feeding_times": feeding_times,
+            "food_type": schedule["food_type"],
+            "amount_kg": round(schedule["daily_amount_kg"] / len(feeding_times), 2)
+        }
+
+        self.push(animal_id, get_next_feeding(feeding_times, after or self.now))
+        self.compact_if_needed()
+        return True
+
+    def reschedule(self, animal):
+        """
+        Recalculate an animal's plan after its diet, weight or health changed
+        """
+        return self.add_animal(animal)
+
+    def remove_animal(self, animal_id):
+        """
+        Stop scheduling an animal
+        """
+        if animal_id not in self.plans:
+            return False
+
+        self.generations[animal_id] += 1
+        del self.plans[animal_id]
+        self.compact_if_needed()
+        return True
+
+    def set_habitat(self, animal_id, habitat_name):
+        """
+        Record the habitat an animal lives in, for grouping its feedings
+        """
+        self.habitat_lookup[animal_id] = habitat_name
+
+    def compact_if_needed(self):
+        """
+        Rebuild the heap without out of date entries once they outnumber the live ones
+        """
+        if len(self.heap) > 2 * len(self.plans) + 16:
+            generations = self.generations
+            self.heap = [entry for entry in self.heap if entry[3] == generations[entry[2]]]
+            heapq.heapify(self.heap)
+
+    def discard_stale(self):
+        """
+        Pop out of date entries off the top of the heap
+        """
+        heap = self.heap
+        while heap and heap[0][3] != self.generations[heap[0][2]]:
+            heapq.heappop(heap)
+
+    def peek_time(self):
+        """
+        Get the time of the next feeding, or None if nothing is scheduled
+        """
+        self.discard_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_next(self):
+        """
+        Pop the next feeding and schedule the one after it for the same animal
+
+        Returns the feeding as a dict, or None if nothing is scheduled
+        """
+        self.discard_stale()
+        if not self.heap:
+            return None
+
+        when, _, animal_id, _ = heapq.heappop(self.heap)
+        plan = self.plans[animal_id]
+        self.now = when
+        self.push(animal_id, get_next_feeding(plan["feeding_times"], when))
+
+        return {
+            "time": when,
+            "animal_id": animal_id,
+            "habitat": self.habitat_lookup.get(animal_id, UNASSIGNED_HABITAT),
+            "food_type": plan["food_type"],
+            "amount_kg": plan["amount_kg"]
+        }
+
+    def pop_batches(self):
+        """
+        Pop every feeding due at the next time and group them by habitat into keeper batches
+        """
+        when = self.peek_time()
+        if when is None:
+            return []
+
+        batches = {}
+        while self.peek_time() == when:
+            event = self.pop_next()
+            batch = batches.get(event["habitat"])
+            if batch is None:
+                batch = batches[event["habitat"]] = {"time": when, "habitat": event["habitat"], "animal_ids": [], "food_kg": {}}
+
+            batch["animal_ids"].append(event["animal_id"])
+            batch["food_kg"][event["food_type"]] = round(batch["food_kg"].get(event["food_type"], 0) + event["amount_kg"], 2)
+
+        return [batches[habitat] for habitat in sorted(batches)]
+
+    def get_timeline(self, until):
+        """
+        Pop keeper batches in time order up to and including a moment
+        """
+        timeline = []
+        while True:
+            when = self.peek_time()
+            if when is None or when > until:
+                return timeline
+            timeline.extend(self.pop_batches())
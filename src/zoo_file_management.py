@@ -3,30 +3,211 @@ File that manages the files in the system
 """
 
 import json
+import os
+import re
+from d1_project_pitch.src.zoo_animal_record import animals_to_dicts, compact_animals
+from d1_project_pitch.src.zoo_journal import get_journal_filename, replay_journal, read_snapshot_generation, read_journal_generation, get_snapshot_animals
+from d1_project_pitch.src.zoo_sharded_storage import is_sharded_directory, save_sharded_animals, save_changed_shards, load_sharded_animals
+from d1_project_pitch.src.zoo_sqlite_storage import is_database_filename, count_animals_in_database, save_animals_to_database, save_changed_animals_to_database, load_animals_from_database, insert_animals_into_database
 
-def save_animals_to_file(animals, filename):
+STREAM_CHUNK_SIZE = 64 * 1024
+
+SNAPSHOT_LIST_PATTERN = re.compile(r'\{\s*"generation"\s*:\s*\d+\s*,\s*"animals"\s*:\s*')
+
+def save_animals_to_file(animals, filename, habitats=None):
     """
     Save animal data to a JSON file
+
+    Filenames ending in .db, .sqlite or .sqlite3 are saved to a SQLite database
+    instead, together with the habitat occupancy if habitats are given.
+    A sharded directory is saved as shards
     """
+    if is_database_filename(filename):
+        return save_animals_to_database(animals, filename, habitats)
+
+    if is_sharded_directory(filename):
+        return save_sharded_animals(animals, filename)
+
     try: 
         with open(filename, 'w') as file: 
-            json.dump(animals, file, indent=2) 
+            json.dump(animals_to_dicts(animals), file, indent=2) 
             return True 
     except Exception as e: 
         print(f"Error saving animals to file: {e}") 
         return False
 
-def load_animals_from_file(filename):
+def save_changed_animals(animals, filename, habitats=None):
+    """
+    Save only the animals that changed since the last save
+
+    animals must be a TrackedAnimalList. Databases get row level upserts of the
+    changed animals and of the habitat rows of changed and moved animals,
+    sharded directories rewrite only the shards with changes and other files
+    fall back to a full save. A reordered list is always saved in full so the
+    stored order follows it
+    """
+    if not animals.has_changes():
+        return True
+
+    if animals.reordered:
+        success = save_animals_to_file(list(animals), filename, habitats)
+    elif is_database_filename(filename):
+        success = save_changed_animals_to_database(animals.get_changed_animals(), animals.get_removed_ids(), filename,
+                                                   habitats, animals.get_moved_ids())
+    elif is_sharded_directory(filename):
+        success = save_changed_shards(animals, animals.changed, animals.get_removed_ids(), filename)
+    else:
+        success = save_animals_to_file(list(animals), filename, habitats)
+
+    if success:
+        animals.checkpoint()
+    return success
+
+def load_animals_from_file(filename, habitats=None, compact=False):
     """
     Load aniamals from a JSON file
+
+    Any changes left in the journal next to the file are replayed on top,
+    and habitat assignments from the journal are applied to habitats if given.
+    The whole list is returned and replaying needs every animal, so a plain
+    file is read with json.load. iter_animals_from_file is for going through
+    a file record by record, as the migrator does. Database filenames are loaded from SQLite and sharded directories are
+    decoded in parallel across a process pool. With compact=True the animals
+    come back as Animal records sharing their species profiles
     """
+    if is_database_filename(filename):
+        animals = load_animals_from_database(filename, habitats)
+        return compact_animals(animals) if compact else animals
+
     try: 
-        with open(filename, 'r') as file: 
-            animals = json.load(file) 
-            return animals 
+        if is_sharded_directory(filename):
+            animals = load_sharded_animals(filename)
+        else:
+            with open(filename, 'r') as file: 
+                animals = get_snapshot_animals(json.load(file))
     except FileNotFoundError: 
         print(f"File {filename} not found. Starting with empty animal list.") 
-        return [] 
+        animals = [] 
     except Exception as e: 
         print(f"Error loading animals from file: {e}") 
         return []
+
+    journal_filename = get_journal_filename(filename)
+    if os.path.exists(journal_filename):
+        animals = replay_journal(journal_filename, animals, habitats, read_snapshot_generation(filename))
+
+    return compact_animals(animals) if compact else animals
+
+def iter_animals_from_file(filename, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield animal records one at a time from the top level array of a JSON file
+
+    The file is read in chunks and each record is decoded as soon as it is
+    complete, so the first animals are available before the whole file is read
+    """
+    decoder = json.JSONDecoder()
+
+    with open(filename, 'r') as file:
+        buffer = ""
+        position = 0
+        eof = False
+        started = False
+
+        while True:
+            #skip whitespace and the separators between records
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+
+            if position >= len(buffer):
+                if eof:
+                    raise ValueError(f"Unexpected end of file in {filename}")
+                more = file.read(chunk_size)
+                buffer = buffer[position:] + more
+                position = 0
+                eof = len(more) < chunk_size
+                continue
+
+            if not started:
+                #a journal snapshot wraps the list in an object after its generation
+                header = SNAPSHOT_LIST_PATTERN.match(buffer, position)
+                if header:
+                    position = header.end()
+                    continue
+                if buffer[position] != "[":
+                    raise ValueError(f"Expected a list of animals in {filename}")
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                record, end = None, None
+
+            #a record that runs to the end of the buffer might still be cut off
+            if end is None or (end == len(buffer) and not eof):
+                if eof:
+                    raise ValueError(f"Malformed animal record in {filename}")
+
+                #read at least as much again so big records are not re-parsed too often
+                read_size = max(chunk_size, len(buffer) - position)
+                more = file.read(read_size)
+                buffer = buffer[position:] + more
+                position = 0
+                eof = len(more) < read_size
+                continue
+
+            position = end
+            yield record
+
+            #drop what has been consumed so the buffer stays around one chunk
+            if position > chunk_size:
+                buffer = buffer[position:]
+                position = 0
+
+def migrate_json_to_database(json_filename, database_filename, habitats=None):
+    """
+    Copy everything from a JSON data file (and its journal) into a SQLite database
+
+    Nothing is written if the JSON file is missing or damaged, or if the
+    database already holds animals, so a migration never deletes rows.
+    Without a journal to replay the records are streamed into the database
+    as they are decoded, so the file is never held in memory whole
+    """
+    if not os.path.exists(json_filename):
+        print(f"File {json_filename} not found. Nothing migrated.")
+        return False
+
+    stored_count = count_animals_in_database(database_filename)
+    if stored_count is None:
+        return False
+    if stored_count:
+        print(f"{database_filename} already holds {stored_count} animals. Nothing migrated.")
+        return False
+
+    journal_filename = get_journal_filename(json_filename)
+    snapshot_generation = read_snapshot_generation(json_filename)
+    if not os.path.exists(journal_filename) or read_journal_generation(journal_filename) <= snapshot_generation:
+        count = insert_animals_into_database(iter_animals_from_file(json_filename), database_filename, habitats)
+        if count is None:
+            return False
+
+        print(f"Migrated {count} animals from {json_filename} to {database_filename}")
+        return True
+
+    try:
+        animals = list(iter_animals_from_file(json_filename))
+    except Exception as e:
+        print(f"Error reading {json_filename}, nothing migrated: {e}")
+        return False
+
+    animals = replay_journal(journal_filename, animals, habitats, snapshot_generation)
+
+    if not save_animals_to_database(animals, database_filename, habitats):
+        return False
+
+    print(f"Migrated {len(animals)} animals from {json_filename} to {database_filename}")
+    return True
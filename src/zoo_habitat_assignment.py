@@ -2,7 +2,10 @@
 File responsible for the habitat assignment of animals
 """
 
-from d1_project_pitch.src.zoo_business_logic import check_habitat_compatibility
+from d1_project_pitch.src.zoo_business_logic import get_compatibility
+from d1_project_pitch.src.zoo_animal_registry import find_animal
+from d1_project_pitch.src.zoo_habitat_traits import get_habitat_traits, record_assignment, record_removal
+from d1_project_pitch.src.zoo_habitat_occupancy import get_habitat_occupancy
 
 def assign_animal_to_habitat(animal, habitat_name, habitats, all_animals=None):
     """
@@ -16,26 +19,29 @@ def assign_animal_to_habitat(animal, habitat_name, habitats, all_animals=None):
     if len(habitat["current_animals"]) >= habitat["capacity"]: 
         return False, f"Habitat '{habitat_name}' is at full capacity."
     
+    #the habitat's trait totals answer the check without looking at each animal in it
     if all_animals: 
-        for existing_animal_id in habitat["current_animals"]: 
-            existing_animal = find_animal_by_id(existing_animal_id, all_animals) 
+        traits = get_habitat_traits(habitat_name, habitat, all_animals)
 
-            if existing_animal: 
-                compatible, reason = check_habitat_compatibility(animal, existing_animal) 
-                if not compatible: 
-                    return False, f"Not compatible with {existing_animal['name']}: {reason}"
+        #a refusal needs the animal in the way for the message, and totals missing a resident can not answer at all
+        if traits.missing or not traits.admits(animal): 
+            for existing_animal_id in habitat["current_animals"]: 
+                existing_animal = find_animal_by_id(existing_animal_id, all_animals) 
 
-    habitat["current_animals"].append(animal["animal_id"]) 
+                if existing_animal: 
+                    compatible, reason = get_compatibility(animal, existing_animal) 
+                    if not compatible: 
+                        return False, f"Not compatible with {existing_animal['name']}: {reason}"
+
+    get_habitat_occupancy(habitats).assign(animal["animal_id"], habitat_name)
+    record_assignment(habitat_name, habitat, animal)
     return True, f"Successfully assigned {animal['name']} to habitat"
 
 def find_animal_by_id(animal_id, animals):
     """ 
     Helper function to find animal by ID 
     """ 
-    for animal in animals: 
-        if animal.get('animal_id') == animal_id: 
-            return animal 
-    return None
+    return find_animal(animal_id, animals)
     
 def remove_animal_from_habitat(animal_id, habitat_name, habitats):
     """
@@ -46,8 +52,8 @@ def remove_animal_from_habitat(animal_id, habitat_name, habitats):
 
     habitat = habitats[habitat_name]
 
-    if animal_id in habitat["current_animals"]: 
-        habitat["current_animals"].remove(animal_id) 
+    if get_habitat_occupancy(habitats).remove(animal_id, habitat_name): 
+        record_removal(habitat_name, habitat, animal_id)
         return True, f"Removed animal {animal_id} from {habitat['name']}" 
     else: 
         return False, f"Animal {animal_id} not found in {habitat['name']}"
@@ -57,16 +63,24 @@ def get_animal_habitat(animal_id, habitats):
     """
     Find which habitat an animal is assigned to
     """
-    for habitat_name, habitat in habitats.items(): 
-        if animal_id in habitat["current_animals"]: 
-            return habitat_name 
-    
-    return None
+    return get_habitat_occupancy(habitats).get_habitat(animal_id)
+
+def get_unassigned_animals(animals, habitats):
+    """
+    Get the animals that are not in any habitat
+    """
+    occupancy = get_habitat_occupancy(habitats)
+    return [animal for animal in animals if occupancy.get_habitat(animal["animal_id"]) is None]
 
 def generate_habitat_report(habitats, animals):
     """
     Generate report for the habitat and animals
     """
+    #one pass over the animals so a streamed iterator can be passed in as well
+    animals_by_id = {} 
+    for animal in animals: 
+        animals_by_id.setdefault(animal.get('animal_id'), animal)
+
     report = { 
         "total_habitats": len(habitats), 
         "total_animals_assigned": 0,
@@ -85,7 +99,7 @@ def generate_habitat_report(habitats, animals):
     
         #loop for animals in this habitat
         for animal_id in habitat["current_animals"]: 
-            animal = find_animal_by_id(animal_id, animals) 
+            animal = animals_by_id.get(animal_id) 
             
             if animal: 
                 habitat_info["animals"].append({ 
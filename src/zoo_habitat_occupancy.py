@@ -0,0 +1,90 @@
+"""
+File that keeps a reverse index of which habitat every animal lives in
+"""
+
+from d1_project_pitch.src.zoo_habitat_version import get_habitat_version
+
+class HabitatOccupancy:
+    """
+    The animals of each habitat as sets, plus a map from animal ID to habitat name
+
+    The habitats' current_animals lists stay the saved form, but assign and
+    remove go through the index, which changes the list and its own sets
+    together, so finding an animal's habitat is one dict lookup. Code that
+    edits a list any other way calls mark_habitats_changed, and the index is
+    rebuilt the next time it is asked for
+    """
+
+    def __init__(self, habitats):
+        self.habitats = habitats
+        self.version = get_habitat_version()
+        self.members = {}
+        self.habitat_of = {}
+
+        for habitat_name, habitat in habitats.items():
+            self.members[habitat_name] = set(habitat["current_animals"])
+            for animal_id in habitat["current_animals"]:
+                #the first habitat in order wins, the same as a scan would find
+                self.habitat_of.setdefault(animal_id, habitat_name)
+
+    def is_current(self, habitats):
+        """
+        Check if the index was built on these habitats and nothing was marked as changed since
+        """
+        return habitats is self.habitats and self.version == get_habitat_version() and len(habitats) == len(self.members)
+
+    def assign(self, animal_id, habitat_name):
+        """
+        Add an animal to a habitat's list and to the index
+        """
+        self.habitats[habitat_name]["current_animals"].append(animal_id)
+        self.members[habitat_name].add(animal_id)
+        self.habitat_of.setdefault(animal_id, habitat_name)
+
+    def remove(self, animal_id, habitat_name):
+        """
+        Take an animal off a habitat's list and out of the index
+
+        Returns False if the animal is not in the habitat
+        """
+        current_animals = self.habitats[habitat_name]["current_animals"]
+        if animal_id not in self.members[habitat_name] or animal_id not in current_animals:
+            return False
+
+        current_animals.remove(animal_id)
+
+        #the list can hold an animal twice, then it is still there after one removal
+        if animal_id not in current_animals:
+            self.members[habitat_name].discard(animal_id)
+
+        if self.habitat_of.get(animal_id) == habitat_name and animal_id not in self.members[habitat_name]:
+            del self.habitat_of[animal_id]
+            for other_name, members in self.members.items():
+                if animal_id in members:
+                    self.habitat_of[animal_id] = other_name
+                    break
+        return True
+
+    def get_habitat(self, animal_id):
+        """
+        Get the name of the habitat an animal is in, or None
+        """
+        return self.habitat_of.get(animal_id)
+
+    def get_members(self, habitat_name):
+        """
+        Get the set of animal IDs in a habitat
+        """
+        return self.members.get(habitat_name, set())
+
+_occupancy = None
+
+def get_habitat_occupancy(habitats):
+    """
+    Get the occupancy index of the habitats, building it again if they were marked as changed
+    """
+    global _occupancy
+
+    if _occupancy is None or not _occupancy.is_current(habitats):
+        _occupancy = HabitatOccupancy(habitats)
+    return _occupancy
@@ -0,0 +1,414 @@
+"""
+File that places many animals into habitats at once, for shipments and reorganisations
+"""
+
+import time
+from collections import deque
+from d1_project_pitch.src.zoo_business_logic import get_trait_profile, get_social_class, SOLITARY_CLASS, SOCIAL_CLASS
+from d1_project_pitch.src.zoo_habitat_traits import build_habitat_traits
+from d1_project_pitch.src.zoo_habitat_occupancy import get_habitat_occupancy
+from d1_project_pitch.src.zoo_habitat_assignment import assign_animal_to_habitat
+
+DEFAULT_TIME_LIMIT = 5.0
+
+SOURCE = ("source",)
+SINK = ("sink",)
+
+SIDES = (SOCIAL_CLASS, SOLITARY_CLASS)
+
+def max_flow(graph, source, sink, log=None):
+    """
+    Push as much flow as possible from source to sink with Edmonds-Karp
+
+    graph is a dict of node to a dict of next node to capacity and is
+    changed in place into the residual graph, so calling it again on a
+    residual graph only adds the flow that is now possible. Every change
+    is added to log as (node, next node, old capacity) if a log is given,
+    so it can be undone. Returns the flow added
+    """
+    total = 0
+    while True:
+        parents = {source: None}
+        queue = deque([source])
+        while queue and sink not in parents:
+            node = queue.popleft()
+            for next_node, capacity in graph[node].items():
+                if capacity > 0 and next_node not in parents:
+                    parents[next_node] = node
+                    queue.append(next_node)
+
+        if sink not in parents:
+            return total
+
+        #find the narrowest edge on the path and push that much along it
+        bottleneck = None
+        node = sink
+        while parents[node] is not None:
+            capacity = graph[parents[node]][node]
+            bottleneck = capacity if bottleneck is None else min(bottleneck, capacity)
+            node = parents[node]
+
+        node = sink
+        while parents[node] is not None:
+            parent = parents[node]
+            set_capacity(graph, parent, node, graph[parent][node] - bottleneck, log)
+            set_capacity(graph, node, parent, graph[node].get(parent, 0) + bottleneck, log)
+            node = parent
+
+        total += bottleneck
+
+def set_capacity(graph, node, next_node, capacity, log=None):
+    """
+    Set the capacity of an edge, None takes the edge out, and log the old value
+    """
+    if log is not None:
+        log.append((node, next_node, graph[node].get(next_node)))
+
+    if capacity is None:
+        graph[node].pop(next_node, None)
+    else:
+        graph[node][next_node] = capacity
+
+def undo_changes(graph, log, length):
+    """
+    Undo the logged changes to a graph back to an earlier length of the log
+    """
+    while len(log) > length:
+        node, next_node, capacity = log.pop()
+        set_capacity(graph, node, next_node, capacity)
+
+def get_habitat_options(habitat_name, habitat, all_animals):
+    """
+    Get what a habitat can still take, from the animals already in it
+
+    Returns None if the animals in it already clash, otherwise the
+    (diet, habitat type, temperament) every new animal must have, or None
+    for an empty habitat, and the sides (social or solitary) it can be.
+    Raises ValueError if an animal in the habitat is not in all_animals,
+    since its traits would be missed
+    """
+    traits = build_habitat_traits(habitat, all_animals)
+
+    missing = [animal_id for animal_id in habitat["current_animals"] if animal_id not in traits.profiles]
+    if missing:
+        raise ValueError(f"Animals in habitat '{habitat_name}' are not in all_animals: {', '.join(missing)}")
+
+    if not traits.profiles:
+        return None, SIDES
+
+    if len(traits.diets) > 1 or len(traits.habitat_types) > 1 or len(traits.temperaments) > 1:
+        return None
+
+    mask = traits.get_social_mask()
+    if mask == SOLITARY_CLASS | SOCIAL_CLASS:
+        return None
+
+    group = (next(iter(traits.diets)), next(iter(traits.habitat_types)), next(iter(traits.temperaments)))
+    return group, tuple(side for side in SIDES if not mask or mask == side)
+
+def fits(animal_class, habitat_type):
+    """
+    Check if a class of animals can go in a habitat of a type
+    """
+    return habitat_type is not None and animal_class[1] == habitat_type[0] and animal_class[2] in (0, habitat_type[1])
+
+class PlacementProblem:
+    """
+    The animals to place grouped into classes, and the habitats with their free space
+
+    Animals of the same species, traits and social class can go in the
+    same habitats, so the search works on the classes and not on each
+    animal. A habitat's type is the traits and social side every animal in
+    it shares. Once every habitat has a type, the most animals that can be
+    placed is a max-flow from the classes to the habitats
+    """
+
+    def __init__(self, animals, habitats, all_animals):
+        self.habitats = habitats
+        self.classes = {}
+        self.unplaced = {}
+
+        occupancy = get_habitat_occupancy(habitats)
+        for animal in animals:
+            current_habitat = occupancy.get_habitat(animal["animal_id"])
+            if current_habitat is not None:
+                self.unplaced[animal["animal_id"]] = f"Already in habitat '{current_habitat}'."
+                continue
+
+            diet, habitat_type, temperament, social_needs = get_trait_profile(animal)
+            animal_class = (animal.get("species"), (diet, habitat_type, temperament), get_social_class(social_needs))
+            self.classes.setdefault(animal_class, []).append(animal)
+
+        self.free_space = {}
+        self.accepts = {}
+        self.candidates = {}
+
+        for habitat_name, habitat in habitats.items():
+            self.free_space[habitat_name] = max(habitat["capacity"] - len(habitat["current_animals"]), 0)
+
+            #habitats without a list of compatible species take any species
+            compatible_species = habitat.get("compatible_species")
+            self.accepts[habitat_name] = [animal_class for animal_class in self.classes
+                                          if compatible_species is None or animal_class[0] in compatible_species]
+            self.candidates[habitat_name] = self.get_candidate_types(habitat_name, habitat, all_animals)
+
+        #the biggest habitats are decided first, they matter most to the total, and the same habitats are kept together
+        kinds = {}
+        keys = {name: (self.free_space[name], kinds.setdefault((tuple(self.accepts[name]), tuple(self.candidates[name])), len(kinds)))
+                for name in habitats if self.free_space[name] and self.candidates[name]}
+        self.order = sorted(keys, key=lambda name: (-keys[name][0], keys[name][1]))
+        self.symmetry_keys = [keys[name] for name in self.order]
+
+    def get_candidate_types(self, habitat_name, habitat, all_animals):
+        """
+        Get the types a habitat could be given, the ones that fit the most animals first
+        """
+        options = get_habitat_options(habitat_name, habitat, all_animals)
+        if options is None:
+            return []
+
+        group, sides = options
+        counts = {}
+        for animal_class in self.accepts[habitat_name]:
+            if group is not None and animal_class[1] != group:
+                continue
+
+            #an animal that is neither solitary nor social fits either side
+            for side in sides:
+                if animal_class[2] in (0, side):
+                    habitat_type = (animal_class[1], side)
+                    counts[habitat_type] = counts.get(habitat_type, 0) + len(self.classes[animal_class])
+
+        return sorted(counts, key=lambda habitat_type: (-counts[habitat_type], str(habitat_type)))
+
+    def build_graph(self):
+        """
+        Build the flow graph with every habitat relaxed and push the most flow through it
+
+        A relaxed habitat takes any class one of its candidate types fits,
+        so the flow is an upper bound on the animals that can be placed.
+        Returns the residual graph and the flow
+        """
+        graph = {SOURCE: {}, SINK: {}}
+
+        for animal_class, members in self.classes.items():
+            graph[SOURCE][animal_class] = len(members)
+            graph[animal_class] = {}
+
+        for habitat_name in self.order:
+            node = ("habitat", habitat_name)
+            graph[node] = {SINK: self.free_space[habitat_name]}
+            for animal_class in self.accepts[habitat_name]:
+                if any(fits(animal_class, habitat_type) for habitat_type in self.candidates[habitat_name]):
+                    graph[animal_class][node] = len(self.classes[animal_class])
+                    graph[node][animal_class] = 0
+
+        return graph, max_flow(graph, SOURCE, SINK)
+
+    def fix_type(self, graph, habitat_name, habitat_type, log):
+        """
+        Give a relaxed habitat a type in the residual graph and repair the flow
+
+        The edges of classes the type does not fit are taken out and the
+        animals sent along them are sent back, then the flow is topped up
+        from the residual graph instead of being worked out again. Returns
+        the change in flow
+        """
+        node = ("habitat", habitat_name)
+        change = 0
+
+        for animal_class in self.accepts[habitat_name]:
+            if animal_class not in graph[node] or fits(animal_class, habitat_type):
+                continue
+
+            sent = graph[node][animal_class]
+            set_capacity(graph, animal_class, node, None, log)
+            set_capacity(graph, node, animal_class, None, log)
+
+            if sent:
+                set_capacity(graph, node, SINK, graph[node][SINK] + sent, log)
+                set_capacity(graph, SINK, node, graph[SINK][node] - sent, log)
+                set_capacity(graph, SOURCE, animal_class, graph[SOURCE][animal_class] + sent, log)
+                set_capacity(graph, animal_class, SOURCE, graph[animal_class][SOURCE] - sent, log)
+                change -= sent
+
+        return change + max_flow(graph, SOURCE, SINK, log)
+
+    def get_flows(self, graph):
+        """
+        Get the number of each class sent to each habitat from a residual graph
+        """
+        flows = {}
+        for habitat_name in self.order:
+            node = ("habitat", habitat_name)
+            for animal_class in self.accepts[habitat_name]:
+                sent = graph[node].get(animal_class, 0)
+                if sent and node in graph[animal_class]:
+                    flows[(animal_class, habitat_name)] = sent
+        return flows
+
+    def get_choices(self, graph, depth, chosen):
+        """
+        Get the (candidate position, type) choices for the habitat at a depth, most promising first
+
+        Types are ordered by how many animals the relaxed flow already sends
+        the habitat that the type fits. A habitat the same as the one before
+        it only tries types from the one chosen there on, since swapping the
+        types of two such habitats gives the same answer
+        """
+        habitat_name = self.order[depth]
+        node = ("habitat", habitat_name)
+
+        first = 0
+        if depth and self.symmetry_keys[depth] == self.symmetry_keys[depth - 1]:
+            first = chosen[depth - 1]
+
+        received = {}
+        for position in range(first, len(self.candidates[habitat_name])):
+            habitat_type = self.candidates[habitat_name][position]
+            received[position] = sum(graph[node].get(animal_class, 0) for animal_class in self.accepts[habitat_name]
+                                     if fits(animal_class, habitat_type))
+
+        return [(position, self.candidates[habitat_name][position])
+                for position in sorted(received, key=lambda position: (-received[position], position))]
+
+    def search(self, time_limit=DEFAULT_TIME_LIMIT):
+        """
+        Find the habitat types that place the most animals, by branch and bound
+
+        Habitats are given types one at a time on a single residual graph,
+        with the habitats not decided yet relaxed so every step has an upper
+        bound, and the changes of each step are logged so backtracking
+        undoes them. The most promising type is tried first, so the first
+        full answer is a good greedy one, and steps that can not beat the
+        best answer so far are cut. After time_limit seconds the best answer
+        so far is kept, the first one is always finished. Returns the types,
+        the flows and if the answer is known to be the best
+        """
+        deadline = time.perf_counter() + time_limit
+        graph, bound = self.build_graph()
+        log = []
+
+        best = {"total": -1, "types": {}, "flows": {}}
+        types = {}
+        chosen = [0] * len(self.order)
+        stopped = False
+
+        #each frame is [depth, flow, log length of its graph, choices, next choice]
+        stack = [[0, bound, 0, None, 0]]
+        while stack:
+            frame = stack[-1]
+            depth, total, base = frame[0], frame[1], frame[2]
+
+            if total <= best["total"]:
+                stack.pop()
+                continue
+
+            if depth == len(self.order):
+                best.update(total=total, types=dict(types), flows=self.get_flows(graph))
+                stack.pop()
+                continue
+
+            if best["total"] >= 0 and time.perf_counter() > deadline:
+                stopped = True
+                break
+
+            undo_changes(graph, log, base)
+            if frame[3] is None:
+                frame[3] = self.get_choices(graph, depth, chosen)
+            if frame[4] == len(frame[3]):
+                stack.pop()
+                continue
+
+            position, habitat_type = frame[3][frame[4]]
+            frame[4] += 1
+
+            habitat_name = self.order[depth]
+            types[habitat_name] = habitat_type
+            chosen[depth] = position
+            change = self.fix_type(graph, habitat_name, habitat_type, log)
+            stack.append([depth + 1, total + change, len(log), None, 0])
+
+        return best["types"], best["flows"], not stopped or best["total"] == bound
+
+    def explain(self, animal_class, types):
+        """
+        Get the reason a class of animals could not all be placed
+        """
+        species = animal_class[0]
+        accepting = [name for name in self.habitats if animal_class in self.accepts[name]]
+        if not accepting:
+            return f"No habitat takes {species}."
+
+        with_space = [name for name in accepting if self.free_space[name]]
+        if not with_space:
+            return f"No space left in {', '.join(accepting)}."
+
+        fitting = [name for name in with_space if fits(animal_class, types.get(name))]
+        if not fitting:
+            return f"Not compatible with the animals in {', '.join(with_space)}."
+        return f"No space left in {', '.join(fitting)}."
+
+def solve_placement(animals, habitats, all_animals, time_limit=DEFAULT_TIME_LIMIT):
+    """
+    Work out where to put many animals so as many as possible are placed
+
+    Every habitat keeps to its capacity and compatible species, and every
+    animal in a habitat, old and new, is compatible with the others.
+    all_animals must hold every animal already in the habitats, a
+    ValueError is raised for any that can not be found.
+    Returns the animal ID to habitat name assignments, the reasons for the
+    animals that could not be placed and if the placement is the best one
+    """
+    problem = PlacementProblem(animals, habitats, all_animals)
+    types, flows, optimal = problem.search(time_limit)
+
+    assignments = {}
+    unplaced = dict(problem.unplaced)
+
+    for animal_class, members in problem.classes.items():
+        position = 0
+        for habitat_name in problem.order:
+            sent = flows.get((animal_class, habitat_name), 0)
+            for animal in members[position:position + sent]:
+                assignments[animal["animal_id"]] = habitat_name
+            position += sent
+
+        if position < len(members):
+            reason = problem.explain(animal_class, types)
+            for animal in members[position:]:
+                unplaced[animal["animal_id"]] = reason
+
+    return {
+        "assignments": assignments,
+        "unplaced": unplaced,
+        "placed": len(assignments),
+        "optimal": optimal,
+        "habitat_types": types
+    }
+
+def apply_placement(placement, animals, habitats, all_animals):
+    """
+    Assign the animals of a placement to their habitats
+
+    Each assignment goes through assign_animal_to_habitat so the checks
+    and indexes stay the same as for one animal. Returns the IDs placed and
+    a list of (animal ID, message) for any that were refused
+    """
+    animals_by_id = {animal["animal_id"]: animal for animal in animals}
+
+    #the new animals have to be found too once they are in a habitat
+    everyone = list(all_animals)
+    known_ids = {animal["animal_id"] for animal in everyone}
+    everyone.extend(animal for animal in animals if animal["animal_id"] not in known_ids)
+
+    placed = []
+    refused = []
+    for animal_id, habitat_name in placement["assignments"].items():
+        success, message = assign_animal_to_habitat(animals_by_id[animal_id], habitat_name, habitats, everyone)
+        if success:
+            placed.append(animal_id)
+        else:
+            refused.append((animal_id, message))
+
+    return placed, refused
@@ -0,0 +1,176 @@
+"""
+File that keeps running totals of the traits of the animals in each habitat
+"""
+
+from collections import Counter
+from d1_project_pitch.src.zoo_business_logic import get_trait_profile, get_social_class, SOLITARY_CLASS, SOCIAL_CLASS
+from d1_project_pitch.src.zoo_animal_registry import AnimalRegistry
+from d1_project_pitch.src.zoo_habitat_version import take_list_snapshot, snapshot_matches
+
+#the social class bits each social class can not live with
+CLASHING_CLASSES = {SOLITARY_CLASS: SOCIAL_CLASS, SOCIAL_CLASS: SOLITARY_CLASS}
+
+class HabitatTraits:
+    """
+    The diets, habitat types, temperaments and social classes of a habitat's animals
+
+    Two animals are compatible when they have the same diet, habitat type
+    and temperament and are not one solitary and one social, so an animal
+    can join a habitat when its traits are the only ones there and its
+    social class does not clash with the habitat's social class mask. That
+    check does not depend on how many animals live in the habitat. The
+    totals are checked against a snapshot of the list and the habitat
+    version the occupancy index also uses, and belong to the animals they were built from.
+    missing counts the residents that had no record, whose traits the
+    totals can not know
+    """
+
+    def __init__(self, current_animals, all_animals=None):
+        self.snapshot = take_list_snapshot(current_animals)
+        self.all_animals = all_animals
+        self.count = 0
+        self.missing = 0
+        self.profiles = {}
+        self.diets = Counter()
+        self.habitat_types = Counter()
+        self.temperaments = Counter()
+        self.social_classes = Counter()
+
+    def is_current(self, habitat):
+        """
+        Check if the totals still match the habitat's list of animals
+
+        They do not when the list was replaced or edited without going through
+        assign and remove, or an animal's traits changed
+        """
+        return snapshot_matches(self.snapshot, habitat["current_animals"])
+
+    def add(self, animal_id, animal=None):
+        """
+        Add an animal to the totals, animals without a record only count towards the size
+        """
+        self.count += 1
+        if animal is None:
+            self.missing += 1
+            return
+
+        profile = get_trait_profile(animal)
+        self.profiles[animal_id] = profile
+        diet, habitat_type, temperament, social_needs = profile
+        self.diets[diet] += 1
+        self.habitat_types[habitat_type] += 1
+        self.temperaments[temperament] += 1
+        self.social_classes[get_social_class(social_needs)] += 1
+
+    def remove(self, animal_id):
+        """
+        Take an animal out of the totals
+        """
+        self.count -= 1
+        profile = self.profiles.pop(animal_id, None)
+        if profile is None:
+            self.missing -= 1
+            return
+
+        diet, habitat_type, temperament, social_needs = profile
+        for totals, value in ((self.diets, diet), (self.habitat_types, habitat_type),
+                              (self.temperaments, temperament), (self.social_classes, get_social_class(social_needs))):
+            totals[value] -= 1
+            if not totals[value]:
+                del totals[value]
+
+    def get_social_mask(self):
+        """
+        Get the social class bits of every animal in the habitat
+        """
+        mask = 0
+        for social_class in self.social_classes:
+            mask |= social_class
+        return mask
+
+    def admits(self, animal):
+        """
+        Check if an animal is compatible with every animal in the habitat
+        """
+        diet, habitat_type, temperament, social_needs = get_trait_profile(animal)
+
+        for totals, value in ((self.diets, diet), (self.habitat_types, habitat_type), (self.temperaments, temperament)):
+            if totals and (len(totals) > 1 or value not in totals):
+                return False
+
+        return not self.get_social_mask() & CLASHING_CLASSES.get(get_social_class(social_needs), 0)
+
+_habitat_traits = {}
+
+def build_habitat_traits(habitat, all_animals):
+    """
+    Work out the trait totals of a habitat from its list of animals
+    """
+    traits = HabitatTraits(habitat["current_animals"], all_animals)
+
+    #an empty habitat does not need the animals looked at
+    if not habitat["current_animals"]:
+        return traits
+
+    if isinstance(all_animals, AnimalRegistry):
+        lookup = all_animals.get
+    else:
+        animals_by_id = {}
+        for animal in all_animals:
+            animals_by_id.setdefault(animal.get("animal_id"), animal)
+        lookup = animals_by_id.get
+
+    for animal_id in habitat["current_animals"]:
+        traits.add(animal_id, lookup(animal_id))
+    return traits
+
+def get_habitat_traits(habitat_name, habitat, all_animals):
+    """
+    Get the trait totals of a habitat, building them again if its list of animals changed behind their back
+    or they were built from other animals
+
+    Totals missing a resident's record are not kept, as a later call could pass animals that have it
+    """
+    traits = _habitat_traits.get(habitat_name)
+    if traits is None or traits.all_animals is not all_animals or not traits.is_current(habitat):
+        traits = build_habitat_traits(habitat, all_animals)
+        if traits.missing:
+            _habitat_traits.pop(habitat_name, None)
+        else:
+            _habitat_traits[habitat_name] = traits
+    return traits
+
+def record_assignment(habitat_name, habitat, animal):
+    """
+    Update a habitat's trait totals after an animal was added to its list
+    """
+    traits = _habitat_traits.get(habitat_name)
+    if traits is None:
+        return
+
+    #the totals must have matched the list before the animal was added, or they are rebuilt next time
+    if snapshot_matches(traits.snapshot, habitat["current_animals"], 1):
+        traits.add(animal["animal_id"], animal)
+        traits.snapshot = take_list_snapshot(habitat["current_animals"])
+    else:
+        del _habitat_traits[habitat_name]
+
+def record_removal(habitat_name, habitat, animal_id):
+    """
+    Update a habitat's trait totals after an animal was taken off its list
+    """
+    traits = _habitat_traits.get(habitat_name)
+    if traits is None:
+        return
+
+    if snapshot_matches(traits.snapshot, habitat["current_animals"], -1):
+        traits.remove(animal_id)
+        traits.snapshot = take_list_snapshot(habitat["current_animals"])
+    else:
+        del _habitat_traits[habitat_name]
+
+def clear_habitat_traits():
+    """
+    Forget every habitat's trait totals
+    """
+    _habitat_traits.clear()
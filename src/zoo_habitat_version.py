@@ -0,0 +1,41 @@
+"""
+File that keeps the version number the cached habitat indexes are checked against
+"""
+
+#bumped whenever habitat lists or the traits of animals change outside assign and remove
+_habitat_version = 0
+
+def get_habitat_version():
+    """
+    Get the current habitat version
+    """
+    return _habitat_version
+
+def mark_habitats_changed():
+    """
+    Make every cached habitat index rebuild the next time it is used
+
+    Assign and remove keep the indexes up to date themselves, anything else
+    that edits a habitat's list or an animal's traits calls this
+    """
+    global _habitat_version
+    _habitat_version += 1
+
+def take_list_snapshot(current_animals):
+    """
+    Remember a habitat's list as an index saw it
+    """
+    return (current_animals, len(current_animals), current_animals[-1] if current_animals else None, _habitat_version)
+
+def snapshot_matches(snapshot, current_animals, change=0):
+    """
+    Check if a habitat's list is still the one a snapshot was taken of
+
+    change is the number of animals assign or remove just added or took off,
+    then only the list and its length are compared as the last animal moved
+    """
+    if snapshot is None or snapshot[0] is not current_animals or snapshot[3] != _habitat_version:
+        return False
+    if snapshot[1] + change != len(current_animals):
+        return False
+    return change != 0 or snapshot[2] == (current_animals[-1] if current_animals else None)
@@ -0,0 +1,219 @@
+"""
+File that calculates the health status of a whole population at once with NumPy
+"""
+
+from d1_project_pitch.src.zoo_species_data import get_health_baseline
+from d1_project_pitch.src.zoo_health_tracking import calculate_health_status, find_concerning_term, CONCERNING_TERMS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STATUS_UNKNOWN = -1
+STATUS_HEALTHY = 0
+STATUS_NEEDS_ATTENTION = 1
+STATUS_CRITICAL = 2
+
+STATUS_NAMES = {
+    STATUS_UNKNOWN: "unknown",
+    STATUS_HEALTHY: "healthy",
+    STATUS_NEEDS_ATTENTION: "needs attention",
+    STATUS_CRITICAL: "critical"
+}
+
+VACCINATION_CODES = {"overdue": 1, "none": 2}
+
+def get_baseline_arrays(species_names):
+    """
+    Get arrays of the baseline ranges for a list of species
+    """
+    baselines = [get_health_baseline(species) for species in species_names]
+
+    return {
+        "weight_min": np.array([baseline["weight_range"][0] for baseline in baselines], dtype=float),
+        "weight_max": np.array([baseline["weight_range"][1] for baseline in baselines], dtype=float),
+        "temp_min": np.array([baseline["temp_range"][0] for baseline in baselines], dtype=float),
+        "temp_max": np.array([baseline["temp_range"][1] for baseline in baselines], dtype=float),
+        "hr_min": np.array([baseline["hr_range"][0] for baseline in baselines], dtype=float),
+        "hr_max": np.array([baseline["hr_range"][1] for baseline in baselines], dtype=float)
+    }
+
+def classify_latest_vitals(species_index, baselines, weight_kg, temperature_c, heart_rate, vaccination_code, note_term):
+    """
+    Work out the issue flags and status code of many readings at once
+
+    species_index picks each reading's row in the baseline arrays, missing
+    vitals are NaN, vaccination_code is 1 for overdue and 2 for none, and
+    note_term is the index of the concerning term in the notes or -1.
+    Returns the status codes and a dict of boolean flag arrays
+    """
+    weight_min = baselines["weight_min"][species_index]
+    weight_max = baselines["weight_max"][species_index]
+    temp_min = baselines["temp_min"][species_index]
+    temp_max = baselines["temp_max"][species_index]
+    hr_min = baselines["hr_min"][species_index]
+    hr_max = baselines["hr_max"][species_index]
+
+    #NaN compares false everywhere, so missing vitals never raise a flag
+    weight_invalid = weight_kg <= 0
+    weight_under = ~weight_invalid & (weight_kg < weight_min)
+    weight_over = ~weight_invalid & ~weight_under & (weight_kg > weight_max)
+
+    temp_low = temperature_c < temp_min
+    temp_high = ~temp_low & (temperature_c > temp_max)
+
+    hr_invalid = heart_rate <= 0
+    hr_low = ~hr_invalid & (heart_rate < hr_min)
+    hr_high = ~hr_invalid & ~hr_low & (heart_rate > hr_max)
+
+    vaccination_issue = vaccination_code > 0
+    note_issue = note_term >= 0
+
+    flags = {
+        "weight_invalid": weight_invalid, "weight_under": weight_under, "weight_over": weight_over,
+        "temp_low": temp_low, "temp_high": temp_high,
+        "hr_invalid": hr_invalid, "hr_low": hr_low, "hr_high": hr_high,
+        "vaccination": vaccination_issue, "note": note_issue
+    }
+
+    issue_count = (weight_invalid | weight_under | weight_over).astype(np.int8) \
+        + (temp_low | temp_high) \
+        + (hr_invalid | hr_low | hr_high) \
+        + vaccination_issue \
+        + note_issue
+
+    temp_issue = temp_low | temp_high
+    status = np.where(issue_count == 0, STATUS_HEALTHY,
+                      np.where((issue_count <= 2) & ~temp_issue, STATUS_NEEDS_ATTENTION, STATUS_CRITICAL))
+
+    return status, flags
+
+def collect_latest_vitals(animals):
+    """
+    Pull the latest reading of every animal into arrays
+
+    Returns the arrays plus the latest data dicts, which are kept for
+    writing the details of animals that have issues
+    """
+    nan = float("nan")
+    species_names = []
+    species_lookup = {}
+
+    #plain lists are filled first, setting numpy elements one by one is much slower
+    species_index = []
+    weight_kg = []
+    temperature_c = []
+    heart_rate = []
+    vaccination_code = []
+    note_term = []
+    latest_records = []
+
+    for animal in animals:
+        species = animal.get("species", "")
+        index = species_lookup.get(species)
+        if index is None:
+            index = species_lookup[species] = len(species_names)
+            species_names.append(species)
+        species_index.append(index)
+
+        health_records = animal.get("health_records")
+        latest = health_records[-1]["data"] if health_records else {}
+        latest_records.append(latest if health_records else None)
+
+        weight_kg.append(latest["weight_kg"] if "weight_kg" in latest else nan)
+        temperature_c.append(latest["temperature_c"] if "temperature_c" in latest else nan)
+        heart_rate.append(latest["heart_rate"] if "heart_rate" in latest else nan)
+        vaccination_code.append(VACCINATION_CODES.get(latest.get("vaccination_status"), 0))
+
+        vet_notes = latest.get("vet_notes")
+        note_term.append(find_concerning_term(vet_notes) if vet_notes else -1)
+
+    vitals = {
+        "species_index": np.array(species_index, dtype=np.intp),
+        "weight_kg": np.array(weight_kg, dtype=float),
+        "temperature_c": np.array(temperature_c, dtype=float),
+        "heart_rate": np.array(heart_rate, dtype=float),
+        "vaccination_code": np.array(vaccination_code, dtype=np.int8),
+        "note_term": np.array(note_term, dtype=np.int16)
+    }
+    has_records = np.array([latest is not None for latest in latest_records], dtype=bool)
+    return species_names, vitals, has_records, latest_records
+
+def describe_issues(i, flags, latest, baseline, note_term):
+    """
+    Write out the issues of one reading the same way calculate_health_status does
+
+    flags holds plain lists here, indexing numpy arrays one element at a time is slow
+    """
+    issues = []
+
+    if flags["weight_invalid"][i]:
+        issues.append("invalid weight")
+    elif flags["weight_under"][i]:
+        issues.append(f"underweight ({latest['weight_kg']}kg < {baseline['weight_range'][0]}kg)")
+    elif flags["weight_over"][i]:
+        issues.append(f"overweight ({latest['weight_kg']}kg > {baseline['weight_range'][1]}kg)")
+
+    if flags["temp_low"][i]:
+        issues.append(f"low temperature ({latest['temperature_c']}°C < {baseline['temp_range'][0]}°C)")
+    elif flags["temp_high"][i]:
+        issues.append(f"high temperature ({latest['temperature_c']}°C > {baseline['temp_range'][1]}°C)")
+
+    if flags["hr_invalid"][i]:
+        issues.append("invalid heart rate")
+    elif flags["hr_low"][i]:
+        issues.append(f"low heart rate ({latest['heart_rate']}bpm < {baseline['hr_range'][0]}bpm)")
+    elif flags["hr_high"][i]:
+        issues.append(f"high heart rate ({latest['heart_rate']}bpm > {baseline['hr_range'][1]}bpm)")
+
+    if flags["vaccination"][i]:
+        if latest.get("vaccination_status") == "overdue":
+            issues.append("vaccinations overdue")
+        else:
+            issues.append("no vaccinations")
+
+    if note_term >= 0:
+        issues.append(f"noted: {CONCERNING_TERMS[note_term]}")
+
+    return issues
+
+def calculate_health_status_batch(animals):
+    """
+    Calculate the health status of many animals at once
+
+    Gives the same (status, details) as calling calculate_health_status on
+    each animal. Without NumPy it falls back to doing exactly that
+    """
+    animals = list(animals)
+
+    if np is None:
+        return [calculate_health_status(animal) for animal in animals]
+
+    species_names, vitals, has_records, latest_records = collect_latest_vitals(animals)
+    baselines = get_baseline_arrays(species_names)
+
+    status, flags = classify_latest_vitals(baselines=baselines, **vitals)
+    status = np.where(has_records, status, STATUS_UNKNOWN)
+
+    results = []
+    species_baselines = [get_health_baseline(species) for species in species_names]
+
+    species_index = vitals["species_index"].tolist()
+    note_terms = vitals["note_term"].tolist()
+    flag_lists = {name: flag.tolist() for name, flag in flags.items()}
+
+    for i, code in enumerate(status.tolist()):
+        if code == STATUS_UNKNOWN:
+            results.append(("unknown", "No health records available"))
+        elif code == STATUS_HEALTHY:
+            results.append(("healthy", "All health indicators normal"))
+        else:
+            #only animals with issues need their details written out
+            issues = describe_issues(i, flag_lists, latest_records[i], species_baselines[species_index[i]], note_terms[i])
+            if code == STATUS_NEEDS_ATTENTION:
+                results.append(("needs attention", f"Minor issues: {', '.join(issues)}"))
+            else:
+                results.append(("critical", f"Health concerns: {', '.join(issues)}"))
+
+    return results
@@ -0,0 +1,75 @@
+"""
+File that caches the health status of animals until their health records change
+"""
+
+from collections import OrderedDict
+from d1_project_pitch.src.zoo_health_tracking import calculate_health_status
+from d1_project_pitch.src.zoo_species_data import get_baselines_version
+
+DEFAULT_MAX_SIZE = 100000
+
+class HealthStatusCache:
+    """
+    Remembers the health status of each animal
+
+    An entry keeps the animal's latest health record itself and is only
+    used while that same record is still the latest, so a new health check
+    makes the next lookup recalculate. Holding the record means its id can
+    not be reused by a different record. Entries are also keyed by the
+    version of the species baselines, and the least recently used entries
+    are dropped once there are more than max_size
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.entries = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get_status(self, animal):
+        """
+        Get the (status, details) of an animal, calculating it only if its inputs changed
+        """
+        health_records = animal.get("health_records") or []
+        latest_record = health_records[-1] if health_records else None
+        baselines_version = get_baselines_version()
+        animal_id = animal.get("animal_id")
+
+        entry = self.entries.get(animal_id)
+        if entry is not None and entry[0] is latest_record and entry[1] == baselines_version \
+                and entry[2] == animal.get("species"):
+            self.hits += 1
+            self.entries.move_to_end(animal_id)
+            return entry[3]
+
+        self.misses += 1
+        result = calculate_health_status(animal)
+        self.entries[animal_id] = (latest_record, baselines_version, animal.get("species"), result)
+        self.entries.move_to_end(animal_id)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return result
+
+    def invalidate(self, animal_id=None):
+        """
+        Drop the cached status of one animal, or of every animal if no ID is given
+        """
+        if animal_id is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(animal_id, None)
+
+    def get_stats(self):
+        """
+        Get the hit and miss counters
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+HEALTH_STATUS_CACHE = HealthStatusCache()
+
+def get_cached_health_status(animal):
+    """
+    Get an animal's health status from the shared cache
+    """
+    return HEALTH_STATUS_CACHE.get_status(animal)
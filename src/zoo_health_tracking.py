@@ -4,27 +4,83 @@ File that records the health check for an animal
 
 import datetime
 from d1_project_pitch.src.zoo_species_data import *
+from d1_project_pitch.src.zoo_text_matching import TermMatcher
+from d1_project_pitch.src.zoo_animal_record import append_to_history
 
-def record_health_check(animal, health_data):
+CONCERNING_TERMS = ["lethargic", "lethargy", "not eating", "anorexic", "limping", "injured", "infection"]
+
+#built once and shared by every status check and note scan
+_concerning_terms_matcher = TermMatcher(CONCERNING_TERMS)
+
+def set_concerning_terms(terms):
+    """
+    Replace the list of concerning vet note terms and rebuild the matcher
+
+    Earlier terms in the list win when a note mentions several of them
+    """
+    global _concerning_terms_matcher
+
+    #updated in place so modules that imported the list see the new terms
+    CONCERNING_TERMS[:] = terms
+    _concerning_terms_matcher = TermMatcher(CONCERNING_TERMS)
+
+    #cached health statuses depend on the terms as much as on the baselines
+    mark_baselines_changed()
+
+def find_concerning_term(vet_notes):
+    """
+    Get the index of the first listed concerning term in the notes, or -1
+    """
+    if not vet_notes:
+        return -1
+    return _concerning_terms_matcher.find_first_term_index(vet_notes)
+
+def scan_vet_notes(animals):
+    """
+    Find the concerning terms in every vet note of every animal
+
+    Yields (animal ID, record date, terms) for each health record whose notes mention any term
+    """
+    matcher = _concerning_terms_matcher
+
+    for animal in animals:
+        for health_record in animal.get("health_records") or []:
+            vet_notes = health_record.get("data", {}).get("vet_notes")
+            if not vet_notes:
+                continue
+
+            terms = matcher.find_terms(vet_notes)
+            if terms:
+                yield animal.get("animal_id"), health_record.get("date"), terms
+
+def record_health_check(animal, health_data, vitals_store=None, notes_index=None, vitals_stats=None):
     """
     
     Record health check for animal
+
+    If a vitals store is given the reading is appended to it as well,
+    if a notes index is given the vet notes are indexed and if a vitals
+    stats tracker is given the reading is added to the animal's rolling stats
     
     """
-    updated_animal = animal.copy()
-
-    #initialise if not there alrady
-    if "health_records" not in updated_animal:
-        updated_animal["health_records"] = []
-
     #create entry for a health record with a format
     health_record = { 
         "date": datetime.datetime.now().isoformat(), 
         "data": health_data
           }
-    
-    #adds the new health record to the animals list of past records
-    updated_animal["health_records"].append(health_record) 
+
+    #the new version shares everything with the old one, which keeps seeing its own history
+    updated_animal = append_to_history(animal, "health_records", health_record)
+
+    if vitals_store is not None:
+        vitals_store.append_record(updated_animal["animal_id"], health_record)
+
+    if notes_index is not None:
+        notes_index.add_record(updated_animal["animal_id"], len(updated_animal["health_records"]) - 1, health_record)
+
+    if vitals_stats is not None:
+        vitals_stats.record(updated_animal["animal_id"], health_data)
+
     return updated_animal
 
 def check_weight(latest_record, baseline, issues):
@@ -70,10 +126,17 @@ def check_heart_rate(latest_record, baseline, issues):
         elif hr > max_hr: 
             issues.append(f"high heart rate ({hr}bpm > {max_hr}bpm)")
 
-def calculate_health_status(animal):
+def calculate_health_status(animal, vitals_store=None):
     """
     Calculate overall health status based on latest health check
+
+    If a vitals store with readings for the animal is given, the latest
+    reading is read straight from its columns
     """
+    if vitals_store is not None:
+        latest_reading = vitals_store.get_latest(animal.get("animal_id"))
+        if latest_reading is not None:
+            return evaluate_health_data(latest_reading, animal.get("species", ""))
 
     if "health_records" not in animal or not animal["health_records"]: 
         return "unknown", "No health records available"
@@ -81,9 +144,13 @@ def calculate_health_status(animal):
     #since we store previous ones as well
     latest_record = animal["health_records"][-1]["data"]
 
+    return evaluate_health_data(latest_record, animal.get("species", ""))
 
+def evaluate_health_data(latest_record, species):
+    """
+    Work out the health status from one reading and the species baseline
+    """
     issues = []
-    species = animal.get("species", "")
 
     baseline = get_health_baseline(species)
 
@@ -98,13 +165,10 @@ def calculate_health_status(animal):
         issues.append("no vaccinations")
     
     #checking vet notes
-    vet_notes = latest_record.get("vet_notes", "").lower() 
-    concerning_terms = ["lethargic", "lethargy", "not eating", "anorexic", "limping", "injured", "infection"] 
+    term_index = find_concerning_term(latest_record.get("vet_notes", "")) 
     
-    for term in concerning_terms: 
-        if term in vet_notes: 
-            issues.append(f"noted: {term}") 
-            break
+    if term_index >= 0: 
+        issues.append(f"noted: {CONCERNING_TERMS[term_index]}") 
 
     #overall status
     if not issues: 
@@ -114,5 +178,12 @@ def calculate_health_status(animal):
     else: 
         return "critical", f"Health concerns: {', '.join(issues)}"
 
-    
-        
\ No newline at end of file
+def calculate_health_statuses(animals):
+    """
+    Calculate the health status of every animal in an iterable of animals
+
+    Works one animal at a time so it can consume a streamed loader directly
+    """
+    for animal in animals:
+        health_status, details = calculate_health_status(animal)
+        yield animal.get("animal_id"), health_status, details
@@ -0,0 +1,235 @@
+"""
+File with a sorted timestamp index over health and feeding history for time range queries
+"""
+
+from bisect import bisect_left, bisect_right
+from array import array
+from collections.abc import Sequence
+from d1_project_pitch.src.zoo_timestamps import iso_to_epoch_us, to_epoch_us, now_epoch_us, MISSING_EPOCH_US
+from d1_project_pitch.src.zoo_persistent_history import HistoryVector
+from d1_project_pitch.src.zoo_feeding_log import FeedingLog
+
+HISTORY_TIME_KEYS = {"health_records": "date", "feeding_history": "timestamp"}
+
+DAY_US = 24 * 60 * 60 * 1000000
+
+class HistoryView(Sequence):
+    """
+    Read-only window onto part of a history list, made without copying the records
+
+    If the history is out of time order, order holds the positions of its
+    records in time order and the window is over that instead
+    """
+
+    __slots__ = ("records", "start", "stop", "order")
+
+    def __init__(self, records, start, stop, order=None):
+        self.records = records
+        self.start = start
+        self.stop = stop
+        self.order = order
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history view index out of range")
+
+        position = self.start + index
+        return self.records[position if self.order is None else self.order[position]]
+
+    def __iter__(self):
+        records = self.records
+        if self.order is None:
+            for position in range(self.start, self.stop):
+                yield records[position]
+        else:
+            for position in range(self.start, self.stop):
+                yield records[self.order[position]]
+
+    def __repr__(self):
+        return f"HistoryView({list(self)!r})"
+
+def get_record_epoch(record, time_key):
+    """
+    Get the timestamp of a history record in microseconds, with missing or bad ones sorting first
+    """
+    epoch_us = iso_to_epoch_us(record.get(time_key))
+    return MISSING_EPOCH_US if epoch_us is None else epoch_us
+
+def get_bound_epoch(moment):
+    """
+    Convert the start or end of a window, raising ValueError if it is not a time
+    """
+    epoch_us = to_epoch_us(moment)
+    if epoch_us is None:
+        raise ValueError(f"Not a valid time: {moment!r}")
+    return epoch_us
+
+class HistoryTimeline:
+    """
+    The timestamps of one history list as int64 epochs, in time order
+
+    Records are normally appended in time order, so keeping up only means
+    converting the new ones. The history itself is never reordered, since
+    its last record is the latest one added and other indexes point into
+    it by position. A record older than the one before it makes the
+    timeline keep a sorted list of positions instead
+    """
+
+    __slots__ = ("records", "time_key", "epochs", "order")
+
+    def __init__(self, records, time_key):
+        self.records = records
+        self.time_key = time_key
+        self.epochs = array('q')
+        self.order = None
+        self.sync()
+
+    def sort(self):
+        """
+        Work out the time order of the records, keeping the order of records with the same time
+        """
+        epochs = [get_record_epoch(record, self.time_key) for record in self.records]
+        order = sorted(range(len(epochs)), key=epochs.__getitem__)
+
+        if any(position != index for index, position in enumerate(order)):
+            self.order = array('q', order)
+        else:
+            self.order = None
+        self.epochs = array('q', (epochs[position] for position in order))
+
+    def sync(self):
+        """
+        Convert the timestamps of records added since the last sync
+        """
+        records = self.records
+        epochs = self.epochs
+
+        if len(epochs) > len(records):
+            self.sort()
+            return
+
+        last = epochs[-1] if epochs else MISSING_EPOCH_US
+        for index in range(len(epochs), len(records)):
+            epoch_us = get_record_epoch(records[index], self.time_key)
+            if epoch_us < last:
+                self.sort()
+                return
+            epochs.append(epoch_us)
+            if self.order is not None:
+                self.order.append(index)
+            last = epoch_us
+
+    def get_bounds(self, start=None, end=None):
+        """
+        Get the positions of the first record at or after start and just past the last one at or before end
+
+        Raises ValueError if start or end is given but is not a time
+        """
+        self.sync()
+
+        start_us = get_bound_epoch(start) if start is not None else None
+        end_us = get_bound_epoch(end) if end is not None else None
+
+        #records without a time are never inside a window
+        low = bisect_right(self.epochs, MISSING_EPOCH_US)
+        if start_us is not None:
+            low = max(low, bisect_left(self.epochs, start_us))
+        high = len(self.epochs) if end_us is None else bisect_right(self.epochs, end_us)
+        return low, max(low, high)
+
+    def between(self, start=None, end=None):
+        """
+        Get a view of the records from start to end, both included, in time order
+
+        start and end can be ISO strings, datetimes or microseconds since 1970
+        """
+        low, high = self.get_bounds(start, end)
+        return HistoryView(self.records, low, high, self.order)
+
+class HistoryIndex:
+    """
+    Timelines for the health records and feeding history of every animal
+
+    Building it converts every ISO timestamp once, which is best done
+    straight after loading. Afterwards only new records are converted
+    """
+
+    def __init__(self, animals=()):
+        self.timelines = {}
+
+        for animal in animals:
+            for history_key in HISTORY_TIME_KEYS:
+                self.get_timeline(animal, history_key)
+
+    def get_timeline(self, animal, history_key):
+        """
+        Get the timeline of one of an animal's histories, making it if needed
+        """
+        records = animal.get(history_key)
+        if records is None:
+            records = animal[history_key] = []
+
+        key = (animal["animal_id"], history_key)
+        timeline = self.timelines.get(key)
+
+        if timeline is not None and timeline.records is not records:
+            #a newer version of a persistent history shares the storage the timeline was built on
+            if isinstance(records, (HistoryVector, FeedingLog)) and records.shares_storage_with(timeline.records) \
+                    and len(records) >= len(timeline.epochs):
+                timeline.records = records
+            else:
+                #the animal was given a new history list, so its old timeline is out of date
+                timeline = None
+
+        if timeline is None:
+            timeline = self.timelines[key] = HistoryTimeline(records, HISTORY_TIME_KEYS[history_key])
+
+        return timeline
+
+    def get_records_between(self, animal, history_key, start=None, end=None):
+        """
+        Get a view of an animal's history records from start to end
+        """
+        return self.get_timeline(animal, history_key).between(start, end)
+
+    def get_health_records_between(self, animal, start=None, end=None):
+        """
+        Get a view of an animal's health records from start to end
+        """
+        return self.get_records_between(animal, "health_records", start, end)
+
+    def get_feedings_between(self, animal, start=None, end=None):
+        """
+        Get a view of an animal's feedings from start to end
+        """
+        return self.get_records_between(animal, "feeding_history", start, end)
+
+    def get_recent_records(self, animal, history_key, days):
+        """
+        Get a view of an animal's history records from the last number of days
+        """
+        return self.get_records_between(animal, history_key, now_epoch_us() - days * DAY_US)
+
+    def count_records_between(self, animals, history_key, start=None, end=None):
+        """
+        Count the history records of many animals from start to end
+        """
+        total = 0
+        for animal in animals:
+            low, high = self.get_timeline(animal, history_key).get_bounds(start, end)
+            total += high - low
+        return total
+
+def build_history_index(animals):
+    """
+    Build a history index for a list of animals
+    """
+    return HistoryIndex(animals)
@@ -0,0 +1,282 @@
+"""
+File that keeps an append-only journal of changes made to the zoo data
+"""
+
+import json
+import os
+import re
+from d1_project_pitch.src.zoo_animal_record import to_json_value
+from d1_project_pitch.src.zoo_habitat_version import mark_habitats_changed
+
+JOURNAL_SUFFIX = ".journal"
+
+#a journal without a generation record was written before snapshots had one
+FIRST_GENERATION = 1
+SNAPSHOT_HEADER_SIZE = 256
+SNAPSHOT_HEADER_PATTERN = re.compile(r'\s*\{\s*"generation"\s*:\s*(\d+)')
+
+def get_journal_filename(filename):
+    """
+    Get the journal filename that sits next to a data file
+    """
+    return f"{filename}{JOURNAL_SUFFIX}"
+
+class MutationJournal:
+    """
+    Write-ahead journal that stores one compact JSON record per change
+
+    Records are written straight away and fsynced in batches, and the
+    journal is folded into a full snapshot of the data file by compact().
+    Every journal starts with its generation number and a snapshot stores the
+    generation it folded in, so a journal left behind by a crash during
+    compact() is not replayed twice
+    """
+
+    def __init__(self, filename, batch_size=32, compact_every=1000):
+        self.filename = filename
+        self.journal_filename = get_journal_filename(filename)
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.pending = 0
+        self.entries_since_snapshot = count_journal_entries(self.journal_filename)
+
+        if os.path.exists(self.journal_filename):
+            self.generation = read_journal_generation(self.journal_filename)
+            self.file = open(self.journal_filename, 'a')
+        else:
+            #a new journal must come after the snapshot or its records would be skipped
+            self.generation = read_snapshot_generation(filename) + 1
+            self.start_journal()
+
+    def append(self, entry):
+        """
+        Append a single record to the journal
+        """
+        self.file.write(json.dumps(entry, separators=(',', ':'), default=to_json_value) + "\n")
+        self.pending += 1
+        self.entries_since_snapshot += 1
+
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def start_journal(self, habitats=None):
+        """
+        Swap in a new journal holding only its generation record and the habitat assignments
+        """
+        temp_journal_filename = f"{self.journal_filename}.tmp"
+        self.file = open(temp_journal_filename, 'w')
+        self.pending = 0
+        self.entries_since_snapshot = 0
+        self.file.write(json.dumps({"op": "generation", "generation": self.generation}, separators=(',', ':')) + "\n")
+
+        if habitats:
+            for habitat_name, habitat in habitats.items():
+                for animal_id in habitat["current_animals"]:
+                    self.log_habitat_assignment(animal_id, habitat_name)
+
+        self.flush()
+        self.file.close()
+        os.replace(temp_journal_filename, self.journal_filename)
+        self.file = open(self.journal_filename, 'a')
+
+    def log_new_animal(self, animal):
+        """
+        Record that a new animal was added
+        """
+        self.append({"op": "add", "animal": animal})
+
+    def log_health_check(self, animal_id, health_record):
+        """
+        Record a new health check for an animal
+        """
+        self.append({"op": "health", "id": animal_id, "record": health_record})
+
+    def log_feeding(self, animal_id, feeding_record):
+        """
+        Record a new feeding for an animal
+        """
+        self.append({"op": "feeding", "id": animal_id, "record": feeding_record})
+
+    def log_habitat_assignment(self, animal_id, habitat_name):
+        """
+        Record that an animal was assigned to a habitat
+        """
+        self.append({"op": "assign", "id": animal_id, "habitat": habitat_name})
+
+    def log_habitat_removal(self, animal_id, habitat_name):
+        """
+        Record that an animal was removed from a habitat
+        """
+        self.append({"op": "remove", "id": animal_id, "habitat": habitat_name})
+
+    def flush(self):
+        """
+        Push every pending record to disk
+        """
+        if self.file.closed:
+            return
+
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def should_compact(self):
+        """
+        Check if the journal has grown enough to be folded into a snapshot
+        """
+        return self.entries_since_snapshot >= self.compact_every
+
+    def compact(self, animals, habitats=None):
+        """
+        Write a full snapshot of the animals and start a fresh journal
+
+        The snapshot records the generation of the journal it folds in and the
+        new journal gets the next one. Habitat assignments are not part of the
+        snapshot file, so they are written back into the new journal as assign
+        records. Both files are swapped in with os.replace so a crash leaves
+        either the old or the new version of each
+        """
+        self.flush()
+        self.file.close()
+
+        try:
+            #write the snapshot to a temp file first so a crash never leaves half a file
+            temp_filename = f"{self.filename}.tmp"
+            with open(temp_filename, 'w') as file:
+                file.write(f'{{"generation":{self.generation},"animals":')
+                json.dump(list(animals), file, separators=(',', ':'), default=to_json_value)
+                file.write("}")
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_filename, self.filename)
+        except Exception as e:
+            print(f"Error compacting journal into {self.filename}: {e}")
+            self.file = open(self.journal_filename, 'a')
+            return False
+
+        #from here the old journal is skipped on load because the snapshot has its generation
+        self.generation += 1
+        self.start_journal(habitats)
+        return True
+
+    def close(self):
+        """
+        Flush and close the journal file
+        """
+        self.flush()
+        self.file.close()
+
+def count_journal_entries(journal_filename):
+    """
+    Count the records in a journal file
+    """
+    try:
+        with open(journal_filename, 'r') as file:
+            return sum(1 for line in file if line.strip() and not line.startswith('{"op":"generation"'))
+    except FileNotFoundError:
+        return 0
+
+def read_journal_generation(journal_filename):
+    """
+    Get the generation of a journal from its first record
+    """
+    try:
+        with open(journal_filename, 'r') as file:
+            entry = json.loads(file.readline())
+        if entry.get("op") == "generation":
+            return entry["generation"]
+    except (FileNotFoundError, ValueError, AttributeError):
+        pass
+    return FIRST_GENERATION
+
+def read_snapshot_generation(filename):
+    """
+    Get the journal generation a snapshot file has folded in, 0 for a plain list of animals
+    """
+    try:
+        with open(filename, 'r') as file:
+            match = SNAPSHOT_HEADER_PATTERN.match(file.read(SNAPSHOT_HEADER_SIZE))
+    except (FileNotFoundError, IsADirectoryError):
+        return 0
+    return int(match.group(1)) if match else 0
+
+def get_snapshot_animals(data):
+    """
+    Get the list of animals out of a loaded snapshot or plain data file
+    """
+    return data["animals"] if isinstance(data, dict) else data
+
+def read_journal(journal_filename):
+    """
+    Read the records from a journal file
+
+    A torn last line from a crash mid-write is skipped
+    """
+    entries = []
+
+    try:
+        with open(journal_filename, 'r') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    print(f"Skipping damaged journal record in {journal_filename}")
+                    continue
+                if entry.get("op") != "generation":
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+
+    return entries
+
+def replay_journal(journal_filename, animals, habitats=None, snapshot_generation=0):
+    """
+    Apply the records of a journal on top of a loaded snapshot
+
+    A journal whose generation the snapshot has already folded in is skipped
+    """
+    if read_journal_generation(journal_filename) <= snapshot_generation:
+        return animals
+
+    entries = read_journal(journal_filename)
+
+    if not entries:
+        return animals
+
+    animals_by_id = {animal["animal_id"]: animal for animal in animals}
+
+    for entry in entries:
+        op = entry.get("op")
+
+        if op == "add":
+            animal = entry["animal"]
+            if animal["animal_id"] not in animals_by_id:
+                animals.append(animal)
+                animals_by_id[animal["animal_id"]] = animal
+
+        elif op in ("health", "feeding"):
+            animal = animals_by_id.get(entry["id"])
+            if animal is None:
+                continue
+
+            history_key = "health_records" if op == "health" else "feeding_history"
+            animal.setdefault(history_key, []).append(entry["record"])
+
+        elif op in ("assign", "remove") and habitats is not None:
+            habitat = habitats.get(entry["habitat"])
+            if habitat is None:
+                continue
+
+            if op == "assign" and entry["id"] not in habitat["current_animals"]:
+                habitat["current_animals"].append(entry["id"])
+            elif op == "remove" and entry["id"] in habitat["current_animals"]:
+                habitat["current_animals"].remove(entry["id"])
+
+    #the habitat lists and the animals in them were changed without going through assign and remove
+    if habitats is not None:
+        mark_habitats_changed()
+
+    return animals
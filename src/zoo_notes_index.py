@@ -0,0 +1,363 @@
+"""
+File with a full-text index over the vet notes of every health record
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+from array import array
+from d1_project_pitch.src.zoo_timestamps import iso_to_epoch_us, epoch_us_to_iso, MISSING_EPOCH_US
+
+NOTES_INDEX_SUFFIX = ".notes"
+NO_DATE = MISSING_EPOCH_US
+
+#BM25 ranking constants
+TERM_SATURATION = 1.2
+LENGTH_NORMALISATION = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+QUERY_PATTERN = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+def get_notes_index_filename(filename):
+    """
+    Get the notes index filename that sits next to a data file
+    """
+    return f"{filename}{NOTES_INDEX_SUFFIX}"
+
+def tokenize(text):
+    """
+    Split text into lowercase words
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+def parse_query(query):
+    """
+    Parse a search query into OR'd clauses of required and excluded word sequences
+
+    Words are ANDed together, "quoted words" are a phrase, OR starts a new
+    clause and NOT or a leading - excludes the next word or phrase
+    """
+    clauses = [{"required": [], "excluded": []}]
+    exclude_next = False
+
+    for match in QUERY_PATTERN.finditer(query):
+        negated, phrase, word = match.groups()
+
+        if word == "OR":
+            clauses.append({"required": [], "excluded": []})
+            continue
+        if word == "AND":
+            continue
+        if word == "NOT":
+            exclude_next = True
+            continue
+
+        if phrase is None and word.startswith("-") and len(word) > 1:
+            negated, word = "-", word[1:]
+
+        tokens = tokenize(phrase if phrase is not None else word)
+        if tokens:
+            key = "excluded" if negated or exclude_next else "required"
+            clauses[-1][key].append(tokens)
+        exclude_next = False
+
+    return [clause for clause in clauses if clause["required"]]
+
+class NotesIndex:
+    """
+    Inverted index from each word to the health records whose vet notes use it
+
+    Every indexed note is a document numbered in the order it was added.
+    A posting list holds the documents a word appears in, in order, and the
+    word positions in each, which is what phrase search needs
+    """
+
+    def __init__(self):
+        self.doc_animal_ids = []
+        self.doc_offsets = array('I')
+        self.doc_dates = array('q')
+        self.doc_lengths = array('I')
+        self.total_length = 0
+        self.postings = {}
+        self.indexed_counts = {}
+        self.animal_ids = {}
+
+    def __len__(self):
+        return len(self.doc_offsets)
+
+    def add_note(self, animal_id, record_offset, date, vet_notes):
+        """
+        Index the notes of one health record
+
+        record_offset is the position of the record in the animal's health_records
+        """
+        tokens = tokenize(vet_notes or "")
+        doc = len(self.doc_offsets)
+
+        #one shared string per animal instead of one per note
+        animal_id = self.animal_ids.setdefault(animal_id, animal_id)
+
+        epoch_us = iso_to_epoch_us(date)
+
+        self.doc_animal_ids.append(animal_id)
+        self.doc_offsets.append(record_offset)
+        self.doc_dates.append(NO_DATE if epoch_us is None else epoch_us)
+        self.doc_lengths.append(len(tokens))
+        self.total_length += len(tokens)
+
+        positions = {}
+        for position, token in enumerate(tokens):
+            positions.setdefault(token, []).append(position)
+
+        for token, token_positions in positions.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = (array('I'), [])
+            posting[0].append(doc)
+            posting[1].append(token_positions)
+
+        self.indexed_counts[animal_id] = max(self.indexed_counts.get(animal_id, 0), record_offset + 1)
+        return doc
+
+    def add_record(self, animal_id, record_offset, health_record):
+        """
+        Index a health record in the {"date": ..., "data": {...}} shape
+        """
+        vet_notes = health_record.get("data", {}).get("vet_notes")
+        if vet_notes:
+            self.add_note(animal_id, record_offset, health_record.get("date"), vet_notes)
+        else:
+            self.indexed_counts[animal_id] = max(self.indexed_counts.get(animal_id, 0), record_offset + 1)
+
+    def update(self, animals):
+        """
+        Index any health records added since the animals were last indexed
+
+        Health records are only ever appended, so an animal only needs the
+        records past the count already indexed for it
+        """
+        added = 0
+
+        for animal in animals:
+            animal_id = animal.get("animal_id")
+            health_records = animal.get("health_records") or []
+
+            for record_offset in range(self.indexed_counts.get(animal_id, 0), len(health_records)):
+                self.add_record(animal_id, record_offset, health_records[record_offset])
+                added += 1
+
+        return added
+
+    def get_postings(self, token):
+        """
+        Get a dict of document to word positions for one word
+        """
+        posting = self.postings.get(token)
+        if posting is None:
+            return {}
+        return dict(zip(posting[0], posting[1]))
+
+    def match_sequence(self, tokens):
+        """
+        Get a dict of document to number of times a word or phrase appears in it
+        """
+        if len(tokens) == 1:
+            posting = self.postings.get(tokens[0])
+            if posting is None:
+                return {}
+            return {doc: len(positions) for doc, positions in zip(posting[0], posting[1])}
+
+        #start from the rarest word so the fewest documents are checked
+        rarest = min(tokens, key=lambda token: len(self.postings.get(token, ((), ()))[0]))
+        candidates = self.get_postings(rarest)
+        token_postings = [candidates if token == rarest else self.get_postings(token) for token in tokens]
+
+        matches = {}
+        for doc in candidates:
+            doc_positions = [postings.get(doc) for postings in token_postings]
+            if any(positions is None for positions in doc_positions):
+                continue
+
+            following = [set(positions) for positions in doc_positions[1:]]
+            count = sum(1 for start in doc_positions[0]
+                        if all(start + step in positions for step, positions in enumerate(following, 1)))
+            if count:
+                matches[doc] = count
+
+        return matches
+
+    def score_sequence(self, matches, docs):
+        """
+        BM25 score of one word or phrase in each of the given documents
+        """
+        document_count = len(self.doc_offsets)
+        average_length = self.total_length / document_count if document_count else 1
+        idf = math.log(1 + (document_count - len(matches) + 0.5) / (len(matches) + 0.5))
+
+        doc_lengths = self.doc_lengths
+        base = TERM_SATURATION * (1 - LENGTH_NORMALISATION)
+        per_length = TERM_SATURATION * LENGTH_NORMALISATION / (average_length or 1)
+        boost = idf * (TERM_SATURATION + 1)
+
+        scores = {}
+        for doc in docs:
+            frequency = matches[doc]
+            scores[doc] = boost * frequency / (frequency + base + per_length * doc_lengths[doc])
+        return scores
+
+    def search_documents(self, query, since=None, until=None):
+        """
+        Get a dict of document to score for every note that matches the query
+        """
+        since_us = iso_to_epoch_us(since) if since else None
+        until_us = iso_to_epoch_us(until) if until else None
+        scores = {}
+
+        for clause in parse_query(query):
+            required = [self.match_sequence(tokens) for tokens in clause["required"]]
+            required.sort(key=len)
+
+            docs = set(required[0])
+            for matches in required[1:]:
+                docs.intersection_update(matches)
+                if not docs:
+                    break
+
+            for tokens in clause["excluded"]:
+                docs.difference_update(self.match_sequence(tokens))
+
+            if since_us is not None or until_us is not None:
+                dates = self.doc_dates
+                low = NO_DATE + 1 if since_us is None else since_us
+                high = -NO_DATE - 1 if until_us is None else until_us
+                docs = [doc for doc in docs if low <= dates[doc] <= high]
+
+            for matches in required:
+                for doc, score in self.score_sequence(matches, docs).items():
+                    scores[doc] = scores.get(doc, 0) + score
+
+        return scores
+
+    def describe_document(self, doc, score):
+        """
+        Get the details of one search result
+        """
+        date = self.doc_dates[doc]
+        return {
+            "animal_id": self.doc_animal_ids[doc],
+            "record_offset": self.doc_offsets[doc],
+            "date": None if date == NO_DATE else epoch_us_to_iso(date),
+            "score": score
+        }
+
+    def search(self, query, since=None, until=None, limit=10):
+        """
+        Get the best matching health records for a query, best first
+
+        since and until are ISO timestamps that limit the record dates.
+        Ties go to the newer record
+        """
+        scores = self.search_documents(query, since, until)
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], self.doc_dates[item[0]]))
+        return [self.describe_document(doc, score) for doc, score in top]
+
+    def find_animals(self, query, since=None, until=None):
+        """
+        Get the IDs of every animal with a matching note, best match first
+        """
+        best = {}
+        for doc, score in self.search_documents(query, since, until).items():
+            animal_id = self.doc_animal_ids[doc]
+            if score > best.get(animal_id, -1):
+                best[animal_id] = score
+
+        return sorted(best, key=lambda animal_id: -best[animal_id])
+
+    def to_dict(self):
+        """
+        Get the index as plain data for saving
+        """
+        return {
+            "format": "zoo-notes-index",
+            "version": 1,
+            "animal_ids": self.doc_animal_ids,
+            "offsets": self.doc_offsets.tolist(),
+            "dates": self.doc_dates.tolist(),
+            "lengths": self.doc_lengths.tolist(),
+            "postings": {token: [docs.tolist(), positions] for token, (docs, positions) in self.postings.items()},
+            "indexed_counts": self.indexed_counts
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild an index from saved data
+        """
+        index = cls()
+
+        for animal_id in data["animal_ids"]:
+            index.doc_animal_ids.append(index.animal_ids.setdefault(animal_id, animal_id))
+
+        index.doc_offsets.extend(data["offsets"])
+        index.doc_dates.extend(data["dates"])
+        index.doc_lengths.extend(data["lengths"])
+        index.total_length = sum(index.doc_lengths)
+        index.postings = {token: (array('I', docs), positions) for token, (docs, positions) in data["postings"].items()}
+        index.indexed_counts = data["indexed_counts"]
+        return index
+
+def build_notes_index(animals):
+    """
+    Build a notes index from the health records of a list of animals
+    """
+    index = NotesIndex()
+    index.update(animals)
+    return index
+
+def save_notes_index(index, filename):
+    """
+    Save a notes index next to a data file
+    """
+    index_filename = get_notes_index_filename(filename)
+
+    try:
+        temp_filename = f"{index_filename}.tmp"
+        with open(temp_filename, 'w') as file:
+            json.dump(index.to_dict(), file, separators=(',', ':'))
+        os.replace(temp_filename, index_filename)
+        return True
+    except Exception as e:
+        print(f"Error saving notes index to {index_filename}: {e}")
+        return False
+
+def load_notes_index(filename):
+    """
+    Load the notes index saved next to a data file, or None if there is none
+    """
+    index_filename = get_notes_index_filename(filename)
+
+    try:
+        with open(index_filename, 'r') as file:
+            return NotesIndex.from_dict(json.load(file))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading notes index from {index_filename}: {e}")
+        return None
+
+def open_notes_index(filename, animals):
+    """
+    Load the notes index for a data file and index anything it is missing
+
+    Records added since the index was saved, such as ones replayed from
+    the journal, are indexed straight away. A missing or damaged index is
+    rebuilt from the animals
+    """
+    index = load_notes_index(filename)
+    if index is None:
+        return build_notes_index(animals)
+
+    index.update(animals)
+    return index
@@ -0,0 +1,127 @@
+"""
+File with the persistent history lists used by copy-on-write animal records
+"""
+
+from collections.abc import Sequence
+from itertools import islice
+from d1_project_pitch.src.zoo_timestamps import now_epoch_us
+
+class HistoryVector(Sequence):
+    """
+    Append-only history list where every version stays readable
+
+    Versions share one underlying list and each one only sees its own
+    length of it, so appending to the newest version is O(1) and copies
+    nothing. Appending to an older version copies its part of the list
+    first, so versions never see each other's records
+    """
+
+    __slots__ = ("items", "length")
+
+    def __init__(self, records=()):
+        self.items = list(records)
+        self.length = len(self.items)
+
+    @classmethod
+    def share(cls, items, length):
+        """
+        Make a version over an existing list without copying it
+        """
+        vector = cls.__new__(cls)
+        vector.items = items
+        vector.length = length
+        return vector
+
+    def appended(self, record):
+        """
+        Get a new version with one more record, leaving this one as it is
+        """
+        items = self.items
+
+        #a newer version already appended past this one, so branch off a copy
+        if len(items) != self.length:
+            items = items[:self.length]
+
+        items.append(record)
+        return HistoryVector.share(items, self.length + 1)
+
+    def shares_storage_with(self, other):
+        """
+        Check if another version is built on the same list
+        """
+        return isinstance(other, HistoryVector) and other.items is self.items
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.items[:self.length][index]
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("history index out of range")
+        return self.items[index]
+
+    def __iter__(self):
+        return islice(self.items, self.length)
+
+    def __eq__(self, other):
+        if isinstance(other, (HistoryVector, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def to_list(self):
+        """
+        Get the records as a plain list
+        """
+        return self.items[:self.length]
+
+    def __repr__(self):
+        return f"HistoryVector({self.to_list()!r})"
+
+class AnimalVersionLog:
+    """
+    Log of the versions an animal has been through, for undo and audit
+
+    With copy-on-write records an old version shares its fields and
+    history with the newer ones, so keeping it costs very little
+    """
+
+    def __init__(self):
+        self.versions = {}
+
+    def record(self, animal):
+        """
+        Add a version of an animal to the log
+        """
+        self.versions.setdefault(animal["animal_id"], []).append((now_epoch_us(), animal))
+
+    def get_versions(self, animal_id):
+        """
+        Get the (time logged, animal) pairs logged for an animal, oldest first
+        """
+        return list(self.versions.get(animal_id, []))
+
+    def get_latest(self, animal_id):
+        """
+        Get the latest logged version of an animal, or None
+        """
+        versions = self.versions.get(animal_id)
+        return versions[-1][1] if versions else None
+
+    def undo(self, animal_id):
+        """
+        Drop the latest version of an animal and get the one before it
+
+        Returns None if there is no earlier version to go back to
+        """
+        versions = self.versions.get(animal_id)
+        if not versions or len(versions) < 2:
+            return None
+
+        versions.pop()
+        return versions[-1][1]
@@ -0,0 +1,184 @@
+"""
+File that stores the animals split across several JSON shard files
+"""
+
+import argparse
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from d1_project_pitch.src.zoo_animal_record import to_json_value
+from d1_project_pitch.src.zoo_journal import get_snapshot_animals
+
+MANIFEST_FILENAME = "manifest.json"
+DEFAULT_SHARD_COUNT = 16
+
+def get_shard_index(animal_id, shard_count):
+    """
+    Get the shard an animal belongs in from a stable hash of its ID
+    """
+    return zlib.crc32(animal_id.encode("utf-8")) % shard_count
+
+def get_shard_filename(index):
+    """
+    Get the filename of a shard
+    """
+    return f"shard-{index:04d}.json"
+
+def is_sharded_directory(path):
+    """
+    Check if a path is a directory with a shard manifest in it
+    """
+    return os.path.isfile(os.path.join(path, MANIFEST_FILENAME))
+
+def read_manifest(dirname):
+    """
+    Read the manifest of a sharded directory
+    """
+    with open(os.path.join(dirname, MANIFEST_FILENAME), 'r') as file:
+        return json.load(file)
+
+def write_json_atomically(path, data):
+    """
+    Write JSON to a temp file and move it into place so readers never see half a file
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(data, file, separators=(',', ':'), default=to_json_value)
+    os.replace(temp_path, path)
+
+def split_into_shards(animals, shard_count):
+    """
+    Group animals by the shard they belong in
+    """
+    shards = [[] for _ in range(shard_count)]
+    for animal in animals:
+        shards[get_shard_index(animal["animal_id"], shard_count)].append(animal)
+    return shards
+
+def write_shards(dirname, shards, indexes, manifest):
+    """
+    Write the given shards and update their counts in the manifest
+    """
+    for index in indexes:
+        write_json_atomically(os.path.join(dirname, manifest["shards"][index]), shards[index])
+        manifest["counts"][index] = len(shards[index])
+
+    write_json_atomically(os.path.join(dirname, MANIFEST_FILENAME), manifest)
+
+def save_sharded_animals(animals, dirname, shard_count=None):
+    """
+    Save animals into a sharded directory
+
+    An existing directory keeps its shard count unless a new one is given
+    """
+    try:
+        if shard_count is None:
+            shard_count = read_manifest(dirname)["shard_count"] if is_sharded_directory(dirname) else DEFAULT_SHARD_COUNT
+
+        os.makedirs(dirname, exist_ok=True)
+
+        manifest = {
+            "format": "zoo-shards",
+            "version": 1,
+            "shard_count": shard_count,
+            "shards": [get_shard_filename(index) for index in range(shard_count)],
+            "counts": [0] * shard_count
+        }
+
+        write_shards(dirname, split_into_shards(animals, shard_count), range(shard_count), manifest)
+        return True
+    except Exception as e:
+        print(f"Error saving animals to {dirname}: {e}")
+        return False
+
+def save_changed_shards(animals, changed_ids, removed_ids, dirname):
+    """
+    Rewrite only the shards that hold a changed or removed animal
+
+    Finding the members of those shards is one cheap hash per animal, but
+    only the affected shards are encoded and written
+    """
+    try:
+        manifest = read_manifest(dirname)
+        shard_count = manifest["shard_count"]
+
+        dirty_shards = {get_shard_index(animal_id, shard_count) for animal_id in changed_ids}
+        dirty_shards.update(get_shard_index(animal_id, shard_count) for animal_id in removed_ids)
+
+        if not dirty_shards:
+            return True
+
+        shards = {index: [] for index in dirty_shards}
+        for animal in animals:
+            index = get_shard_index(animal["animal_id"], shard_count)
+            if index in shards:
+                shards[index].append(animal)
+
+        write_shards(dirname, shards, sorted(dirty_shards), manifest)
+        return True
+    except Exception as e:
+        print(f"Error saving changed shards to {dirname}: {e}")
+        return False
+
+def load_shard(path):
+    """
+    Load the animals in one shard file
+    """
+    with open(path, 'r') as file:
+        return json.load(file)
+
+def load_sharded_animals(dirname, max_workers=None):
+    """
+    Load every shard of a sharded directory, decoding the shards in parallel
+
+    Animals come back grouped by shard, in the order each shard stores them
+    """
+    try:
+        manifest = read_manifest(dirname)
+        paths = [os.path.join(dirname, shard) for shard in manifest["shards"]]
+
+        if max_workers == 1 or len(paths) <= 1:
+            shards = map(load_shard, paths)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                shards = list(executor.map(load_shard, paths))
+
+        animals = []
+        for shard in shards:
+            animals.extend(shard)
+        return animals
+    except Exception as e:
+        print(f"Error loading animals from {dirname}: {e}")
+        return []
+
+def reshard_animals(source, dirname, shard_count=DEFAULT_SHARD_COUNT):
+    """
+    Copy a single JSON data file or an existing sharded directory into a new shard layout
+    """
+    if is_sharded_directory(source):
+        animals = load_sharded_animals(source)
+    else:
+        with open(source, 'r') as file:
+            animals = get_snapshot_animals(json.load(file))
+
+    if not save_sharded_animals(animals, dirname, shard_count):
+        return False
+
+    print(f"Wrote {len(animals)} animals from {source} into {shard_count} shards in {dirname}")
+    return True
+
+def main():
+    """
+    Command line tool for resharding a zoo data file
+    """
+    parser = argparse.ArgumentParser(description="Split zoo animal data into hash sharded JSON files")
+    parser.add_argument("source", help="JSON data file or sharded directory to read")
+    parser.add_argument("destination", help="directory to write the shards and manifest to")
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARD_COUNT, help="number of shard files")
+    args = parser.parse_args()
+
+    return 0 if reshard_animals(args.source, args.destination, args.shards) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
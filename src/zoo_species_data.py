@@ -225,6 +225,28 @@ ZOO_HABITATS = {
     }
 }
 
+_baselines_version = 0
+
+def get_baselines_version():
+    """
+    Get a number that goes up every time the species baselines change
+    """
+    return _baselines_version
+
+def mark_baselines_changed():
+    """
+    Record that the species baselines were edited so cached results get recalculated
+    """
+    global _baselines_version
+    _baselines_version += 1
+
+def update_species_baseline(species_name, **fields):
+    """
+    Add or change the baseline data of a species
+    """
+    SPECIES_HEALTH_BASELINES.setdefault(species_name, {}).update(fields)
+    mark_baselines_changed()
+
 def get_species_data(species_name):
     """
     Get all data for a specific species
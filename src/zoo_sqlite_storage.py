@@ -0,0 +1,437 @@
+"""
+File that stores the zoo data in a SQLite database
+"""
+
+import json
+import sqlite3
+from d1_project_pitch.src.zoo_habitat_occupancy import get_habitat_occupancy
+from d1_project_pitch.src.zoo_habitat_version import mark_habitats_changed
+
+DATABASE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+ANIMAL_COLUMNS = ["name", "species", "age", "diet", "habitat_type", "temperament", "social_needs"]
+HEALTH_COLUMNS = ["weight_kg", "temperature_c", "heart_rate", "vaccination_status", "vet_notes"]
+FEEDING_COLUMNS = {"time": "feeding_time", "amount_kg": "amount_kg", "food_type": "food_type", "keeper": "keeper", "timestamp": "fed_at"}
+HISTORY_KEYS = ["health_records", "current_medications", "feeding_history"]
+
+#the Python type a column gives back, SQLite converts other values to its affinity
+COLUMN_TYPES = {"age": int, "weight_kg": float, "temperature_c": float, "heart_rate": int, "amount_kg": float}
+SQLITE_INTEGER_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS animals (
+    animal_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT,
+    species TEXT,
+    age INTEGER,
+    diet TEXT,
+    habitat_type TEXT,
+    temperament TEXT,
+    social_needs TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_animals_species ON animals (species);
+CREATE INDEX IF NOT EXISTS idx_animals_position ON animals (position);
+
+CREATE TABLE IF NOT EXISTS health_records (
+    animal_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    recorded_at TEXT,
+    weight_kg REAL,
+    temperature_c REAL,
+    heart_rate INTEGER,
+    vaccination_status TEXT,
+    vet_notes TEXT,
+    extra TEXT,
+    PRIMARY KEY (animal_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_health_records_recorded_at ON health_records (recorded_at);
+
+CREATE TABLE IF NOT EXISTS feeding_history (
+    animal_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    fed_at TEXT,
+    feeding_time TEXT,
+    amount_kg REAL,
+    food_type TEXT,
+    keeper TEXT,
+    extra TEXT,
+    PRIMARY KEY (animal_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_feeding_history_fed_at ON feeding_history (fed_at);
+
+CREATE TABLE IF NOT EXISTS current_medications (
+    animal_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    medication TEXT,
+    PRIMARY KEY (animal_id, seq)
+);
+
+CREATE TABLE IF NOT EXISTS habitat_occupancy (
+    animal_id TEXT PRIMARY KEY,
+    habitat_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_habitat_occupancy_habitat ON habitat_occupancy (habitat_name);
+"""
+
+def is_database_filename(filename):
+    """
+    Check if a filename points at a SQLite database
+    """
+    return str(filename).lower().endswith(DATABASE_SUFFIXES)
+
+def open_database(filename):
+    """
+    Open the database in WAL mode and make sure all the tables exist
+    """
+    connection = sqlite3.connect(filename)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+def fits_column(column, value):
+    """
+    Check if a value comes back out of its column exactly as it went in
+    """
+    column_type = COLUMN_TYPES.get(column, str)
+    if type(value) is not column_type:
+        return False
+    if column_type is int:
+        return SQLITE_INTEGER_RANGE[0] <= value <= SQLITE_INTEGER_RANGE[1]
+    if column_type is float:
+        #SQLite stores NaN as NULL
+        return value == value
+    return True
+
+def split_extra(record, columns, skipped=()):
+    """
+    Split a record into the values for known columns and a JSON string of everything else
+
+    A value that would not come back the same from its column, such as None
+    or a number in a text column, is left out of the column and kept in the
+    extra JSON instead. Skipped keys are stored elsewhere by the caller
+    """
+    values = []
+    extra = {}
+    for column in columns:
+        value = record.get(column)
+        if fits_column(column, value):
+            values.append(value)
+        else:
+            values.append(None)
+            if column in record:
+                extra[column] = value
+
+    for key, value in record.items():
+        if key not in columns and key not in skipped:
+            extra[key] = value
+    return values, (json.dumps(extra) if extra else None)
+
+def merge_extra(record, extra):
+    """
+    Put the extra values back into a record
+    """
+    if extra:
+        record.update(json.loads(extra))
+    return record
+
+def get_history_counts(connection, table):
+    """
+    Get how many history rows are already stored for each animal
+    """
+    return dict(connection.execute(f"SELECT animal_id, COUNT(*) FROM {table} GROUP BY animal_id"))
+
+def save_history_rows(connection, table, animal_id, rows, stored_count, build_row):
+    """
+    Insert the history rows that are not stored yet
+
+    Histories only ever grow, so only rows past the stored count are written.
+    If a history got shorter, the rows past its end are deleted
+    """
+    if len(rows) < stored_count:
+        connection.execute(f"DELETE FROM {table} WHERE animal_id = ? AND seq >= ?", (animal_id, len(rows)))
+        stored_count = len(rows)
+
+    new_rows = [build_row(animal_id, seq, rows[seq]) for seq in range(stored_count, len(rows))]
+
+    if new_rows:
+        placeholders = ", ".join("?" * len(new_rows[0]))
+        connection.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", new_rows)
+
+def build_health_row(animal_id, seq, health_record):
+    """
+    Build a health_records row from a health record
+    """
+    data = health_record.get("data", {})
+    values, extra = split_extra(data, HEALTH_COLUMNS)
+
+    #anything next to date and data is kept as well so the record round trips
+    date = health_record.get("date")
+    outer = {key: value for key, value in health_record.items() if key != "data" and (key != "date" or not fits_column(key, value))}
+    if outer:
+        extra = json.dumps({"data": json.loads(extra) if extra else {}, "record": outer})
+    elif extra:
+        extra = json.dumps({"data": json.loads(extra)})
+
+    return (animal_id, seq, date if fits_column("date", date) else None, *values, extra)
+
+def build_feeding_row(animal_id, seq, feeding_record):
+    """
+    Build a feeding_history row from a feeding record
+    """
+    values, extra = split_extra(feeding_record, list(FEEDING_COLUMNS))
+    time_value, amount, food_type, keeper, timestamp = values
+    return (animal_id, seq, timestamp, time_value, amount, food_type, keeper, extra)
+
+def build_medication_row(animal_id, seq, medication):
+    """
+    Build a current_medications row
+    """
+    return (animal_id, seq, json.dumps(medication))
+
+def get_history_count(connection, table, animal_id):
+    """
+    Get how many history rows are already stored for one animal
+    """
+    return connection.execute(f"SELECT COUNT(*) FROM {table} WHERE animal_id = ?", (animal_id,)).fetchone()[0]
+
+def upsert_animals(connection, animals, positions, health_counts=None, feeding_counts=None):
+    """
+    Insert or update the animal rows and their histories
+
+    Without stored history counts the count is looked up per animal
+    """
+    for animal in animals:
+        animal_id = animal["animal_id"]
+        values, extra = split_extra(animal, ANIMAL_COLUMNS, ["animal_id"] + HISTORY_KEYS)
+
+        connection.execute(
+            """
+            INSERT INTO animals (animal_id, position, name, species, age, diet, habitat_type, temperament, social_needs, extra)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (animal_id) DO UPDATE SET
+                position = excluded.position, name = excluded.name, species = excluded.species,
+                age = excluded.age, diet = excluded.diet, habitat_type = excluded.habitat_type,
+                temperament = excluded.temperament, social_needs = excluded.social_needs,
+                extra = excluded.extra
+            """,
+            (animal_id, positions[animal_id], *values, extra))
+
+        if health_counts is None:
+            health_count = get_history_count(connection, "health_records", animal_id)
+        else:
+            health_count = health_counts.get(animal_id, 0)
+
+        if feeding_counts is None:
+            feeding_count = get_history_count(connection, "feeding_history", animal_id)
+        else:
+            feeding_count = feeding_counts.get(animal_id, 0)
+
+        save_history_rows(connection, "health_records", animal_id, animal.get("health_records", []),
+                          health_count, build_health_row)
+        save_history_rows(connection, "feeding_history", animal_id, animal.get("feeding_history", []),
+                          feeding_count, build_feeding_row)
+
+        #medications are a short list that can change anywhere, so it is rewritten
+        connection.execute("DELETE FROM current_medications WHERE animal_id = ?", (animal_id,))
+        save_history_rows(connection, "current_medications", animal_id, animal.get("current_medications", []),
+                          0, build_medication_row)
+
+def save_habitat_occupancy(connection, habitats):
+    """
+    Replace the stored habitat occupancy
+    """
+    connection.execute("DELETE FROM habitat_occupancy")
+    connection.executemany(
+        "INSERT OR REPLACE INTO habitat_occupancy VALUES (?, ?)",
+        [(animal_id, habitat_name) for habitat_name, habitat in habitats.items()
+         for animal_id in habitat["current_animals"]])
+
+def count_animals_in_database(filename):
+    """
+    Get how many animals a database holds, or None if it can not be opened
+    """
+    try:
+        connection = open_database(filename)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM animals").fetchone()[0]
+        finally:
+            connection.close()
+    except Exception as e:
+        print(f"Error opening database {filename}: {e}")
+        return None
+
+def save_changed_habitat_occupancy(connection, habitats, animal_ids):
+    """
+    Rewrite the stored habitat of only the given animals
+    """
+    occupancy = get_habitat_occupancy(habitats)
+    connection.executemany("DELETE FROM habitat_occupancy WHERE animal_id = ?", [(animal_id,) for animal_id in animal_ids])
+    connection.executemany(
+        "INSERT OR REPLACE INTO habitat_occupancy VALUES (?, ?)",
+        [(animal_id, occupancy.get_habitat(animal_id)) for animal_id in animal_ids
+         if occupancy.get_habitat(animal_id) is not None])
+
+def save_animals_to_database(animals, filename, habitats=None):
+    """
+    Save animal data to a SQLite database in a single transaction
+
+    Animals are upserted row by row and only new history rows are inserted.
+    Animals that are no longer in the list are deleted
+    """
+    try:
+        connection = open_database(filename)
+        try:
+            with connection:
+                animals = list(animals)
+                positions = {animal["animal_id"]: position for position, animal in enumerate(animals)}
+
+                connection.execute("CREATE TEMP TABLE IF NOT EXISTS kept_ids (animal_id TEXT PRIMARY KEY)")
+                connection.execute("DELETE FROM kept_ids")
+                connection.executemany("INSERT OR IGNORE INTO kept_ids VALUES (?)", [(animal_id,) for animal_id in positions])
+
+                for table in ("animals", "health_records", "feeding_history", "current_medications"):
+                    connection.execute(f"DELETE FROM {table} WHERE animal_id NOT IN (SELECT animal_id FROM kept_ids)")
+
+                upsert_animals(connection, animals, positions,
+                               get_history_counts(connection, "health_records"),
+                               get_history_counts(connection, "feeding_history"))
+
+                if habitats is not None:
+                    save_habitat_occupancy(connection, habitats)
+        finally:
+            connection.close()
+        return True
+    except Exception as e:
+        print(f"Error saving animals to database: {e}")
+        return False
+
+def insert_animals_into_database(animals, filename, habitats=None):
+    """
+    Write animals from any iterable into a database in a single transaction
+
+    Each animal is written as soon as it comes, so a streamed file is never
+    held in memory whole. An error part way through, such as a damaged
+    record, rolls the whole transaction back. Returns the number of animals
+    written, or None on an error
+    """
+    try:
+        connection = open_database(filename)
+        try:
+            with connection:
+                count = 0
+                for position, animal in enumerate(animals):
+                    upsert_animals(connection, [animal], {animal["animal_id"]: position}, None, None)
+                    count += 1
+
+                if habitats is not None:
+                    save_habitat_occupancy(connection, habitats)
+        finally:
+            connection.close()
+        return count
+    except Exception as e:
+        print(f"Error writing animals to database, nothing saved: {e}")
+        return None
+
+def save_changed_animals_to_database(changed_animals, removed_ids, filename, habitats=None, moved_ids=()):
+    """
+    Save only the animals that changed since the last save
+
+    Changed animals keep their stored position and new animals go on the end.
+    The habitat occupancy is only rewritten for changed and moved animals,
+    so the cost depends on the number of changes and not on the population
+    """
+    try:
+        connection = open_database(filename)
+        try:
+            with connection:
+                for table in ("animals", "health_records", "feeding_history", "current_medications", "habitat_occupancy"):
+                    connection.executemany(f"DELETE FROM {table} WHERE animal_id = ?", [(animal_id,) for animal_id in removed_ids])
+
+                next_position = connection.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM animals").fetchone()[0]
+                positions = {}
+
+                for animal in changed_animals:
+                    row = connection.execute("SELECT position FROM animals WHERE animal_id = ?", (animal["animal_id"],)).fetchone()
+                    if row:
+                        positions[animal["animal_id"]] = row[0]
+                    else:
+                        positions[animal["animal_id"]] = next_position
+                        next_position += 1
+
+                upsert_animals(connection, changed_animals, positions)
+
+                if habitats is not None:
+                    save_changed_habitat_occupancy(connection, habitats, set(positions) | set(moved_ids))
+        finally:
+            connection.close()
+        return True
+    except Exception as e:
+        print(f"Error saving changed animals to database: {e}")
+        return False
+
+def load_animals_from_database(filename, habitats=None):
+    """
+    Load animals from a SQLite database
+
+    Habitat occupancy is loaded into habitats if given
+    """
+    try:
+        connection = open_database(filename)
+        try:
+            animals = []
+            animals_by_id = {}
+
+            for row in connection.execute(
+                    "SELECT animal_id, name, species, age, diet, habitat_type, temperament, social_needs, extra "
+                    "FROM animals ORDER BY position"):
+                animal = {"animal_id": row[0]}
+                for column, value in zip(ANIMAL_COLUMNS, row[1:-1]):
+                    if value is not None:
+                        animal[column] = value
+                animal["health_records"] = []
+                animal["current_medications"] = []
+                animal["feeding_history"] = []
+                merge_extra(animal, row[-1])
+
+                animals.append(animal)
+                animals_by_id[animal["animal_id"]] = animal
+
+            for row in connection.execute(
+                    "SELECT animal_id, recorded_at, weight_kg, temperature_c, heart_rate, vaccination_status, vet_notes, extra "
+                    "FROM health_records ORDER BY animal_id, seq"):
+                data = {column: value for column, value in zip(HEALTH_COLUMNS, row[2:-1]) if value is not None}
+                health_record = {"date": row[1], "data": data} if row[1] is not None else {"data": data}
+
+                if row[-1]:
+                    extra = json.loads(row[-1])
+                    data.update(extra.get("data", {}))
+                    health_record.update(extra.get("record", {}))
+
+                animals_by_id[row[0]]["health_records"].append(health_record)
+
+            for row in connection.execute(
+                    "SELECT animal_id, feeding_time, amount_kg, food_type, keeper, fed_at, extra "
+                    "FROM feeding_history ORDER BY animal_id, seq"):
+                feeding_record = {key: value for key, value in zip(FEEDING_COLUMNS, row[1:-1]) if value is not None}
+                merge_extra(feeding_record, row[-1])
+                animals_by_id[row[0]]["feeding_history"].append(feeding_record)
+
+            for animal_id, medication in connection.execute(
+                    "SELECT animal_id, medication FROM current_medications ORDER BY animal_id, seq"):
+                animals_by_id[animal_id]["current_medications"].append(json.loads(medication))
+
+            if habitats is not None:
+                for animal_id, habitat_name in connection.execute("SELECT animal_id, habitat_name FROM habitat_occupancy"):
+                    habitat = habitats.get(habitat_name)
+                    if habitat is not None and animal_id not in habitat["current_animals"]:
+                        habitat["current_animals"].append(animal_id)
+                mark_habitats_changed()
+        finally:
+            connection.close()
+        return animals
+    except Exception as e:
+        print(f"Error loading animals from database: {e}")
+        return []
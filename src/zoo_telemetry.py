@@ -0,0 +1,475 @@
+"""
+File that ingests high rate collar sensor telemetry into per minute or per hour buckets
+
+All telemetry times are UTC. Numeric timestamps are seconds since 1970 UTC,
+ISO timestamps without an offset are taken as UTC too, and bucket starts
+and alert times are written with a +00:00 offset
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+from itertools import islice
+from d1_project_pitch.src.zoo_species_data import get_health_baseline
+from d1_project_pitch.src.zoo_health_tracking import check_temperature, check_heart_rate
+from d1_project_pitch.src.zoo_timestamps import iso_to_epoch_us, epoch_us_to_utc_iso
+from d1_project_pitch.src.zoo_file_management import load_animals_from_file
+
+MINUTE_US = 60 * 1000000
+HOUR_US = 60 * MINUTE_US
+
+DEFAULT_BATCH_SIZE = 4096
+
+#readings outside these are sensor faults, not animals
+MAX_HEART_RATE = 1000
+MIN_TEMPERATURE = 0.0
+MAX_TEMPERATURE = 60.0
+
+NUMBER_TYPES = (int, float)
+
+#also keeps NaN and infinite timestamps off the fast path
+MAX_EPOCH_SECONDS = 1e12
+
+#positions in a bucket list
+COUNT, HR_COUNT, HR_SUM, HR_MIN, HR_MAX, TEMP_COUNT, TEMP_SUM, TEMP_MIN, TEMP_MAX = range(9)
+
+def parse_timestamp(value):
+    """
+    Turn an ISO string or seconds since 1970 into microseconds since 1970 UTC, or None
+
+    An ISO string without an offset is taken as UTC, one with an offset is converted to UTC
+    """
+    if isinstance(value, str):
+        try:
+            return int(float(value) * 1000000)
+        except ValueError:
+            return iso_to_epoch_us(value)
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return int(value * 1000000)
+
+    return None
+
+def parse_vital(value, low, high):
+    """
+    Turn a reading into a float, giving None if it is missing and False if it is not valid
+    """
+    if value is None or value == "":
+        return None
+
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return False
+
+    if not low <= value <= high:
+        return False
+    return value
+
+def validate_reading(animal_id, timestamp, heart_rate, temperature):
+    """
+    Check the fields of one reading
+
+    Returns an (animal ID, timestamp in microseconds, heart rate, temperature)
+    tuple with None for a missing vital, or None if the reading is not valid
+    """
+    if not animal_id or not isinstance(animal_id, str):
+        return None
+
+    timestamp = parse_timestamp(timestamp)
+    heart_rate = parse_vital(heart_rate, 0, MAX_HEART_RATE)
+    temperature = parse_vital(temperature, MIN_TEMPERATURE, MAX_TEMPERATURE)
+
+    if timestamp is None or heart_rate is False or temperature is False:
+        return None
+    if heart_rate is None and temperature is None:
+        return None
+
+    return animal_id, timestamp, heart_rate, temperature
+
+def read_jsonl_telemetry(lines):
+    """
+    Yield readings from JSON lines, with None for each line that is not valid
+    """
+    loads = json.loads
+
+    for line in lines:
+        if not line.strip():
+            continue
+
+        try:
+            data = loads(line)
+            animal_id = data.get("animal_id")
+            timestamp = data.get("timestamp")
+            heart_rate = data.get("heart_rate")
+            temperature = data.get("temperature_c")
+        except (ValueError, AttributeError):
+            yield None
+            continue
+
+        #fast path for the usual reading of plain numbers
+        if (type(animal_id) is str and animal_id and type(timestamp) in NUMBER_TYPES
+                and -MAX_EPOCH_SECONDS < timestamp < MAX_EPOCH_SECONDS
+                and type(heart_rate) in NUMBER_TYPES and type(temperature) in NUMBER_TYPES
+                and 0 <= heart_rate <= MAX_HEART_RATE and MIN_TEMPERATURE <= temperature <= MAX_TEMPERATURE):
+            yield animal_id, int(timestamp * 1000000), heart_rate, temperature
+        else:
+            yield validate_reading(animal_id, timestamp, heart_rate, temperature)
+
+def read_csv_telemetry(lines):
+    """
+    Yield readings from CSV lines with a header row, with None for each row that is not valid
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    try:
+        columns = [header.index(name) for name in ("animal_id", "timestamp", "heart_rate", "temperature_c")]
+    except ValueError:
+        print("Telemetry CSV needs animal_id, timestamp, heart_rate and temperature_c columns")
+        return
+
+    width = max(columns) + 1
+    id_column, timestamp_column, hr_column, temp_column = columns
+
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            yield None
+            continue
+        yield validate_reading(row[id_column], row[timestamp_column], row[hr_column], row[temp_column])
+
+def read_telemetry(lines, telemetry_format="jsonl"):
+    """
+    Yield readings from JSONL or CSV lines
+    """
+    if telemetry_format == "csv":
+        return read_csv_telemetry(lines)
+    return read_jsonl_telemetry(lines)
+
+def make_bucket():
+    """
+    Make an empty bucket list, with the minimums and maximums set so the first reading replaces them
+    """
+    return [0, 0, 0.0, math.inf, -math.inf, 0, 0.0, math.inf, -math.inf]
+
+class TelemetryPipeline:
+    """
+    Streaming stage that batches readings, folds them into time buckets and raises alerts
+
+    Readings are summarised per animal per bucket instead of being stored,
+    so memory grows with the number of buckets and not the number of
+    readings. A vital is only passed through check_temperature or
+    check_heart_rate when it is outside the species range, and an alert is
+    raised when an animal goes out of range rather than on every reading
+
+    The watermark is the latest timestamp seen less lateness_us. Once it
+    passes the end of a bucket the bucket is handed to on_bucket and
+    dropped, so memory only holds the buckets still open. A reading for a
+    bucket that was already emitted is counted as late and left out
+    """
+
+    def __init__(self, animals, bucket_us=MINUTE_US, batch_size=DEFAULT_BATCH_SIZE, on_alert=None,
+                 on_bucket=None, lateness_us=None):
+        self.bucket_us = bucket_us
+        self.batch_size = batch_size
+        self.on_alert = on_alert
+        self.on_bucket = on_bucket
+        self.lateness_us = bucket_us if lateness_us is None else lateness_us
+        self.species_by_id = {animal["animal_id"]: animal.get("species", "") for animal in animals}
+        self.ranges = {}
+        #open buckets by start time, then by animal ID
+        self.buckets = {}
+        self.latest = None
+        self.closed_before = None
+        self.heart_rate_alerted = set()
+        self.temperature_alerted = set()
+        self.alerts = []
+        self.accepted = 0
+        self.rejected = 0
+        self.late = 0
+        self.emitted = 0
+
+    def get_ranges(self, animal_id):
+        """
+        Get the baseline and normal vitals ranges of an animal, worked out once per animal
+        """
+        baseline = get_health_baseline(self.species_by_id[animal_id])
+        ranges = (baseline, *baseline["temp_range"], *baseline["hr_range"])
+        self.ranges[animal_id] = ranges
+        return ranges
+
+    def raise_alert(self, animal_id, timestamp, vital, issues):
+        """
+        Record an alert and pass it to the alert callback
+        """
+        alert = {"animal_id": animal_id, "timestamp": epoch_us_to_utc_iso(timestamp), "vital": vital, "issue": issues[-1]}
+        self.alerts.append(alert)
+        if self.on_alert is not None:
+            self.on_alert(alert)
+
+    def process_batch(self, readings):
+        """
+        Fold a batch of validated readings into the buckets
+        """
+        buckets = self.buckets
+        ranges_by_id = self.ranges
+        bucket_us = self.bucket_us
+        heart_rate_alerted = self.heart_rate_alerted
+        temperature_alerted = self.temperature_alerted
+        species_by_id = self.species_by_id
+        latest = self.latest
+        closed_before = self.closed_before
+
+        for reading in readings:
+            if reading is None:
+                self.rejected += 1
+                continue
+
+            animal_id, timestamp, heart_rate, temperature = reading
+
+            ranges = ranges_by_id.get(animal_id)
+            if ranges is None:
+                if animal_id not in species_by_id:
+                    self.rejected += 1
+                    continue
+                ranges = self.get_ranges(animal_id)
+            baseline, temp_min, temp_max, hr_min, hr_max = ranges
+
+            start = timestamp - timestamp % bucket_us
+            if closed_before is not None and start < closed_before:
+                self.late += 1
+                continue
+            if latest is None or timestamp > latest:
+                latest = timestamp
+
+            animal_buckets = buckets.get(start)
+            if animal_buckets is None:
+                animal_buckets = buckets[start] = {}
+            bucket = animal_buckets.get(animal_id)
+            if bucket is None:
+                bucket = animal_buckets[animal_id] = make_bucket()
+            bucket[COUNT] += 1
+
+            if heart_rate is not None:
+                bucket[HR_COUNT] += 1
+                bucket[HR_SUM] += heart_rate
+                if heart_rate < bucket[HR_MIN]:
+                    bucket[HR_MIN] = heart_rate
+                if heart_rate > bucket[HR_MAX]:
+                    bucket[HR_MAX] = heart_rate
+
+                if hr_min <= heart_rate <= hr_max and heart_rate > 0:
+                    if animal_id in heart_rate_alerted:
+                        heart_rate_alerted.discard(animal_id)
+                elif animal_id not in heart_rate_alerted:
+                    heart_rate_alerted.add(animal_id)
+                    issues = []
+                    check_heart_rate({"heart_rate": heart_rate}, baseline, issues)
+                    self.raise_alert(animal_id, timestamp, "heart_rate", issues)
+
+            if temperature is not None:
+                bucket[TEMP_COUNT] += 1
+                bucket[TEMP_SUM] += temperature
+                if temperature < bucket[TEMP_MIN]:
+                    bucket[TEMP_MIN] = temperature
+                if temperature > bucket[TEMP_MAX]:
+                    bucket[TEMP_MAX] = temperature
+
+                if temp_min <= temperature <= temp_max:
+                    if animal_id in temperature_alerted:
+                        temperature_alerted.discard(animal_id)
+                elif animal_id not in temperature_alerted:
+                    temperature_alerted.add(animal_id)
+                    issues = []
+                    check_temperature({"temperature_c": temperature}, baseline, issues)
+                    self.raise_alert(animal_id, timestamp, "temperature_c", issues)
+
+            self.accepted += 1
+
+        self.latest = latest
+        if latest is not None:
+            self.emit_closed(latest - self.lateness_us)
+
+    def emit_closed(self, watermark):
+        """
+        Emit and drop every bucket that ends at or before the watermark
+        """
+        closed_before = watermark - watermark % self.bucket_us
+        if self.closed_before is not None and closed_before <= self.closed_before:
+            return
+
+        self.closed_before = closed_before
+        for start in sorted(start for start in self.buckets if start < closed_before):
+            self.emit_start(start)
+
+    def emit_start(self, start):
+        """
+        Emit and drop the buckets of every animal that start at one time
+        """
+        animal_buckets = self.buckets.pop(start)
+
+        for animal_id in sorted(animal_buckets):
+            self.emitted += 1
+            if self.on_bucket is not None:
+                self.on_bucket(describe_bucket(animal_id, start, animal_buckets[animal_id]))
+
+    def flush(self):
+        """
+        Emit and drop every open bucket at the end of a stream
+
+        Returns the number of buckets emitted by the pipeline so far
+        """
+        if self.buckets:
+            last_start = max(self.buckets)
+            for start in sorted(self.buckets):
+                self.emit_start(start)
+            self.closed_before = last_start + self.bucket_us
+        return self.emitted
+
+    def ingest(self, readings):
+        """
+        Process an iterable of readings in batches
+
+        Returns the number of readings accepted from it
+        """
+        accepted = self.accepted
+        readings = iter(readings)
+
+        while True:
+            batch = list(islice(readings, self.batch_size))
+            if not batch:
+                break
+            self.process_batch(batch)
+
+        return self.accepted - accepted
+
+    def get_buckets(self, bucket_us=None):
+        """
+        Get the open buckets as dicts sorted by animal and time
+
+        A bucket_us that is a multiple of the pipeline's own, such as
+        HOUR_US on a per minute pipeline, rolls the buckets up
+        """
+        buckets = {(animal_id, start): bucket for start, animal_buckets in self.buckets.items()
+                   for animal_id, bucket in animal_buckets.items()}
+
+        if bucket_us is not None and bucket_us != self.bucket_us:
+            buckets = rollup_buckets(buckets, bucket_us)
+
+        return [describe_bucket(animal_id, start, bucket) for (animal_id, start), bucket in sorted(buckets.items())]
+
+def rollup_buckets(buckets, bucket_us):
+    """
+    Merge buckets keyed by animal ID and start time into larger ones
+    """
+    merged = {}
+
+    for (animal_id, start), bucket in buckets.items():
+        key = (animal_id, start - start % bucket_us)
+        target = merged.get(key)
+        if target is None:
+            merged[key] = list(bucket)
+            continue
+
+        for position in (COUNT, HR_COUNT, HR_SUM, TEMP_COUNT, TEMP_SUM):
+            target[position] += bucket[position]
+        for position in (HR_MIN, TEMP_MIN):
+            target[position] = min(target[position], bucket[position])
+        for position in (HR_MAX, TEMP_MAX):
+            target[position] = max(target[position], bucket[position])
+
+    return merged
+
+def describe_vital(count, total, low, high):
+    """
+    Get the mean, minimum, maximum and count of one vital in a bucket, or None if it had no readings
+    """
+    if not count:
+        return None
+    return {"mean": total / count, "min": low, "max": high, "count": count}
+
+def describe_bucket(animal_id, start, bucket):
+    """
+    Get one bucket as a dict
+    """
+    return {
+        "animal_id": animal_id,
+        "start": epoch_us_to_utc_iso(start),
+        "readings": bucket[COUNT],
+        "heart_rate": describe_vital(bucket[HR_COUNT], bucket[HR_SUM], bucket[HR_MIN], bucket[HR_MAX]),
+        "temperature_c": describe_vital(bucket[TEMP_COUNT], bucket[TEMP_SUM], bucket[TEMP_MIN], bucket[TEMP_MAX])
+    }
+
+def bucket_to_health_data(bucket):
+    """
+    Get the mean vitals of a bucket in the shape record_health_check takes
+    """
+    health_data = {}
+
+    if bucket["heart_rate"]:
+        health_data["heart_rate"] = round(bucket["heart_rate"]["mean"])
+    if bucket["temperature_c"]:
+        health_data["temperature_c"] = round(bucket["temperature_c"]["mean"], 2)
+
+    return health_data
+
+def ingest_telemetry_file(filename, animals, telemetry_format=None, bucket_us=MINUTE_US, on_alert=None, on_bucket=None):
+    """
+    Ingest a JSONL or CSV telemetry file, or standard input when filename is -
+
+    The format is taken from the file extension unless it is given. Every
+    bucket is passed to on_bucket, the open ones when the input ends
+    """
+    if telemetry_format is None:
+        telemetry_format = "csv" if filename.endswith(".csv") else "jsonl"
+
+    pipeline = TelemetryPipeline(animals, bucket_us=bucket_us, on_alert=on_alert, on_bucket=on_bucket)
+
+    if filename == "-":
+        pipeline.ingest(read_telemetry(sys.stdin, telemetry_format))
+    else:
+        with open(filename, 'r', newline='') as file:
+            pipeline.ingest(read_telemetry(file, telemetry_format))
+
+    pipeline.flush()
+    return pipeline
+
+def main():
+    """
+    Command line tool for ingesting a telemetry file or pipe
+    """
+    parser = argparse.ArgumentParser(description="Downsample collar telemetry into per minute or per hour buckets")
+    parser.add_argument("source", help="JSONL or CSV telemetry file, or - to read standard input")
+    parser.add_argument("--data", default="zoo_data.json", help="zoo data file with the animals being monitored")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="telemetry format, taken from the extension by default")
+    parser.add_argument("--resolution", choices=["minute", "hour"], default="minute", help="bucket size")
+    parser.add_argument("--output", help="JSONL file to write the buckets to")
+    args = parser.parse_args()
+
+    animals = load_animals_from_file(args.data)
+    bucket_us = HOUR_US if args.resolution == "hour" else MINUTE_US
+
+    def print_alert(alert):
+        print(f"ALERT {alert['timestamp']} {alert['animal_id']}: {alert['issue']}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            def write_bucket(bucket):
+                file.write(json.dumps(bucket) + "\n")
+
+            pipeline = ingest_telemetry_file(args.source, animals, args.format, bucket_us, print_alert, write_bucket)
+    else:
+        pipeline = ingest_telemetry_file(args.source, animals, args.format, bucket_us, print_alert)
+
+    print(f"Accepted {pipeline.accepted} readings, rejected {pipeline.rejected}, {pipeline.late} late, "
+          f"{pipeline.emitted} buckets, {len(pipeline.alerts)} alerts")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+"""
+File with a multi-pattern matcher that finds many terms in one pass over a text
+"""
+
+from collections import deque
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over a fixed list of terms
+
+    It is built once from the terms and then finds every term in a text
+    in a single pass, however many terms there are. Matching ignores case
+    """
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+
+        for index, term in enumerate(self.terms):
+            self.add_term(term.lower(), index)
+
+        self.build_fail_links()
+
+    def add_term(self, term, index):
+        """
+        Add one term to the trie
+        """
+        state = 0
+        for character in term:
+            next_state = self.transitions[state].get(character)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][character] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+
+        self.outputs[state].append(index)
+
+    def build_fail_links(self):
+        """
+        Link every state to the longest suffix that is also in the trie
+        """
+        queue = deque(self.transitions[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for character, next_state in self.transitions[state].items():
+                queue.append(next_state)
+
+                #states one character deep can only fall back to the root
+                if state:
+                    fallback = self.fail[state]
+                    while fallback and character not in self.transitions[fallback]:
+                        fallback = self.fail[fallback]
+                    self.fail[next_state] = self.transitions[fallback].get(character, 0)
+
+                #a state also matches everything its fail state matches
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def iter_matches(self, text):
+        """
+        Yield (end position, term index) for every term found in the text
+        """
+        transitions = self.transitions
+        fail = self.fail
+        outputs = self.outputs
+        state = 0
+
+        for position, character in enumerate(text.lower()):
+            while state and character not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(character, 0)
+
+            for index in outputs[state]:
+                yield position, index
+
+    def find_term_indexes(self, text):
+        """
+        Get the sorted indexes of every term found in the text
+        """
+        return sorted({index for _, index in self.iter_matches(text)})
+
+    def find_terms(self, text):
+        """
+        Get every term found in the text, in the order of the term list
+        """
+        return [self.terms[index] for index in self.find_term_indexes(text)]
+
+    def find_first_term_index(self, text):
+        """
+        Get the index of the earliest listed term found in the text, or -1
+
+        This is the term a loop over the term list with a break would report
+        """
+        first = -1
+        for _, index in self.iter_matches(text):
+            if first < 0 or index < first:
+                first = index
+                if first == 0:
+                    break
+        return first
+
+    def scan(self, texts):
+        """
+        Yield the terms found in each text of an iterable, reusing the same automaton
+        """
+        for text in texts:
+            yield self.find_terms(text)
@@ -0,0 +1,65 @@
+"""
+File with helpers for turning ISO timestamps into sortable integers and back
+"""
+
+import datetime
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+#sorts before every real timestamp
+MISSING_EPOCH_US = -(2 ** 63)
+
+def datetime_to_epoch_us(moment):
+    """
+    Convert a datetime into microseconds since 1970
+
+    Datetimes with a timezone are stored as UTC, naive ones as they are
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+    delta = moment - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def iso_to_epoch_us(timestamp):
+    """
+    Convert an ISO timestamp string into microseconds since 1970
+
+    Returns None if the string is not a valid timestamp
+    """
+    try:
+        moment = datetime.datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+
+    return datetime_to_epoch_us(moment)
+
+def to_epoch_us(moment):
+    """
+    Convert an ISO string, datetime or microseconds since 1970 into microseconds since 1970
+
+    Returns None if it cannot be converted
+    """
+    if isinstance(moment, datetime.datetime):
+        return datetime_to_epoch_us(moment)
+    if isinstance(moment, int) and not isinstance(moment, bool):
+        return moment
+    return iso_to_epoch_us(moment)
+
+def epoch_us_to_iso(epoch_us):
+    """
+    Convert microseconds since 1970 back into an ISO timestamp string
+    """
+    return (EPOCH + datetime.timedelta(microseconds=epoch_us)).isoformat()
+
+def epoch_us_to_utc_iso(epoch_us):
+    """
+    Convert microseconds since 1970 taken as UTC into an ISO timestamp string ending in +00:00
+    """
+    return (EPOCH + datetime.timedelta(microseconds=epoch_us)).replace(tzinfo=datetime.timezone.utc).isoformat()
+
+def now_epoch_us():
+    """
+    Get the current local time in microseconds since 1970, the same clock the records use
+    """
+    return datetime_to_epoch_us(datetime.datetime.now())
@@ -2,14 +2,27 @@
 The main zoo UI
 """
 
+import os
+
 from d1_project_pitch.src.zoo_animal_management import add_new_animal, display_species_list
 from d1_project_pitch.src.zoo_health_tracking import record_health_check, calculate_health_status
-from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule, record_feeding
+from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule, get_feeding_inputs, record_feeding
 from d1_project_pitch.src.zoo_breeding import check_breeding_eligibility
-from d1_project_pitch.src.zoo_file_management import load_animals_from_file, save_animals_to_file
-from d1_project_pitch.src.zoo_habitat_assignment import get_animal_habitat, assign_animal_to_habitat, generate_habitat_report
+from d1_project_pitch.src.zoo_file_management import load_animals_from_file, save_changed_animals
+from d1_project_pitch.src.zoo_sqlite_storage import is_database_filename
+from d1_project_pitch.src.zoo_sharded_storage import is_sharded_directory
+from d1_project_pitch.src.zoo_change_tracking import TrackedAnimalList
+from d1_project_pitch.src.zoo_journal import MutationJournal
+from d1_project_pitch.src.zoo_notes_index import open_notes_index, save_notes_index
+from d1_project_pitch.src.zoo_vitals_stats import build_vitals_stats
+from d1_project_pitch.src.zoo_persistent_history import AnimalVersionLog
+from d1_project_pitch.src.zoo_animal_registry import AnimalRegistry, find_animal, replace_animal
+from d1_project_pitch.src.zoo_habitat_assignment import get_unassigned_animals, assign_animal_to_habitat, generate_habitat_report
 from d1_project_pitch.src.zoo_species_data import ZOO_HABITATS
 
+#a .db filename or a sharded directory can be set instead of the JSON file
+DATA_FILENAME = os.environ.get("ZOO_DATA_FILE", "zoo_data.json")
+
 def display_main_menu():
     """
     Display the main menu
@@ -53,9 +66,11 @@ def list_animals(animals):
     for i, animal in enumerate(animals, 1): 
         print(f"{i}. {animal['name']} ({animal['species']}) - ID: {animal['animal_id']}")
 
-def add_new_animal_to_system(animals):
+def add_new_animal_to_system(animals, journal=None, compact=False):
     """
     Adding a new animal to the system
+
+    With compact=True the animal is added as a compact record sharing its species profile
     """
 
     display_species_list()
@@ -73,10 +88,14 @@ def add_new_animal_to_system(animals):
         print("Invalid age. Using default age 0.")
         age = 0
     
-    new_animal = add_new_animal(animal_id, name, species, age, animals)
+    new_animal = add_new_animal(animal_id, name, species, age, animals, compact=compact)
 
     if new_animal: 
         animals.append(new_animal)
+
+        if journal:
+            journal.log_new_animal(new_animal)
+
         print(f"Successfully added {name} the {species} to the system!") 
         return animals
     else: 
@@ -87,12 +106,20 @@ def find_animal_by_id(animal_id, animals):
     """ 
     Find an animal by ID in the animals list
     """ 
-    for animal in animals: 
-        if animal.get('animal_id') == animal_id: 
-            return animal 
-    return None
+    return find_animal(animal_id, animals)
+
+def record_version(version_log, old_animal, updated_animal):
+    """
+    Log the new version of a changed animal, and the version before it if the log has none yet
+    """
+    if version_log is None:
+        return
 
-def record_health_check_in_system(animals):
+    if version_log.get_latest(old_animal["animal_id"]) is None:
+        version_log.record(old_animal)
+    version_log.record(updated_animal)
+
+def record_health_check_in_system(animals, journal=None, notes_index=None, vitals_stats=None, version_log=None):
     """
     Recording a health check for the animal
     """
@@ -139,22 +166,28 @@ def record_health_check_in_system(animals):
     health_data['vaccination_status'] = input("Enter vaccination status (current/overdue/none): ").strip() 
     health_data['vet_notes'] = input("Enter vet notes: ").strip() 
     
-    updated_animal = record_health_check(animal, health_data) 
+    updated_animal = record_health_check(animal, health_data, notes_index=notes_index, vitals_stats=vitals_stats) 
     
     #update animal in list
-    for i, a in enumerate(animals): 
-        if a['animal_id'] == animal_id: 
-            animals[i] = updated_animal 
-            break 
+    replace_animal(animals, updated_animal)
+    record_version(version_log, animal, updated_animal)
+
+    if journal:
+        journal.log_health_check(animal_id, updated_animal["health_records"][-1])
     
     health_status, details = calculate_health_status(updated_animal) 
     
     print(f"Health check recorded. Current status: {health_status}") 
     print(f"   Details: {details}") 
+
+    #readings can be inside the species ranges but still unusual for this animal
+    if vitals_stats is not None:
+        for anomaly in vitals_stats.get_latest_anomalies(animal_id):
+            print(f"   Warning: {anomaly}")
     
     return animals
 
-def process_feeding_in_system(animals):
+def process_feeding_in_system(animals, journal=None, version_log=None):
     """
     Process animal feeding
     """
@@ -169,7 +202,7 @@ def process_feeding_in_system(animals):
     total_vegetation = 0
 
     for animal in animals: 
-        schedule = calculate_feeding_schedule(animal) 
+        schedule = calculate_feeding_schedule(get_feeding_inputs(animal)) 
         print(f"\n{animal['name']} ({animal['species']}):") 
         print(f"  Food: {schedule['food_type']} - {schedule['daily_amount_kg']}kg") 
         print(f"  Times: {', '.join(schedule['feeding_times'])}")
@@ -201,11 +234,11 @@ def process_feeding_in_system(animals):
             
             updated_animal = record_feeding(animal, feeding_details)
 
-            for i, a in enumerate(animals): 
-                if a['animal_id'] == animal_id: 
-                    animals[i] = updated_animal 
-                    break 
-                
+            replace_animal(animals, updated_animal)
+            record_version(version_log, animal, updated_animal)
+
+            if journal:
+                journal.log_feeding(animal_id, updated_animal["feeding_history"][-1])
             
             print("Feeding recorded successfully!") 
             
@@ -239,7 +272,7 @@ def check_breeding_eligibility_in_system(animals):
     return animals
 
 
-def assign_to_habitat_in_system(animals, habitats):
+def assign_to_habitat_in_system(animals, habitats, journal=None):
     """
     Assign an animal to a habitat
     """
@@ -257,12 +290,7 @@ def assign_to_habitat_in_system(animals, habitats):
     
 
     #show unassigned animals
-    unassigned_animals = [] 
-    for animal in animals:
-        current_habitat = get_animal_habitat(animal["animal_id"], habitats) 
-        
-        if not current_habitat: 
-            unassigned_animals.append(animal)
+    unassigned_animals = get_unassigned_animals(animals, habitats)
 
     print("\nUnassigned Animals:") 
     for animal in unassigned_animals: 
@@ -313,6 +341,10 @@ def assign_to_habitat_in_system(animals, habitats):
     success, message = assign_animal_to_habitat(animal_to_assign, habitat_name, habitats, animals) 
     
     if success: 
+        if isinstance(animals, TrackedAnimalList):
+            animals.mark_moved(animal_id)
+        if journal:
+            journal.log_habitat_assignment(animal_id, habitat_name)
         print(f"{message}")
     else: 
         print(f"{message}") 
@@ -352,40 +384,76 @@ def view_habitat_report_in_system(animals, habitats):
 
 
 
-def run_zoo_program():
+def save_zoo_data(animals, habitats, journal=None, data_filename=DATA_FILENAME):
+    """
+    Save what changed since the last save
+
+    Without a journal the changes are written row by row with
+    save_changed_animals, with one the journal is compacted into a new snapshot
+    """
+    if journal is None:
+        return save_changed_animals(animals, data_filename, habitats)
+
+    if journal.compact(animals, habitats):
+        animals.checkpoint()
+        return True
+    return False
+
+def run_zoo_program(data_filename=DATA_FILENAME):
     """
     Function responsible for running the main zoo program
     """
     print("Welcome to the Zoo Habitat and Wellness Management System!")
 
-    animals = load_animals_from_file("zoo_data.json") 
+    habitats = ZOO_HABITATS
+
+    #compact records share one species profile instead of copying the traits into every animal
+    animals = AnimalRegistry(load_animals_from_file(data_filename, habitats, compact=True)) 
     print(f"Loaded {len(animals)} animals from storage.")
 
-    habitats = ZOO_HABITATS
+    #a database or sharded directory saves only the changes after every action, a JSON file journals every change as it happens
+    journal = None if is_database_filename(data_filename) or is_sharded_directory(data_filename) else MutationJournal(data_filename)
+
+    #vet notes stay searchable without scanning every record
+    notes_index = open_notes_index(data_filename, animals)
+
+    #each animal's own running vitals, updated as health checks come in
+    vitals_stats = build_vitals_stats(animals)
+
+    #earlier versions of changed animals stay readable for undo and audit
+    version_log = AnimalVersionLog()
 
     while True: 
         display_main_menu() 
         choice = get_menu_choice()
 
         if choice == 1: #add new animal
-            animals = add_new_animal_to_system(animals)
+            animals = add_new_animal_to_system(animals, journal, compact=True)
         elif choice == 2: #habitats
-            animals, habitats = assign_to_habitat_in_system(animals, habitats)
+            animals, habitats = assign_to_habitat_in_system(animals, habitats, journal)
         elif choice == 3: #record health check
-            animals = record_health_check_in_system(animals)
+            animals = record_health_check_in_system(animals, journal, notes_index, vitals_stats, version_log)
         elif choice == 4: #process feeding
-            animals = process_feeding_in_system(animals)
+            animals = process_feeding_in_system(animals, journal, version_log)
         elif choice == 5: #check breeding eligibility
             animals = check_breeding_eligibility_in_system(animals)
         elif choice == 6: 
             animals, habitats = view_habitat_report_in_system(animals, habitats)
         elif choice == 7:   #QUIT
-            if save_animals_to_file(animals, "zoo_data.json"):
+            if save_zoo_data(animals, habitats, journal, data_filename):
                 print("Animal data saved successfully.")
+                #an index saved over unsaved data would list notes the file does not have
+                save_notes_index(notes_index, data_filename)
             else:
                 print("Warning: Could not save animal data.")
+            if journal:
+                journal.close()
             print("Thank you for using the Zoo Management System. We hope to see you again!")
             break
+
+        #the database takes the changes straight away, a journal is folded into a fresh snapshot once it gets long
+        if journal is None or journal.should_compact():
+            save_zoo_data(animals, habitats, journal, data_filename)
     
     return animals
 
@@ -0,0 +1,205 @@
+"""
+File that keeps running statistics of each animal's vitals and flags unusual readings
+"""
+
+import math
+from collections import deque
+
+TRACKED_VITALS = ("weight_kg", "temperature_c", "heart_rate")
+
+DEFAULT_WINDOW_SIZE = 10
+DEFAULT_SMOOTHING = 0.3
+ANOMALY_Z_SCORE = 3.0
+MIN_READINGS = 5
+
+#readings that barely vary would make any change look extreme, so the std is never taken as smaller than these
+MIN_RELATIVE_STD = 0.005
+MIN_VITAL_STD = {"weight_kg": 0.5, "temperature_c": 0.1, "heart_rate": 1.0}
+
+class RollingStats:
+    """
+    Running statistics of one vital that take constant time to update
+
+    Keeps the mean and variance of every reading (Welford's method), an
+    exponentially weighted moving average and the min and max of the last
+    window_size readings
+    """
+
+    __slots__ = ("window_size", "smoothing", "count", "mean", "squared_deviations", "ewma",
+                 "window_minimums", "window_maximums")
+
+    def __init__(self, window_size=DEFAULT_WINDOW_SIZE, smoothing=DEFAULT_SMOOTHING):
+        self.window_size = window_size
+        self.smoothing = smoothing
+        self.count = 0
+        self.mean = 0.0
+        self.squared_deviations = 0.0
+        self.ewma = None
+
+        #(reading number, value) pairs kept in increasing and decreasing order of value
+        self.window_minimums = deque()
+        self.window_maximums = deque()
+
+    def update(self, value):
+        """
+        Add one reading
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squared_deviations += delta * (value - self.mean)
+
+        self.ewma = value if self.ewma is None else self.smoothing * value + (1 - self.smoothing) * self.ewma
+
+        #older readings that can never be the min or max again are dropped
+        while self.window_minimums and self.window_minimums[-1][1] >= value:
+            self.window_minimums.pop()
+        self.window_minimums.append((self.count, value))
+
+        while self.window_maximums and self.window_maximums[-1][1] <= value:
+            self.window_maximums.pop()
+        self.window_maximums.append((self.count, value))
+
+        oldest = self.count - self.window_size
+        if self.window_minimums[0][0] <= oldest:
+            self.window_minimums.popleft()
+        if self.window_maximums[0][0] <= oldest:
+            self.window_maximums.popleft()
+
+    def get_variance(self):
+        """
+        Get the sample variance of every reading so far
+        """
+        return self.squared_deviations / (self.count - 1) if self.count > 1 else 0.0
+
+    def get_std(self):
+        """
+        Get the sample standard deviation of every reading so far
+        """
+        return math.sqrt(self.get_variance())
+
+    def get_window_min(self):
+        """
+        Get the lowest of the last window_size readings, or None if there are none
+        """
+        return self.window_minimums[0][1] if self.window_minimums else None
+
+    def get_window_max(self):
+        """
+        Get the highest of the last window_size readings, or None if there are none
+        """
+        return self.window_maximums[0][1] if self.window_maximums else None
+
+    def get_z_score(self, value, min_std=0.0):
+        """
+        Get how many standard deviations a value is from the mean, or None if that is not known yet
+
+        The std is floored at min_std and at MIN_RELATIVE_STD of the mean, so a
+        run of identical readings still gives a z-score for the next one
+        """
+        std = max(self.get_std(), min_std, MIN_RELATIVE_STD * abs(self.mean))
+        if self.count < 2 or std == 0:
+            return None
+        return (value - self.mean) / std
+
+    def get_summary(self):
+        """
+        Get the statistics as a dict
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.get_std(),
+            "ewma": self.ewma,
+            "window_min": self.get_window_min(),
+            "window_max": self.get_window_max()
+        }
+
+class VitalsStatsTracker:
+    """
+    Rolling statistics for every tracked vital of every animal
+
+    Each reading is checked against the animal's own history before it is
+    added, so drifting that stays inside the species ranges is still caught
+    """
+
+    def __init__(self, window_size=DEFAULT_WINDOW_SIZE, smoothing=DEFAULT_SMOOTHING,
+                 z_threshold=ANOMALY_Z_SCORE, min_readings=MIN_READINGS):
+        self.window_size = window_size
+        self.smoothing = smoothing
+        self.z_threshold = z_threshold
+        self.min_readings = min_readings
+        self.animals = {}
+        self.latest_anomalies = {}
+
+    def get_stats(self, animal_id, vital):
+        """
+        Get the rolling statistics of one vital of an animal, or None if it has no readings
+        """
+        return self.animals.get(animal_id, {}).get(vital)
+
+    def find_anomalies(self, animal_id, health_data):
+        """
+        Get the vitals in a reading that are unusual for this animal
+
+        Returns a list of descriptions, empty if nothing stands out or the
+        animal does not have enough readings yet
+        """
+        anomalies = []
+        animal_stats = self.animals.get(animal_id, {})
+
+        for vital in TRACKED_VITALS:
+            value = health_data.get(vital)
+            stats = animal_stats.get(vital)
+            if value is None or stats is None or stats.count < self.min_readings:
+                continue
+
+            z_score = stats.get_z_score(value, MIN_VITAL_STD.get(vital, 0.0))
+            if z_score is not None and abs(z_score) >= self.z_threshold:
+                direction = "above" if z_score > 0 else "below"
+                anomalies.append(f"unusual {vital} ({value} is {abs(z_score):.1f} std {direction} its mean of {stats.mean:.1f})")
+
+        return anomalies
+
+    def record(self, animal_id, health_data):
+        """
+        Check a new reading against the animal's history and then add it
+
+        Returns the anomalies found in the reading
+        """
+        anomalies = self.find_anomalies(animal_id, health_data)
+        self.latest_anomalies[animal_id] = anomalies
+
+        animal_stats = self.animals.get(animal_id)
+        if animal_stats is None:
+            animal_stats = self.animals[animal_id] = {}
+
+        for vital in TRACKED_VITALS:
+            value = health_data.get(vital)
+            if value is None:
+                continue
+
+            stats = animal_stats.get(vital)
+            if stats is None:
+                stats = animal_stats[vital] = RollingStats(self.window_size, self.smoothing)
+            stats.update(value)
+
+        return anomalies
+
+    def get_latest_anomalies(self, animal_id):
+        """
+        Get the anomalies found in the latest reading of an animal
+        """
+        return self.latest_anomalies.get(animal_id, [])
+
+def build_vitals_stats(animals, **settings):
+    """
+    Build a tracker from the health records of a list of animals, oldest reading first
+    """
+    tracker = VitalsStatsTracker(**settings)
+
+    for animal in animals:
+        for health_record in animal.get("health_records", []):
+            tracker.record(animal["animal_id"], health_record.get("data", {}))
+
+    return tracker
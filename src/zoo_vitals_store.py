@@ -0,0 +1,219 @@
+"""
+File that stores health check vitals in columns of typed arrays
+"""
+
+import math
+from array import array
+from d1_project_pitch.src.zoo_timestamps import iso_to_epoch_us, now_epoch_us
+
+MISSING_HEART_RATE = 0xFFFF
+MAX_HEART_RATE = 0xFFFE
+
+#ints up to this are exact in a float column
+MAX_EXACT_INT = 2 ** 53
+
+#bits in int_vitals for the float columns that hold a whole int
+INT_FLAGS = {"weight_kg": 1, "temperature_c": 2}
+
+class VitalsColumns:
+    """
+    The vitals of one animal, one array per vital
+
+    Missing weights and temperatures are NaN, a missing heart rate is
+    MISSING_HEART_RATE and vaccination status code 0 means not recorded.
+    int_vitals flags the weights and temperatures recorded as ints, and a
+    value that does not fit its column, such as a heart rate that is not a
+    whole number, is kept in extras by (vital, index) so it reads back as it
+    went in
+    """
+
+    __slots__ = ("timestamps", "weight_kg", "temperature_c", "heart_rate", "vaccination_status", "vet_notes",
+                 "int_vitals", "extras")
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.weight_kg = array('d')
+        self.temperature_c = array('d')
+        self.heart_rate = array('H')
+        self.vaccination_status = array('B')
+        self.vet_notes = []
+        self.int_vitals = array('B')
+        self.extras = {}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+class VitalsRow:
+    """
+    Read-only view of one reading that looks like a health record's data dict
+
+    The check_* helpers and calculate_health_status can read it directly,
+    so no dict is made for the reading
+    """
+
+    __slots__ = ("store", "columns", "index")
+
+    def __init__(self, store, columns, index):
+        self.store = store
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, key):
+        columns = self.columns
+        index = self.index
+
+        if key == "weight_kg" or key == "temperature_c":
+            value = getattr(columns, key)[index]
+            if not math.isnan(value):
+                return int(value) if columns.int_vitals[index] & INT_FLAGS[key] else value
+            if (key, index) in columns.extras:
+                return columns.extras[key, index]
+        elif key == "heart_rate":
+            value = columns.heart_rate[index]
+            if value != MISSING_HEART_RATE:
+                return value
+            if (key, index) in columns.extras:
+                return columns.extras[key, index]
+        elif key == "vaccination_status":
+            code = columns.vaccination_status[index]
+            if code:
+                return self.store.vaccination_values[code]
+        elif key == "vet_notes":
+            value = columns.vet_notes[index]
+            if value is not None:
+                return value
+
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_timestamp(self):
+        """
+        Get when the reading was taken, in microseconds since 1970
+        """
+        return self.columns.timestamps[self.index]
+
+class VitalsStore:
+    """
+    Columnar store of vitals for many animals
+
+    Vaccination statuses are dictionary encoded: each distinct status is
+    stored once and every reading holds a one byte code for it
+    """
+
+    def __init__(self):
+        self.animals = {}
+        self.vaccination_values = [None]
+        self.vaccination_codes = {}
+
+    def get_vaccination_code(self, status):
+        """
+        Get the code for a vaccination status, adding it to the dictionary if it is new
+        """
+        if status is None:
+            return 0
+
+        code = self.vaccination_codes.get(status)
+        if code is None:
+            code = len(self.vaccination_values)
+            if code > 255:
+                raise ValueError("Too many distinct vaccination statuses")
+            self.vaccination_values.append(status)
+            self.vaccination_codes[status] = code
+        return code
+
+    def append(self, animal_id, health_data, timestamp=None):
+        """
+        Add one reading for an animal
+
+        timestamp is microseconds since 1970 and defaults to now
+        """
+        columns = self.animals.get(animal_id)
+        if columns is None:
+            columns = self.animals[animal_id] = VitalsColumns()
+
+        index = len(columns)
+        int_vitals = 0
+
+        heart_rate = health_data.get("heart_rate")
+        if type(heart_rate) is not int or not 0 <= heart_rate <= MAX_HEART_RATE:
+            if heart_rate is not None:
+                columns.extras["heart_rate", index] = heart_rate
+            heart_rate = MISSING_HEART_RATE
+
+        float_vitals = []
+        for key in ("weight_kg", "temperature_c"):
+            value = health_data.get(key)
+            if type(value) is int and abs(value) <= MAX_EXACT_INT:
+                int_vitals |= INT_FLAGS[key]
+                value = float(value)
+            elif type(value) is not float or math.isnan(value):
+                if value is not None:
+                    columns.extras[key, index] = value
+                value = math.nan
+            float_vitals.append(value)
+
+        columns.timestamps.append(now_epoch_us() if timestamp is None else timestamp)
+        columns.weight_kg.append(float_vitals[0])
+        columns.temperature_c.append(float_vitals[1])
+        columns.heart_rate.append(heart_rate)
+        columns.int_vitals.append(int_vitals)
+        columns.vaccination_status.append(self.get_vaccination_code(health_data.get("vaccination_status")))
+        columns.vet_notes.append(health_data.get("vet_notes"))
+
+    def append_record(self, animal_id, health_record):
+        """
+        Add a health record in the {"date": ..., "data": {...}} shape
+        """
+        self.append(animal_id, health_record.get("data", {}), iso_to_epoch_us(health_record.get("date")) or 0)
+
+    def count(self, animal_id):
+        """
+        Get how many readings are stored for an animal
+        """
+        columns = self.animals.get(animal_id)
+        return len(columns) if columns else 0
+
+    def get_row(self, animal_id, index):
+        """
+        Get a view of one reading of an animal
+        """
+        return VitalsRow(self, self.animals[animal_id], index)
+
+    def get_latest(self, animal_id):
+        """
+        Get a view of the latest reading of an animal, or None if it has none
+        """
+        columns = self.animals.get(animal_id)
+        if not columns:
+            return None
+        return VitalsRow(self, columns, len(columns) - 1)
+
+    def get_columns(self, animal_id):
+        """
+        Get the raw arrays of an animal's readings
+        """
+        return self.animals.get(animal_id)
+
+def build_vitals_store(animals):
+    """
+    Build a vitals store from the health records of a list of animals
+    """
+    store = VitalsStore()
+
+    for animal in animals:
+        for health_record in animal.get("health_records", []):
+            store.append_record(animal["animal_id"], health_record)
+
+    return store
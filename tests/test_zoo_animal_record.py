@@ -0,0 +1,101 @@
+import json
+import unittest
+from d1_project_pitch.src.zoo_species_data import SPECIES_HEALTH_BASELINES, update_species_baseline
+from d1_project_pitch.src.zoo_animal_record import Animal, get_species_profile, compact_animals, animals_to_dicts
+from d1_project_pitch.src.zoo_animal_management import add_new_animal
+from d1_project_pitch.src.zoo_health_tracking import record_health_check, calculate_health_status
+from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule
+
+class TestAnimalRecord(unittest.TestCase):
+    """
+    Test suite for compact animal records
+    """
+
+    def test_compact_animal_matches_dict(self):
+        """
+        Test that a compact animal reads the same as the dict version
+        """
+        animal_dict = add_new_animal("LION001", "Leo", "Lion", 5)
+        animal = add_new_animal("LION001", "Leo", "Lion", 5, compact=True)
+
+        self.assertIsInstance(animal, Animal)
+        self.assertEqual(animal, animal_dict)
+        self.assertEqual(list(animal.keys()), list(animal_dict.keys()))
+        self.assertEqual(animal["diet"], "carnivore")
+
+    def test_species_profile_is_shared(self):
+        """
+        Test that animals of one species point at the same profile object
+        """
+        leo = add_new_animal("LION001", "Leo", "Lion", 5, compact=True)
+        luna = add_new_animal("LION002", "Luna", "Lion", 4, compact=True)
+
+        self.assertIs(leo.profile, luna.profile)
+        self.assertIs(leo.profile, get_species_profile("Lion"))
+        self.assertFalse(hasattr(leo, "__dict__"))
+
+    def test_extra_keys_and_overrides(self):
+        """
+        Test keys that are not fields and traits that differ from the species
+        """
+        animal = Animal("LION001", "Leo", "Lion", 5)
+        animal["weight_kg"] = 190
+        animal["temperament"] = "calm"
+
+        self.assertEqual(animal.get("weight_kg"), 190)
+        self.assertEqual(animal["temperament"], "calm")
+        self.assertEqual(get_species_profile("Lion").temperament, "aggressive")
+        self.assertIsNone(animal.get("genetic_diversity"))
+
+    def test_profile_follows_baseline_change(self):
+        """
+        Test that changing a species baseline gives new records the new traits and leaves earlier ones alone
+        """
+        leo = Animal("LION001", "Leo", "Lion", 5)
+
+        temperament = SPECIES_HEALTH_BASELINES["Lion"]["temperament"]
+        try:
+            update_species_baseline("Lion", temperament="calm")
+            luna = Animal("LION002", "Luna", "Lion", 4)
+
+            self.assertEqual(get_species_profile("Lion").temperament, "calm")
+            self.assertEqual(luna["temperament"], "calm")
+            self.assertEqual(leo["temperament"], "aggressive")
+        finally:
+            update_species_baseline("Lion", temperament=temperament)
+
+        self.assertEqual(get_species_profile("Lion").temperament, "aggressive")
+
+    def test_delete_trait(self):
+        """
+        Test that deleting a trait from the species profile keeps the other traits and leaves the profile alone
+        """
+        animal = Animal("LION001", "Leo", "Lion", 5)
+
+        del animal["diet"]
+
+        self.assertNotIn("diet", animal)
+        self.assertEqual(animal["temperament"], "aggressive")
+        self.assertEqual(get_species_profile("Lion").diet, "carnivore")
+        with self.assertRaises(KeyError):
+            del animal["diet"]
+
+    def test_round_trip_through_json(self):
+        """
+        Test that compact animals save and load back as the same dicts
+        """
+        animals = [{"animal_id": "ZEBRA001", "name": "Stripes", "species": "Zebra"},
+                   add_new_animal("WOLF001", "Fang", "Wolf", 3)]
+
+        compact = compact_animals(animals)
+        self.assertEqual(json.loads(json.dumps(animals_to_dicts(compact))), animals)
+
+    def test_works_with_health_and_feeding(self):
+        """
+        Integration testing: compact animals go through health and feeding code unchanged
+        """
+        animal = add_new_animal("LION001", "Leo", "Lion", 5, compact=True)
+        updated = record_health_check(animal, {"weight_kg": 200.0, "temperature_c": 38.5, "heart_rate": 55})
+
+        self.assertEqual(calculate_health_status(updated)[0], "healthy")
+        self.assertEqual(calculate_feeding_schedule(updated)["food_type"], "meat")
@@ -0,0 +1,148 @@
+import unittest
+from d1_project_pitch.src.zoo_animal_registry import AnimalRegistry, find_animal, replace_animal, find_animals_matching
+from d1_project_pitch.src.zoo_animal_management import add_new_animal, is_duplicate_animal_id
+from d1_project_pitch.src.zoo_health_tracking import record_health_check
+
+class TestAnimalRegistry(unittest.TestCase):
+    """
+    Test suite for the indexed animal registry
+    """
+
+    def setUp(self):
+        self.registry = AnimalRegistry([
+            {"animal_id": "LION001", "name": "Leo", "species": "Lion"},
+            {"animal_id": "ZEBRA001", "name": "Stripes", "species": "Zebra"}
+        ])
+
+    def test_behaves_like_a_list(self):
+        """
+        Test that the registry still iterates and indexes like the old list
+        """
+        self.assertIsInstance(self.registry, list)
+        self.assertEqual([animal["name"] for animal in self.registry], ["Leo", "Stripes"])
+        self.assertEqual(self.registry[1]["animal_id"], "ZEBRA001")
+
+    def test_get_put_and_replace(self):
+        """
+        Test lookups and updates by animal ID
+        """
+        self.assertEqual(self.registry.get("ZEBRA001")["name"], "Stripes")
+        self.assertIsNone(self.registry.get("WOLF001"))
+
+        self.assertTrue(self.registry.replace({"animal_id": "LION001", "name": "Leo II", "species": "Lion"}))
+        self.assertFalse(self.registry.replace({"animal_id": "WOLF001", "name": "Fang", "species": "Wolf"}))
+
+        self.registry.put({"animal_id": "WOLF001", "name": "Fang", "species": "Wolf"})
+
+        self.assertEqual([animal["name"] for animal in self.registry], ["Leo II", "Stripes", "Fang"])
+        self.assertEqual(self.registry.get_version("LION001"), 1)
+
+    def test_index_follows_removals(self):
+        """
+        Test that removing an animal keeps later lookups correct
+        """
+        self.registry.pop(0)
+
+        self.assertFalse(self.registry.has_animal("LION001"))
+        self.assertEqual(self.registry.get("ZEBRA001")["name"], "Stripes")
+
+    def test_index_follows_reordering(self):
+        """
+        Test that sorting and reversing keep lookups and replacements on the right animal
+        """
+        self.registry.sort(key=lambda animal: animal["species"], reverse=True)
+
+        self.assertEqual(self.registry.get("ZEBRA001")["name"], "Stripes")
+        self.assertTrue(self.registry.replace({"animal_id": "LION001", "name": "Leo II", "species": "Lion"}))
+        self.assertEqual([animal["name"] for animal in self.registry], ["Stripes", "Leo II"])
+
+        self.registry.reverse()
+        self.assertEqual(self.registry.get("LION001")["name"], "Leo II")
+        self.assertEqual(self.registry[self.registry.positions["LION001"]]["animal_id"], "LION001")
+
+    def test_in_place_add_and_repeat(self):
+        """
+        Test that += indexes and tracks the new animals and *= keeps the index consistent
+        """
+        self.registry.checkpoint()
+        self.registry += [{"animal_id": "WOLF001", "name": "Fang", "species": "Wolf"}]
+
+        self.assertIsInstance(self.registry, AnimalRegistry)
+        self.assertTrue(self.registry.has_animal("WOLF001"))
+        self.assertEqual(self.registry.get("WOLF001")["name"], "Fang")
+        self.assertEqual(self.registry.find_animals(species="Wolf")[0]["name"], "Fang")
+        self.assertEqual([animal["animal_id"] for animal in self.registry.get_changed_animals()], ["WOLF001"])
+
+        self.registry *= 0
+        self.assertEqual(len(self.registry), 0)
+        self.assertFalse(self.registry.has_animal("LION001"))
+
+    def test_helpers_work_with_plain_lists(self):
+        """
+        Test that the helpers still accept a plain list of animals
+        """
+        animals = [{"animal_id": "LION001", "name": "Leo", "species": "Lion"}]
+
+        self.assertTrue(replace_animal(animals, {"animal_id": "LION001", "name": "Leo II", "species": "Lion"}))
+        self.assertEqual(find_animal("LION001", animals)["name"], "Leo II")
+
+    def test_duplicate_check_uses_registry(self):
+        """
+        Integration testing: duplicate IDs are caught through the registry index
+        """
+        new_animal = add_new_animal("WOLF001", "Fang", "Wolf", 3, self.registry)
+        self.registry.append(new_animal)
+
+        self.assertTrue(is_duplicate_animal_id("WOLF001", self.registry))
+        self.assertIsNone(add_new_animal("WOLF001", "Fang", "Wolf", 3, self.registry))
+
+class TestRegistryIndexes(unittest.TestCase):
+    """
+    Test suite for the secondary indexes on the registry
+    """
+
+    def setUp(self):
+        self.registry = AnimalRegistry([
+            add_new_animal("LION001", "Leo", "Lion", 5),
+            add_new_animal("TIGER001", "Raja", "Tiger", 6),
+            add_new_animal("ZEBRA001", "Stripes", "Zebra", 4)
+        ])
+
+    def test_query_by_traits(self):
+        """
+        Test finding animals by one or more traits
+        """
+        carnivores = self.registry.find_animals(diet="carnivore")
+        self.assertEqual([animal["animal_id"] for animal in carnivores], ["LION001", "TIGER001"])
+
+        self.assertEqual(self.registry.count_animals(diet="carnivore", habitat_type="savannah"), 1)
+        self.assertEqual(self.registry.find_animals(species="Wolf"), [])
+
+    def test_health_status_index_follows_health_checks(self):
+        """
+        Integration testing: recording a health check moves the animal between status groups
+        """
+        self.assertEqual(self.registry.count_animals(health_status="unknown"), 3)
+
+        self.registry.replace(record_health_check(self.registry.get("LION001"),
+                              {"weight_kg": 200.0, "temperature_c": 38.5, "heart_rate": 55}))
+
+        healthy_carnivores = self.registry.find_animals(health_status="healthy", diet="carnivore")
+        self.assertEqual([animal["animal_id"] for animal in healthy_carnivores], ["LION001"])
+        self.assertEqual(self.registry.get_health_status("LION001"), "healthy")
+        self.assertEqual(self.registry.count_animals(health_status="unknown"), 2)
+
+    def test_removed_animals_leave_indexes(self):
+        """
+        Test that a removed animal no longer matches any query
+        """
+        self.registry.remove(self.registry.get("ZEBRA001"))
+
+        self.assertEqual(self.registry.find_animals(diet="herbivore"), [])
+
+    def test_plain_list_fallback(self):
+        """
+        Test the same query over a plain list of animals
+        """
+        matches = find_animals_matching(list(self.registry), diet="carnivore", social_needs="solitary")
+        self.assertEqual([animal["animal_id"] for animal in matches], ["TIGER001"])
@@ -1,5 +1,8 @@
 import unittest 
-from d1_project_pitch.src.zoo_business_logic import is_predator, have_compatible_diets, have_compatible_habitats, check_habitat_compatibility, have_compatible_temperaments, have_compatible_social_needs
+from d1_project_pitch.src.zoo_business_logic import is_predator, have_compatible_diets, have_compatible_habitats, check_habitat_compatibility, have_compatible_temperaments, have_compatible_social_needs, \
+    get_compatibility, get_compatibility_matrix, get_incompatibility, get_trait_profile, INCOMPATIBLE_DIETS, COMPATIBLE
+from d1_project_pitch.src.zoo_species_data import SPECIES_HEALTH_BASELINES, update_species_baseline
+from unittest import mock
 
 
 class TestAnimalCreation(unittest.TestCase):
@@ -190,3 +193,61 @@ class TestAnimalCreation(unittest.TestCase):
             }
         
         self.assertTrue(have_compatible_social_needs(animal1, animal2))
+
+
+class TestCompatibilityMatrix(unittest.TestCase):
+    """
+    Test suite for the precomputed species compatibility matrix
+    """
+
+    def test_matrix_matches_pairwise_checks(self):
+        """
+        Test that every catalog species pair gets the same answer as the pairwise checks
+        """
+        matrix = get_compatibility_matrix()
+
+        for species1, data1 in SPECIES_HEALTH_BASELINES.items():
+            for species2, data2 in SPECIES_HEALTH_BASELINES.items():
+                self.assertEqual(matrix.get_species_reason_code(species1, species2),
+                                 get_incompatibility(get_trait_profile(data1), get_trait_profile(data2)))
+
+        self.assertEqual(matrix.get_species_reason_code("Lion", "Zebra"), INCOMPATIBLE_DIETS)
+        self.assertEqual(matrix.get_species_reason_code("Lion", "Lion"), COMPATIBLE)
+        self.assertIsNone(matrix.get_species_reason_code("Lion", "Unicorn"))
+
+    def test_quiet_api_returns_reason(self):
+        """
+        Test that the quiet check gives a reason and prints nothing
+        """
+        lion = {"species": "Lion", "diet": "carnivore", "habitat_type": "savannah"}
+        zebra = {"species": "Zebra", "diet": "herbivore", "habitat_type": "savannah"}
+
+        with mock.patch('builtins.print') as mock_print:
+            self.assertEqual(get_compatibility(lion, zebra), (False, "Animals have incompatible diets."))
+            self.assertEqual(get_compatibility(lion, lion), (True, "Animals are compatible!"))
+            mock_print.assert_not_called()
+
+        with mock.patch('builtins.print') as mock_print:
+            self.assertFalse(check_habitat_compatibility(lion, zebra))
+            mock_print.assert_called_with("Animals have incompatible diets.")
+
+    def test_other_diets_are_incompatible(self):
+        """
+        Test that diets that are neither the same nor carnivore and herbivore are not compatible
+        """
+        self.assertFalse(get_compatibility({"diet": "omnivore"}, {"diet": "herbivore"})[0])
+
+    def test_rebuilt_when_baselines_change(self):
+        """
+        Test that changing a species baseline rebuilds the matrix
+        """
+        matrix = get_compatibility_matrix()
+        self.assertIs(get_compatibility_matrix(), matrix)
+
+        temperament = SPECIES_HEALTH_BASELINES["Koala"].get("temperament")
+        try:
+            update_species_baseline("Koala", temperament="grumpy")
+            self.assertIsNot(get_compatibility_matrix(), matrix)
+        finally:
+            update_species_baseline("Koala", temperament=temperament)
+
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from d1_project_pitch.src.zoo_change_tracking import TrackedAnimalList
+from d1_project_pitch.src.zoo_file_management import save_animals_to_file, save_changed_animals
+from d1_project_pitch.src.zoo_sqlite_storage import load_animals_from_database
+from d1_project_pitch.src.zoo_health_tracking import record_health_check
+
+class TestChangeTracking(unittest.TestCase):
+    """
+    Test suite for dirty tracking and incremental saves
+    """
+
+    def setUp(self):
+        self.animals = TrackedAnimalList([
+            {"animal_id": f"ZEBRA{i:03d}", "name": "Stripes", "species": "Zebra", "health_records": []}
+            for i in range(100)
+        ])
+
+    def test_loaded_animals_start_clean(self):
+        """
+        Test that nothing is dirty straight after loading
+        """
+        self.assertFalse(self.animals.has_changes())
+        self.assertEqual(self.animals.get_version("ZEBRA000"), 0)
+
+    def test_swapping_updated_animal_marks_it_dirty(self):
+        """
+        Test that the UI pattern animals[i] = updated_animal is tracked
+        """
+        updated = record_health_check(self.animals[5], {"weight_kg": 300})
+        self.animals[5] = updated
+
+        self.assertEqual(self.animals.get_version("ZEBRA005"), 1)
+        self.assertEqual(self.animals.get_changed_animals(), [updated])
+
+        self.animals.checkpoint()
+        self.assertFalse(self.animals.has_changes())
+
+    def test_removed_animals_are_tracked(self):
+        """
+        Test that removing an animal records its ID
+        """
+        self.animals.pop(0)
+
+        self.assertEqual(self.animals.get_removed_ids(), {"ZEBRA000"})
+        self.assertIsNone(self.animals.get_version("ZEBRA000"))
+
+    def test_incremental_database_save_writes_only_changed_animals(self):
+        """
+        Integration testing: only the changed animals are written after the first save
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database = os.path.join(temp_dir, "zoo_data.db")
+            self.assertTrue(save_animals_to_file(list(self.animals), database))
+            self.animals.checkpoint()
+
+            self.animals[3] = record_health_check(self.animals[3], {"weight_kg": 310})
+            self.animals.append({"animal_id": "LION001", "name": "Leo", "species": "Lion"})
+            self.animals.remove(self.animals[0])
+
+            self.assertTrue(save_changed_animals(self.animals, database))
+            self.assertFalse(self.animals.has_changes())
+
+            loaded = load_animals_from_database(database)
+            self.assertEqual(loaded, [{**animal, "health_records": animal.get("health_records", []),
+                                       "current_medications": [], "feeding_history": []} for animal in self.animals])
+
+    def test_in_place_operators_and_sort_are_tracked(self):
+        """
+        Test that += and *= mark the new animals and sorting marks the list reordered
+        """
+        self.animals += [{"animal_id": "LION001", "name": "Leo", "species": "Lion"}]
+        self.assertEqual([animal["animal_id"] for animal in self.animals.get_changed_animals()], ["LION001"])
+
+        self.animals.checkpoint()
+        self.animals.sort(key=lambda animal: animal["animal_id"], reverse=True)
+        self.assertTrue(self.animals.has_changes())
+        self.assertTrue(self.animals.reordered)
+
+        self.animals *= 0
+        self.assertEqual(len(self.animals.get_removed_ids()), 101)
+
+    def test_incremental_save_writes_only_changed_occupancy(self):
+        """
+        Integration testing: a habitat move is saved without rewriting the other habitat rows
+        """
+        habitats = {"savannah": {"name": "Savannah", "capacity": 200,
+                                 "current_animals": [animal["animal_id"] for animal in self.animals[:50]]}}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database = os.path.join(temp_dir, "zoo_data.db")
+            self.assertTrue(save_animals_to_file(list(self.animals), database, habitats))
+            self.animals.checkpoint()
+
+            habitats["savannah"]["current_animals"].append("ZEBRA060")
+            self.animals.mark_moved("ZEBRA060")
+
+            statements = []
+            connect = sqlite3.connect
+            def traced_connect(*args, **kwargs):
+                connection = connect(*args, **kwargs)
+                connection.set_trace_callback(statements.append)
+                return connection
+
+            with mock.patch("sqlite3.connect", traced_connect):
+                self.assertTrue(save_changed_animals(self.animals, database, habitats))
+
+            self.assertFalse(any("habitat_occupancy" in statement and "ZEBRA000" in statement for statement in statements))
+
+            loaded_habitats = {"savannah": {"current_animals": []}}
+            load_animals_from_database(database, loaded_habitats)
+            self.assertEqual(sorted(loaded_habitats["savannah"]["current_animals"]),
+                             sorted(habitats["savannah"]["current_animals"]))
@@ -0,0 +1,137 @@
+import unittest
+from d1_project_pitch.src.zoo_feeding_compliance import check_feeding_compliance, merge_feedings
+from d1_project_pitch.src.zoo_feeding_log import FeedingLog
+
+def feeding(timestamp, amount_kg, keeper="Sam"):
+    return {"time": timestamp[11:16], "amount_kg": amount_kg, "food_type": "meat", "keeper": keeper, "timestamp": timestamp}
+
+class TestFeedingCompliance(unittest.TestCase):
+    """
+    Test suite for checking feedings against the schedule
+    """
+
+    def setUp(self):
+        #a 200kg carnivore is planned 8kg a day, 4kg at 08:00 and 4kg at 17:00
+        self.lion = {"animal_id": "LION001", "diet": "carnivore", "weight_kg": 200, "feeding_history": [
+            feeding("2025-01-01T07:50:00", 4.0),
+            feeding("2025-01-01T17:45:00", 4.1, keeper="Alex"),
+            feeding("2025-01-01T18:00:00", 2.0, keeper="Alex"),
+            feeding("2025-01-02T08:05:00", 3.0),
+            feeding("2025-01-03T08:00:00", 4.0)
+        ]}
+        self.report = check_feeding_compliance([self.lion], "2025-01-01T00:00:00", "2025-01-02T23:59:59")
+
+    def test_issue_counts(self):
+        """
+        Test that each kind of issue is found
+        """
+        animal_report = self.report["animals"]["LION001"]
+
+        self.assertEqual(animal_report["planned"], 4)
+        self.assertEqual(animal_report["counts"], {"missed": 1, "late": 1, "duplicate": 1, "under": 1, "over": 0, "unplanned": 0})
+        self.assertEqual(self.report["totals"]["planned"], 4)
+
+    def test_issue_details(self):
+        """
+        Test what each issue records
+        """
+        issues = {issue["type"]: issue for issue in self.report["animals"]["LION001"]["issues"]}
+
+        self.assertEqual(issues["late"]["planned_time"], "2025-01-01T17:00:00")
+        self.assertEqual(issues["late"]["time"], "2025-01-01T17:45:00")
+        self.assertEqual(issues["duplicate"]["amount_kg"], 2.0)
+        self.assertEqual(issues["under"]["planned_kg"], 4.0)
+        self.assertEqual(issues["missed"]["planned_time"], "2025-01-02T17:00:00")
+        self.assertIsNone(issues["missed"]["keeper"])
+
+    def test_per_keeper_counts(self):
+        """
+        Test that issues are put against the keeper who did the feeding
+        """
+        self.assertEqual(self.report["keepers"]["Alex"]["late"], 1)
+        self.assertEqual(self.report["keepers"]["Alex"]["duplicate"], 1)
+        self.assertEqual(self.report["keepers"]["Sam"]["under"], 1)
+
+    def test_date_range(self):
+        """
+        Test that only the feedings in the range are checked
+        """
+        report = check_feeding_compliance([self.lion], "2025-01-03T00:00:00", "2025-01-03T12:00:00")
+
+        self.assertEqual(report["animals"]["LION001"]["planned"], 1)
+        self.assertEqual(report["totals"]["missed"] + report["totals"]["late"], 0)
+
+    def test_over_quantity(self):
+        """
+        Test that feeding too much is reported
+        """
+        issues = merge_feedings("LION001", [(0, 4.0)], iter([(0, {"amount_kg": 6.0})]), 0, 0, 0.1)
+
+        self.assertEqual([issue["type"] for issue in issues], ["over"])
+
+    def test_unknown_diet_has_no_plan(self):
+        """
+        Test that animals without a feeding plan have nothing planned
+        """
+        report = check_feeding_compliance([{"animal_id": "SNAKE001", "diet": "unknown"}],
+                                          "2025-01-01T00:00:00", "2025-01-02T00:00:00")
+
+        self.assertEqual(report["animals"]["SNAKE001"]["planned"], 0)
+        self.assertEqual(report["animals"]["SNAKE001"]["issues"], [])
+
+    def test_weight_from_health_records(self):
+        """
+        Test that an animal without weight_kg is planned from its latest weighed health check
+        """
+        del self.lion["weight_kg"]
+        self.lion["health_records"] = [{"date": "2024-12-01T00:00:00", "data": {"weight_kg": 100}},
+                                       {"date": "2024-12-20T00:00:00", "data": {"weight_kg": 200}},
+                                       {"date": "2024-12-30T00:00:00", "data": {"temperature_c": 38.0}}]
+
+        report = check_feeding_compliance([self.lion], "2025-01-01T00:00:00", "2025-01-02T23:59:59")
+        self.assertEqual(report["animals"]["LION001"], self.report["animals"]["LION001"])
+
+        del self.lion["health_records"]
+        report = check_feeding_compliance([self.lion], "2025-01-01T00:00:00", "2025-01-02T23:59:59")
+        self.assertEqual(report["animals"]["LION001"]["counts"]["under"], 0)
+        self.assertEqual(report["animals"]["LION001"]["planned"], 4)
+
+    def test_unsorted_history(self):
+        """
+        Test that feedings recorded out of order are still all matched to their slots
+        """
+        self.lion["feeding_history"].reverse()
+
+        report = check_feeding_compliance([self.lion], "2025-01-01T00:00:00", "2025-01-02T23:59:59")
+
+        self.assertEqual(report["animals"]["LION001"], self.report["animals"]["LION001"])
+
+    def test_feeding_log_is_scanned(self):
+        """
+        Test that a compact feeding log gives the same report as the list of feeding dicts
+        """
+        self.lion["feeding_history"] = FeedingLog(reversed(self.lion["feeding_history"]))
+
+        report = check_feeding_compliance([self.lion], "2025-01-01T00:00:00", "2025-01-02T23:59:59")
+
+        self.assertEqual(report["animals"]["LION001"], self.report["animals"]["LION001"])
+        self.assertEqual(report["keepers"], self.report["keepers"])
+
+    def test_unplanned_feedings(self):
+        """
+        Test that feedings before the first slot's window, or with no plan at all, are reported as unplanned
+        """
+        self.lion["feeding_history"].insert(0, feeding("2025-01-01T05:00:00", 1.0, keeper="Alex"))
+        report = check_feeding_compliance([self.lion], "2025-01-01T00:00:00", "2025-01-02T23:59:59")
+
+        unplanned = [issue for issue in report["animals"]["LION001"]["issues"] if issue["type"] == "unplanned"]
+        self.assertEqual([issue["time"] for issue in unplanned], ["2025-01-01T05:00:00"])
+        self.assertIsNone(unplanned[0]["planned_time"])
+        self.assertEqual(report["keepers"]["Alex"]["unplanned"], 1)
+
+        snake = {"animal_id": "SNAKE001", "diet": "unknown", "feeding_history": [feeding("2025-01-01T09:00:00", 0.5)]}
+        report = check_feeding_compliance([snake], "2025-01-01T00:00:00", "2025-01-02T00:00:00")
+        self.assertEqual(report["animals"]["SNAKE001"]["counts"]["unplanned"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import datetime
+import unittest
+from unittest import mock
+from d1_project_pitch.src import zoo_feeding_forecast
+from d1_project_pitch.src.zoo_feeding_forecast import calculate_food_totals, generate_feeding_forecast
+from d1_project_pitch.src.zoo_feeding import calculate_feeding_schedule, generate_daily_feeding_report
+from d1_project_pitch.src.zoo_feeding_compliance import check_feeding_compliance
+
+class TestFeedingForecast(unittest.TestCase):
+    """
+    Test suite for the whole zoo feeding forecast
+    """
+
+    def setUp(self):
+        self.animals = [
+            {"animal_id": "LION001", "species": "Lion", "diet": "carnivore", "weight_kg": 180},
+            {"animal_id": "LION002", "species": "Lion", "diet": "carnivore", "weight_kg": 200, "health_status": "critical"},
+            {"animal_id": "ZEBRA001", "species": "Zebra", "diet": "herbivore", "weight_kg": 300,
+             "health_status": "needs attention"},
+            {"animal_id": "SNAKE001", "species": "Snake", "diet": "omnivore", "weight_kg": 10}
+        ]
+        self.habitats = {
+            "savannah": {"current_animals": ["LION001", "ZEBRA001"]},
+            "forest": {"current_animals": []}
+        }
+
+    def test_daily_report_covers_every_animal(self):
+        """
+        Test that the daily report no longer stops after the first animal
+        """
+        report = generate_daily_feeding_report(self.animals)
+
+        self.assertEqual(len(report["feeding_schedule"]), 4)
+        self.assertAlmostEqual(report["total_meat_kg"], 7.2 + 4.8)
+        self.assertAlmostEqual(report["total_vegetation_kg"], 7.2)
+
+    def test_totals_match_schedules(self):
+        """
+        Equivalence testing: the totals match adding up calculate_feeding_schedule
+        """
+        expected = {"unknown": 0.0, "meat": 0.0, "vegetation": 0.0}
+        for animal in self.animals:
+            schedule = calculate_feeding_schedule(animal)
+            expected[schedule["food_type"]] += schedule["daily_amount_kg"]
+
+        totals = calculate_food_totals(self.animals)
+        for food_type, total in expected.items():
+            self.assertAlmostEqual(totals[food_type], total)
+
+    def test_weight_and_status_from_health_checks(self):
+        """
+        Test that saved records, which only have weights and vitals in their health checks, are planned the same everywhere
+        """
+        feedings = [{"time": "08:00", "amount_kg": 0.5, "food_type": "meat", "keeper": "Sam", "timestamp": "2025-01-03T08:00:00"}]
+        tiger = {"animal_id": "TIGER001", "species": "Tiger", "diet": "carnivore", "feeding_history": feedings, "health_records": [
+            {"date": "2025-01-01T09:00:00", "data": {"weight_kg": 120.0}},
+            {"date": "2025-01-02T09:00:00", "data": {"weight_kg": 67.0, "temperature_c": 43.0, "heart_rate": 39}}
+        ]}
+
+        #67kg at 4% a day, cut to 60% for a critical animal, over two feedings
+        self.assertAlmostEqual(calculate_food_totals([tiger])["meat"], 1.61)
+        self.assertAlmostEqual(generate_daily_feeding_report([tiger])["total_meat_kg"], 1.61)
+
+        report = check_feeding_compliance([tiger], "2025-01-03T00:00:00", "2025-01-03T12:00:00")
+        self.assertEqual(report["animals"]["TIGER001"]["issues"][0]["planned_kg"], 0.81)
+
+    @unittest.skipIf(zoo_feeding_forecast.np is None, "NumPy is not installed")
+    def test_forecast(self):
+        """
+        Test that the forecast adds up per day, habitat and food type
+        """
+        forecast = generate_feeding_forecast(self.animals, self.habitats, days=3, start_date=datetime.date(2025, 1, 30),
+                                             daily_factors=[1.0, 1.0, 0.5])
+
+        self.assertEqual(forecast["dates"], ["2025-01-30", "2025-01-31", "2025-02-01"])
+        self.assertEqual(forecast["by_day"].shape, (3, 3))
+        self.assertAlmostEqual(forecast["by_day"][2][1], 6.0)
+        self.assertAlmostEqual(forecast["totals"]["meat"], 30.0)
+        self.assertAlmostEqual(forecast["by_habitat"]["savannah"]["meat"], 18.0)
+        self.assertAlmostEqual(forecast["by_habitat"]["savannah"]["vegetation"], 18.0)
+        self.assertAlmostEqual(forecast["by_habitat"]["unassigned"]["meat"], 12.0)
+        self.assertEqual(forecast["by_habitat"]["forest"]["meat"], 0.0)
+        self.assertAlmostEqual(forecast["by_habitat_day"][0].sum(), 19.2)
+
+    @unittest.skipIf(zoo_feeding_forecast.np is None, "NumPy is not installed")
+    def test_forecast_needs_one_factor_per_day(self):
+        """
+        Test that a wrong number of daily factors is refused
+        """
+        with mock.patch('builtins.print'):
+            self.assertIsNone(generate_feeding_forecast(self.animals, days=3, daily_factors=[1.0]))
+
+if __name__ == '__main__':
+    unittest.main()
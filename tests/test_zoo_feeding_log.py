@@ -0,0 +1,126 @@
+import json
+import unittest
+from d1_project_pitch.src.zoo_feeding_log import FeedingLog, FeedingRow
+from d1_project_pitch.src.zoo_animal_record import Animal, animals_to_dicts, to_json_value
+from d1_project_pitch.src.zoo_feeding import record_feeding
+from d1_project_pitch.src.zoo_history_index import build_history_index
+
+FEEDINGS = [
+    {"time": "08:00", "food_type": "meat", "amount_kg": 4.0, "keeper": "Sam", "timestamp": "2024-03-01T08:02:11.123456"},
+    {"time": "16:00", "food_type": "meat", "amount_kg": 3.5, "keeper": "Ana", "timestamp": "2024-03-01T16:00:00"},
+    {"amount_kg": 2, "time": "20:00", "notes": "ate slowly", "timestamp": "2024-03-01 20:05:00"}
+]
+
+class TestFeedingLog(unittest.TestCase):
+    """
+    Test suite for the compact feeding history
+    """
+
+    def test_round_trip_is_lossless(self):
+        """
+        Test that feedings come back with the same keys, order, values and types
+        """
+        log = FeedingLog.from_records(FEEDINGS)
+
+        self.assertEqual(log, FEEDINGS)
+        self.assertEqual(log.to_list(), FEEDINGS)
+        self.assertEqual([list(row) for row in log], [list(feeding) for feeding in FEEDINGS])
+        self.assertIs(type(log[2]["amount_kg"]), int)
+        self.assertNotIn("amount_kg", log.columns.extras[2])
+        self.assertEqual(json.loads(json.dumps(log, default=to_json_value)), FEEDINGS)
+
+    def test_strings_are_dictionary_encoded(self):
+        """
+        Test that repeated keeper and food type names are stored once
+        """
+        log = FeedingLog([{"food_type": "meat", "keeper": "Sam"}] * 50)
+
+        self.assertEqual(log.columns.strings, ["meat", "Sam"])
+        self.assertEqual(len(log.columns.layout_keys), 1)
+        self.assertEqual(log.columns.extras, {})
+
+    def test_rows_behave_like_dicts(self):
+        """
+        Test that a feeding row can be read like the feeding dict it came from
+        """
+        row = FeedingLog(FEEDINGS)[-1]
+
+        self.assertIsInstance(row, FeedingRow)
+        self.assertEqual(row.get("notes"), "ate slowly")
+        self.assertIsNone(row.get("keeper"))
+        self.assertNotIn("keeper", row)
+        with self.assertRaises(KeyError):
+            row["food_type"]
+
+    def test_versions_are_isolated(self):
+        """
+        Test that appended versions share arrays and older versions stay as they were
+        """
+        first = FeedingLog(FEEDINGS[:1])
+        second = first.appended(FEEDINGS[1])
+        branch = first.appended(FEEDINGS[2])
+
+        self.assertEqual(first, FEEDINGS[:1])
+        self.assertEqual(second, FEEDINGS[:2])
+        self.assertEqual(branch, [FEEDINGS[0], FEEDINGS[2]])
+        self.assertTrue(first.shares_storage_with(second))
+        self.assertFalse(branch.shares_storage_with(second))
+
+    def test_scan(self):
+        """
+        Test that scan reads the columns without making dicts
+        """
+        rows = list(FeedingLog(FEEDINGS).scan())
+
+        self.assertEqual(rows[1][1:], (3.5, "meat", "Ana"))
+        self.assertEqual(rows[0][0], FeedingLog(FEEDINGS)[0].get_timestamp())
+        self.assertEqual(rows[2], (None, 2, None, None))
+        self.assertIs(type(rows[2][1]), int)
+
+    def test_dict_animals_keep_lists(self):
+        """
+        Test that recording a feeding on an animal dict keeps a plain list the JSON module can write
+        """
+        animal = {"animal_id": "LION001", "name": "Leo", "species": "Lion", "feeding_history": list(FEEDINGS)}
+
+        updated = record_feeding(animal, {"time": "08:00", "amount_kg": 5, "food_type": "meat", "keeper": "Sam"})
+
+        self.assertEqual(animal["feeding_history"], FEEDINGS)
+        self.assertIsInstance(updated["feeding_history"], list)
+        self.assertEqual(json.loads(json.dumps(updated))["feeding_history"][3]["amount_kg"], 5)
+
+class TestFeedingLogRecords(unittest.TestCase):
+    """
+    Test suite for feeding logs in compact animal records
+    """
+
+    def test_record_feeding_uses_log(self):
+        """
+        Test that recording a feeding on a compact record keeps a feeding log
+        """
+        animal = Animal("LION001", "Leo", "Lion", 5, feeding_history=list(FEEDINGS))
+        updated = record_feeding(animal, {"time": "08:00", "food_type": "meat", "amount_kg": 4.0})
+        newer = record_feeding(updated, {"time": "16:00", "food_type": "meat", "amount_kg": 3.0})
+
+        self.assertIsInstance(newer["feeding_history"], FeedingLog)
+        self.assertTrue(newer["feeding_history"].shares_storage_with(updated["feeding_history"]))
+        self.assertEqual(len(animal["feeding_history"]), 3)
+        self.assertEqual(len(updated["feeding_history"]), 4)
+        self.assertEqual(animals_to_dicts([newer])[0]["feeding_history"][:3], FEEDINGS)
+        self.assertIsInstance(animals_to_dicts([newer])[0]["feeding_history"][3], dict)
+
+    def test_history_index_follows_new_versions(self):
+        """
+        Test that the time index keeps working over new versions of a feeding log
+        """
+        updated = record_feeding(Animal("LION001", "Leo", "Lion", 5), {"amount_kg": 4.0})
+        index = build_history_index([updated])
+        timeline = index.get_timeline(updated, "feeding_history")
+
+        newer = record_feeding(updated, {"amount_kg": 3.0})
+
+        self.assertEqual(len(index.get_feedings_between(newer)), 2)
+        self.assertIs(index.get_timeline(newer, "feeding_history"), timeline)
+
+if __name__ == '__main__':
+    unittest.main()
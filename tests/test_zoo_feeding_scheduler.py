@@ -0,0 +1,101 @@
+import datetime
+import unittest
+from d1_project_pitch.src.zoo_feeding_scheduler import FeedingScheduler, get_next_feeding, parse_feeding_time
+from d1_project_pitch.src.zoo_feeding_compliance import check_feeding_compliance
+
+START = datetime.datetime(2025, 1, 1, 7, 0)
+
+def at(hour, day=1):
+    return datetime.datetime(2025, 1, day, hour, 0)
+
+class TestFeedingScheduler(unittest.TestCase):
+    """
+    Test suite for the zoo-wide feeding scheduler
+    """
+
+    def setUp(self):
+        self.animals = [
+            {"animal_id": "LION001", "diet": "carnivore", "weight_kg": 200},
+            {"animal_id": "LION002", "diet": "carnivore", "weight_kg": 150},
+            {"animal_id": "ZEBRA001", "diet": "herbivore", "weight_kg": 300},
+            {"animal_id": "SNAKE001", "diet": "unknown", "weight_kg": 10}
+        ]
+        self.habitats = {
+            "savannah": {"current_animals": ["LION001", "ZEBRA001"]},
+            "forest": {"current_animals": ["LION002"]}
+        }
+        self.scheduler = FeedingScheduler(self.animals, self.habitats, start=START)
+
+    def test_next_feeding(self):
+        """
+        Test that the next feeding rolls over to the next day
+        """
+        times = [parse_feeding_time("08:00"), parse_feeding_time("17:00")]
+
+        self.assertEqual(get_next_feeding(times, at(8)), at(17))
+        self.assertEqual(get_next_feeding(times, at(18)), at(8, day=2))
+
+    def test_events_in_time_order(self):
+        """
+        Test that feedings come out in time order across animals
+        """
+        events = [self.scheduler.pop_next() for _ in range(6)]
+
+        self.assertEqual(len(self.scheduler), 3)
+        self.assertEqual([event["time"] for event in events], [at(8), at(8), at(12), at(17), at(17), at(18)])
+        self.assertEqual(events[2], {"time": at(12), "animal_id": "ZEBRA001", "habitat": "savannah",
+                                     "food_type": "vegetation", "amount_kg": 3.0})
+        self.assertEqual(self.scheduler.pop_next()["time"], at(6, day=2))
+
+    def test_batches_by_habitat(self):
+        """
+        Test that simultaneous feedings are grouped by habitat
+        """
+        batches = self.scheduler.pop_batches()
+
+        self.assertEqual([(batch["habitat"], batch["animal_ids"]) for batch in batches],
+                         [("forest", ["LION002"]), ("savannah", ["LION001"])])
+        self.assertEqual(batches[1]["food_kg"], {"meat": 4.0})
+
+    def test_reschedule(self):
+        """
+        Test that a changed animal replaces its old entry
+        """
+        self.scheduler.reschedule({"animal_id": "LION001", "diet": "herbivore", "weight_kg": 200})
+
+        events = [self.scheduler.pop_next() for _ in range(3)]
+
+        self.assertEqual([(event["animal_id"], event["time"]) for event in events],
+                         [("LION002", at(8)), ("ZEBRA001", at(12)), ("LION001", at(12))])
+        self.assertEqual(events[2]["food_type"], "vegetation")
+
+    def test_remove_and_compact(self):
+        """
+        Test that removed animals stop coming out and stale entries get cleared
+        """
+        self.assertTrue(self.scheduler.remove_animal("LION002"))
+        self.assertFalse(self.scheduler.remove_animal("LION002"))
+
+        for _ in range(50):
+            self.scheduler.reschedule(self.animals[0])
+        self.assertLessEqual(len(self.scheduler.heap), 2 * len(self.scheduler) + 16)
+
+        timeline = self.scheduler.get_timeline(at(18))
+        self.assertEqual([batch["animal_ids"] for batch in timeline], [["LION001"], ["ZEBRA001"], ["LION001"], ["ZEBRA001"]])
+
+    def test_plan_from_health_checks(self):
+        """
+        Test that a saved record is planned from its latest weighed health check and status, the same as the compliance check
+        """
+        tiger = {"animal_id": "TIGER001", "species": "Tiger", "diet": "carnivore", "health_records": [
+            {"date": "2025-01-01T09:00:00", "data": {"weight_kg": 67.0, "temperature_c": 43.0, "heart_rate": 39}}
+        ], "feeding_history": [{"time": "08:00", "amount_kg": 0.5, "timestamp": "2025-01-01T08:00:00"}]}
+
+        scheduler = FeedingScheduler([tiger], start=START)
+        report = check_feeding_compliance([tiger], "2025-01-01T00:00:00", "2025-01-01T12:00:00")
+
+        self.assertEqual(scheduler.pop_next()["amount_kg"], 0.81)
+        self.assertEqual(report["animals"]["TIGER001"]["issues"][0]["planned_kg"], 0.81)
+
+if __name__ == '__main__':
+    unittest.main()
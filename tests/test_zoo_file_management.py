@@ -1,6 +1,11 @@
+import os
+import json
+import tempfile
 import unittest
 from unittest import mock
-from d1_project_pitch.src.zoo_file_management import save_animals_to_file, load_animals_from_file
+from d1_project_pitch.src.zoo_file_management import save_animals_to_file, load_animals_from_file, iter_animals_from_file
+from d1_project_pitch.src.zoo_health_tracking import calculate_health_statuses
+from d1_project_pitch.src.zoo_animal_record import Animal
 
 class TestFileManagement(unittest.TestCase):
     """
@@ -65,3 +70,67 @@ class TestFileManagement(unittest.TestCase):
         mock_file.assert_called_once_with(filename, "r")
         mock_json_load.assert_called_once_with(mock_file())
 
+class TestStreamingLoader(unittest.TestCase):
+    """
+    Test suite for the streaming animal loader
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "zoo_data.json")
+
+        self.animals = [{
+            "animal_id": f"ZEBRA{i:03d}",
+            "name": "Stripes, [the] {first}",
+            "species": "Zebra",
+            "health_records": [{"date": "2024-01-15T10:00:00", "data": {"weight_kg": 300}}]
+        } for i in range(50)]
+
+        with open(self.filename, 'w') as file:
+            json.dump(self.animals, file, indent=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stream_matches_full_load_with_small_chunks(self):
+        """
+        Boundary testing: records split across tiny chunks decode correctly
+        """
+        for chunk_size in (1, 7, 4096):
+            streamed = list(iter_animals_from_file(self.filename, chunk_size=chunk_size))
+            self.assertEqual(streamed, self.animals)
+
+    def test_first_record_available_before_file_is_read(self):
+        """
+        Test that the first animal is yielded after reading only part of the file
+        """
+        stream = iter_animals_from_file(self.filename, chunk_size=256)
+        first = next(stream)
+
+        self.assertEqual(first["animal_id"], "ZEBRA000")
+        stream.close()
+
+    def test_stream_feeds_health_tracking(self):
+        """
+        Integration testing: health statuses can be calculated straight from the stream
+        """
+        statuses = list(calculate_health_statuses(iter_animals_from_file(self.filename)))
+
+        self.assertEqual(len(statuses), 50)
+        self.assertEqual(statuses[0], ("ZEBRA000", "healthy", "All health indicators normal"))
+
+    def test_stream_matches_loader(self):
+        """
+        Test that streaming a file without a journal gives the same animals as loading it
+        """
+        self.assertEqual(list(iter_animals_from_file(self.filename)), load_animals_from_file(self.filename))
+
+    def test_load_compact(self):
+        """
+        Test that the loader can give compact records
+        """
+        animals = load_animals_from_file(self.filename, compact=True)
+
+        self.assertIsInstance(animals[0], Animal)
+        self.assertEqual(animals, self.animals)
+
@@ -133,6 +133,21 @@ class TestHabitatManagement(unittest.TestCase):
         self.assertIn("Successfully assigned", message) 
         self.assertIn("ZEBRA002", self.habitats["savannah"]["current_animals"])
     
+    def test_assign_incompatible_animal_gives_reason(self):
+        """
+        Test that an animal incompatible with an occupant is refused with the reason
+        """
+        lion = {"animal_id": "LION001", "name": "Leo", "species": "Lion", "diet": "carnivore", "habitat_type": "savannah"}
+        zebra = {"animal_id": "ZEBRA001", "name": "Stripes", "species": "Zebra", "diet": "herbivore", "habitat_type": "savannah"}
+
+        self.habitats["savannah"]["current_animals"].append("LION001")
+
+        success, message = assign_animal_to_habitat(zebra, "savannah", self.habitats, [lion])
+
+        self.assertFalse(success)
+        self.assertEqual(message, "Not compatible with Leo: Animals have incompatible diets.")
+        self.assertNotIn("ZEBRA001", self.habitats["savannah"]["current_animals"])
+
     def test_remove_animal_from_habitat(self):
         """
         Test to remove animal from a habitat
@@ -0,0 +1,84 @@
+import unittest
+from d1_project_pitch.src.zoo_habitat_occupancy import HabitatOccupancy, get_habitat_occupancy
+from d1_project_pitch.src.zoo_habitat_version import mark_habitats_changed
+from d1_project_pitch.src.zoo_habitat_assignment import assign_animal_to_habitat, remove_animal_from_habitat, get_animal_habitat, get_unassigned_animals
+
+class TestHabitatOccupancy(unittest.TestCase):
+    """
+    Test suite for the animal to habitat index
+    """
+
+    def setUp(self):
+        self.habitats = {
+            "savannah": {"name": "Savannah Plains", "capacity": 4, "current_animals": ["ZEBRA001"]},
+            "forest": {"name": "Forest Enclosure", "capacity": 3, "current_animals": ["WOLF001"]}
+        }
+        self.animals = [
+            {"animal_id": "ZEBRA001", "name": "Stripes"},
+            {"animal_id": "WOLF001", "name": "Fang"},
+            {"animal_id": "BEAR001", "name": "Bobby"}
+        ]
+
+    def test_index_built_from_lists(self):
+        """
+        Test that the index matches the habitat lists it was built from
+        """
+        occupancy = HabitatOccupancy(self.habitats)
+
+        self.assertEqual(occupancy.get_habitat("WOLF001"), "forest")
+        self.assertIsNone(occupancy.get_habitat("BEAR001"))
+        self.assertEqual(occupancy.get_members("savannah"), {"ZEBRA001"})
+        self.assertEqual(get_unassigned_animals(self.animals, self.habitats), [self.animals[2]])
+
+    def test_index_follows_assign_and_remove(self):
+        """
+        Test that assigning and removing update the index without rebuilding it
+        """
+        occupancy = get_habitat_occupancy(self.habitats)
+
+        assign_animal_to_habitat(self.animals[2], "forest", self.habitats)
+        self.assertEqual(get_animal_habitat("BEAR001", self.habitats), "forest")
+
+        remove_animal_from_habitat("ZEBRA001", "savannah", self.habitats)
+        self.assertIsNone(get_animal_habitat("ZEBRA001", self.habitats))
+        self.assertEqual(self.habitats["savannah"]["current_animals"], [])
+
+        self.assertIs(get_habitat_occupancy(self.habitats), occupancy)
+        self.assertEqual(occupancy.get_members("forest"), {"WOLF001", "BEAR001"})
+
+    def test_rebuilt_after_marked_edit(self):
+        """
+        Test that a list edited directly is picked up once it is marked as changed, even when its length stays the same
+        """
+        occupancy = get_habitat_occupancy(self.habitats)
+
+        self.habitats["forest"]["current_animals"][0] = "BEAR001"
+        mark_habitats_changed()
+
+        self.assertEqual(get_animal_habitat("BEAR001", self.habitats), "forest")
+        self.assertIsNone(get_animal_habitat("WOLF001", self.habitats))
+        self.assertIsNot(get_habitat_occupancy(self.habitats), occupancy)
+
+    def test_remove_does_not_raise_on_unmarked_edit(self):
+        """
+        Test that removing an animal the index still lists, but the list no longer holds, is refused instead of raising
+        """
+        get_habitat_occupancy(self.habitats)
+        self.habitats["forest"]["current_animals"][0] = "BEAR001"
+
+        self.assertEqual(remove_animal_from_habitat("WOLF001", "forest", self.habitats),
+                         (False, "Animal WOLF001 not found in Forest Enclosure"))
+        self.assertEqual(self.habitats["forest"]["current_animals"], ["BEAR001"])
+
+    def test_animal_in_two_habitats(self):
+        """
+        Test that removing an animal listed twice leaves it in its other habitat
+        """
+        self.habitats["forest"]["current_animals"].append("ZEBRA001")
+
+        self.assertEqual(get_animal_habitat("ZEBRA001", self.habitats), "savannah")
+        remove_animal_from_habitat("ZEBRA001", "savannah", self.habitats)
+        self.assertEqual(get_animal_habitat("ZEBRA001", self.habitats), "forest")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from d1_project_pitch.src.zoo_habitat_placement import solve_placement, apply_placement, max_flow
+from d1_project_pitch.src.zoo_business_logic import get_compatibility
+
+def make_animal(animal_id, species, diet, habitat_type="savannah", temperament="calm", social_needs=None):
+    """
+    Make an animal dict with the traits used for compatibility
+    """
+    return {"animal_id": animal_id, "name": animal_id.title(), "species": species, "diet": diet,
+            "habitat_type": habitat_type, "temperament": temperament, "social_needs": social_needs}
+
+class TestHabitatPlacement(unittest.TestCase):
+    """
+    Test suite for placing many animals at once
+    """
+
+    def setUp(self):
+        self.habitats = {
+            "small": {"name": "Small Paddock", "capacity": 2, "current_animals": [], "compatible_species": ["Lion", "Zebra"]},
+            "large": {"name": "Large Plains", "capacity": 3, "current_animals": [], "compatible_species": ["Lion", "Zebra"]}
+        }
+
+    def test_max_flow(self):
+        """
+        Test the flow on a small graph
+        """
+        graph = {"s": {"a": 3, "b": 2}, "a": {"t": 2, "b": 1}, "b": {"t": 3}, "t": {}}
+        self.assertEqual(max_flow(graph, "s", "t"), 5)
+
+    def test_beats_greedy_order(self):
+        """
+        Test that three zebras and two lions are all placed, where putting the lions in the large habitat strands a zebra
+        """
+        animals = [make_animal("LION001", "Lion", "carnivore"), make_animal("LION002", "Lion", "carnivore")] + \
+                  [make_animal(f"ZEBRA00{i}", "Zebra", "herbivore") for i in range(1, 4)]
+
+        placement = solve_placement(animals, self.habitats, animals)
+
+        self.assertEqual(placement["placed"], 5)
+        self.assertTrue(placement["optimal"])
+        self.assertEqual(placement["assignments"]["LION001"], "small")
+        self.assertEqual(placement["assignments"]["ZEBRA001"], "large")
+
+    def test_placements_are_compatible(self):
+        """
+        Test that every habitat only ends up with animals compatible with each other and its species list
+        """
+        animals = [make_animal(f"LION{i:03d}", "Lion", "carnivore", social_needs="pride") for i in range(3)] + \
+                  [make_animal(f"TIGER{i:03d}", "Lion", "carnivore", social_needs="solitary") for i in range(2)] + \
+                  [make_animal(f"WOLF{i:03d}", "Wolf", "carnivore") for i in range(2)]
+
+        placement = solve_placement(animals, self.habitats, animals)
+        by_habitat = {}
+        for animal in animals:
+            if animal["animal_id"] in placement["assignments"]:
+                by_habitat.setdefault(placement["assignments"][animal["animal_id"]], []).append(animal)
+
+        for habitat_name, members in by_habitat.items():
+            self.assertLessEqual(len(members), self.habitats[habitat_name]["capacity"])
+            for animal in members:
+                self.assertIn(animal["species"], self.habitats[habitat_name]["compatible_species"])
+                for other in members:
+                    self.assertTrue(get_compatibility(animal, other)[0])
+
+        self.assertEqual(placement["placed"], 5)
+        self.assertEqual(placement["unplaced"]["WOLF000"], "No habitat takes Wolf.")
+
+    def test_existing_animals_and_reasons(self):
+        """
+        Test that animals already in a habitat limit what it can take and unplaced animals get a reason
+        """
+        resident = make_animal("LION001", "Lion", "carnivore")
+        self.habitats["small"]["current_animals"].append("LION001")
+        self.habitats["large"]["capacity"] = 1
+        animals = [make_animal("ZEBRA001", "Zebra", "herbivore"), make_animal("ZEBRA002", "Zebra", "herbivore"), resident]
+
+        placement = solve_placement(animals, self.habitats, [resident] + animals)
+
+        self.assertEqual(placement["assignments"], {"ZEBRA001": "large"})
+        self.assertEqual(placement["unplaced"]["ZEBRA002"], "No space left in large.")
+        self.assertEqual(solve_placement(animals[1:2], {"small": self.habitats["small"]}, [resident])["unplaced"]["ZEBRA002"],
+                         "Not compatible with the animals in small.")
+        self.assertEqual(placement["unplaced"]["LION001"], "Already in habitat 'small'.")
+
+    def test_time_limit_keeps_first_answer(self):
+        """
+        Test that a search out of time still gives its first full answer
+        """
+        animals = [make_animal("LION001", "Lion", "carnivore"), make_animal("LION002", "Lion", "carnivore")] + \
+                  [make_animal(f"ZEBRA00{i}", "Zebra", "herbivore") for i in range(1, 4)]
+
+        placement = solve_placement(animals, self.habitats, animals, time_limit=0)
+
+        #the greedy first answer fills the large habitat with the most common type and strands a lion
+        self.assertEqual(placement["placed"], 4)
+        self.assertFalse(placement["optimal"])
+        self.assertEqual(set(placement["habitat_types"]), {"small", "large"})
+
+    def test_unknown_residents_raise(self):
+        """
+        Test that a habitat with animals missing from all_animals is not treated as empty
+        """
+        self.habitats["small"]["current_animals"].append("ZEBRA009")
+        animals = [make_animal("LION001", "Lion", "carnivore")]
+
+        with self.assertRaises(ValueError):
+            solve_placement(animals, self.habitats, animals)
+
+    def test_apply_placement(self):
+        """
+        Test that a placement is applied through the normal assignment checks
+        """
+        animals = [make_animal("ZEBRA001", "Zebra", "herbivore"), make_animal("ZEBRA002", "Zebra", "herbivore")]
+
+        placed, refused = apply_placement(solve_placement(animals, self.habitats, animals), animals, self.habitats, animals)
+
+        self.assertEqual(sorted(placed), ["ZEBRA001", "ZEBRA002"])
+        self.assertEqual(refused, [])
+        self.assertEqual(sorted(self.habitats["large"]["current_animals"] + self.habitats["small"]["current_animals"]),
+                         ["ZEBRA001", "ZEBRA002"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from d1_project_pitch.src.zoo_habitat_traits import build_habitat_traits, get_habitat_traits, clear_habitat_traits
+from d1_project_pitch.src.zoo_habitat_assignment import assign_animal_to_habitat, remove_animal_from_habitat
+from d1_project_pitch.src.zoo_business_logic import get_compatibility
+from d1_project_pitch.src.zoo_animal_management import add_new_animal
+from d1_project_pitch.src.zoo_species_data import SPECIES_HEALTH_BASELINES
+from d1_project_pitch.src.zoo_animal_registry import AnimalRegistry
+from d1_project_pitch.src.zoo_habitat_occupancy import get_habitat_occupancy
+from d1_project_pitch.src.zoo_habitat_version import mark_habitats_changed
+
+class TestHabitatTraits(unittest.TestCase):
+    """
+    Test suite for the per habitat trait totals
+    """
+
+    def setUp(self):
+        clear_habitat_traits()
+        self.habitat = {"name": "Savannah Plains", "capacity": 10, "current_animals": []}
+        self.habitats = {"savannah": self.habitat}
+        self.animals = [add_new_animal(f"{species.upper()}001", species, species, 5) for species in SPECIES_HEALTH_BASELINES]
+
+    def test_admits_matches_pairwise_checks(self):
+        """
+        Test that the totals give the same answer as checking every pair
+        """
+        for occupant in self.animals:
+            traits = build_habitat_traits({"current_animals": [occupant["animal_id"]]}, self.animals)
+            for animal in self.animals:
+                self.assertEqual(traits.admits(animal), get_compatibility(animal, occupant)[0])
+
+    def test_social_classes_clash(self):
+        """
+        Test that a solitary animal can not join a social one
+        """
+        group = {"animal_id": "A", "diet": "herbivore", "social_needs": "herd"}
+        loner = {"animal_id": "B", "diet": "herbivore", "social_needs": "solitary"}
+        other = {"animal_id": "C", "diet": "herbivore"}
+
+        traits = build_habitat_traits({"current_animals": ["A"]}, [group])
+
+        self.assertFalse(traits.admits(loner))
+        self.assertTrue(traits.admits(other))
+        self.assertEqual(traits.get_social_mask(), 2)
+
+    def test_totals_follow_assign_and_remove(self):
+        """
+        Test that assigning and removing keep the totals up to date without rebuilding them
+        """
+        zebra = {"animal_id": "ZEBRA001", "name": "Stripes", "diet": "herbivore", "habitat_type": "savannah"}
+        zebra2 = dict(zebra, animal_id="ZEBRA002", name="Dotty")
+        lion = {"animal_id": "LION001", "name": "Leo", "diet": "carnivore", "habitat_type": "savannah"}
+        animals = [zebra, zebra2, lion]
+
+        self.assertTrue(assign_animal_to_habitat(zebra, "savannah", self.habitats, animals)[0])
+        traits = get_habitat_traits("savannah", self.habitat, animals)
+        self.assertTrue(assign_animal_to_habitat(zebra2, "savannah", self.habitats, animals)[0])
+
+        self.assertIs(get_habitat_traits("savannah", self.habitat, animals), traits)
+        self.assertEqual(traits.diets, {"herbivore": 2})
+        self.assertEqual(assign_animal_to_habitat(lion, "savannah", self.habitats, animals),
+                         (False, "Not compatible with Stripes: Animals have incompatible diets."))
+
+        remove_animal_from_habitat("ZEBRA001", "savannah", self.habitats)
+        remove_animal_from_habitat("ZEBRA002", "savannah", self.habitats)
+
+        self.assertIs(get_habitat_traits("savannah", self.habitat, animals), traits)
+        self.assertEqual(traits.diets, {})
+        self.assertTrue(assign_animal_to_habitat(lion, "savannah", self.habitats, animals)[0])
+
+    def test_rebuilt_after_direct_edit(self):
+        """
+        Test that editing the list of animals directly makes the totals get rebuilt
+        """
+        lion = {"animal_id": "LION001", "name": "Leo", "diet": "carnivore"}
+        zebra = {"animal_id": "ZEBRA001", "name": "Stripes", "diet": "herbivore"}
+
+        traits = get_habitat_traits("savannah", self.habitat, [lion, zebra])
+        self.habitat["current_animals"].append("LION001")
+
+        self.assertIsNot(get_habitat_traits("savannah", self.habitat, [lion, zebra]), traits)
+        self.assertFalse(assign_animal_to_habitat(zebra, "savannah", self.habitats, [lion, zebra])[0])
+
+    def test_rebuilt_after_same_length_edit(self):
+        """
+        Test that swapping an animal in the list for another one makes the totals get rebuilt
+        """
+        lion = {"animal_id": "LION001", "name": "Leo", "diet": "carnivore"}
+        zebra = {"animal_id": "ZEBRA001", "name": "Stripes", "diet": "herbivore"}
+        animals = [lion, zebra]
+        self.habitat["current_animals"].append("LION001")
+        traits = get_habitat_traits("savannah", self.habitat, animals)
+
+        self.habitat["current_animals"].remove("LION001")
+        self.habitat["current_animals"].append("ZEBRA001")
+
+        self.assertIsNot(get_habitat_traits("savannah", self.habitat, animals), traits)
+        self.assertEqual(get_habitat_traits("savannah", self.habitat, animals).diets, {"herbivore": 1})
+
+    def test_marked_change_rebuilds_both_indexes(self):
+        """
+        Test that an edit the snapshot can not see is picked up once it is marked
+        """
+        self.habitat["current_animals"].extend(["LION001", "ZEBRA002"])
+        animals = [{"animal_id": "LION001", "diet": "carnivore"}, {"animal_id": "ZEBRA001", "diet": "herbivore"},
+                   {"animal_id": "ZEBRA002", "diet": "herbivore"}]
+        traits = get_habitat_traits("savannah", self.habitat, animals)
+        occupancy = get_habitat_occupancy(self.habitats)
+
+        self.habitat["current_animals"][0] = "ZEBRA001"
+        mark_habitats_changed()
+
+        self.assertEqual(get_habitat_traits("savannah", self.habitat, animals).diets, {"herbivore": 2})
+        self.assertIsNot(get_habitat_traits("savannah", self.habitat, animals), traits)
+        self.assertEqual(get_habitat_occupancy(self.habitats).get_habitat("ZEBRA001"), "savannah")
+        self.assertIsNot(get_habitat_occupancy(self.habitats), occupancy)
+
+    def test_resident_without_record_is_not_cached(self):
+        """
+        Test that totals built before a resident's record was in the list are not reused once it is
+        """
+        lion = {"animal_id": "L1", "name": "Leo", "diet": "carnivore", "habitat_type": "savannah"}
+        giraffe = {"animal_id": "G1", "name": "Tall", "diet": "herbivore", "habitat_type": "savannah"}
+        zebra = {"animal_id": "Z1", "name": "Stripes", "diet": "herbivore", "habitat_type": "savannah"}
+        self.habitat["current_animals"].append("L1")
+        animals = [giraffe]
+
+        self.assertEqual(get_habitat_traits("savannah", self.habitat, animals).missing, 1)
+        self.assertTrue(assign_animal_to_habitat(giraffe, "savannah", self.habitats, animals)[0])
+
+        animals.append(lion)
+        self.assertEqual(assign_animal_to_habitat(zebra, "savannah", self.habitats, animals),
+                         (False, "Not compatible with Leo: Animals have incompatible diets."))
+        self.assertEqual(self.habitat["current_animals"], ["L1", "G1"])
+
+    def test_refreshed_when_traits_change(self):
+        """
+        Test that changing an animal's traits through the registry makes the totals get rebuilt
+        """
+        zebra = {"animal_id": "ZEBRA001", "name": "Stripes", "diet": "herbivore"}
+        other = {"animal_id": "ZEBRA002", "name": "Dotty", "diet": "herbivore"}
+        animals = AnimalRegistry([zebra, other])
+        self.assertTrue(assign_animal_to_habitat(zebra, "savannah", self.habitats, animals)[0])
+        occupancy = get_habitat_occupancy(self.habitats)
+        traits = get_habitat_traits("savannah", self.habitat, animals)
+
+        animals.replace(dict(zebra, diet="carnivore"))
+
+        self.assertIsNot(get_habitat_traits("savannah", self.habitat, animals), traits)
+        self.assertIsNot(get_habitat_occupancy(self.habitats), occupancy)
+        self.assertFalse(assign_animal_to_habitat(other, "savannah", self.habitats, animals)[0])
+
+if __name__ == '__main__':
+    unittest.main()
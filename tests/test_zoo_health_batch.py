@@ -0,0 +1,69 @@
+import random
+import unittest
+from unittest import mock
+from d1_project_pitch.src import zoo_health_batch
+from d1_project_pitch.src.zoo_health_batch import calculate_health_status_batch
+from d1_project_pitch.src.zoo_health_tracking import calculate_health_status
+from d1_project_pitch.src.zoo_species_data import SPECIES_HEALTH_BASELINES
+
+class TestHealthBatch(unittest.TestCase):
+    """
+    Test suite for the population wide health status calculation
+    """
+
+    def make_population(self, count):
+        """
+        Make animals with readings spread in and around their species ranges
+        """
+        generator = random.Random(42)
+        species_names = list(SPECIES_HEALTH_BASELINES) + ["Mystery Animal", "Snowy Owl"]
+        notes = ["", "Excellent condition", "Slightly lethargic today", "Limping, possible infection", "NOT EATING"]
+        animals = []
+
+        for i in range(count):
+            species = generator.choice(species_names)
+            animal = {"animal_id": f"A{i}", "species": species, "health_records": []}
+
+            if i % 10 != 0:
+                data = {}
+                if generator.random() < 0.9:
+                    data["weight_kg"] = generator.choice([0, -5, generator.uniform(1, 7000), 200])
+                if generator.random() < 0.9:
+                    data["temperature_c"] = round(generator.uniform(34.0, 43.0), 1)
+                if generator.random() < 0.9:
+                    data["heart_rate"] = generator.choice([0, generator.randint(10, 220)])
+                data["vaccination_status"] = generator.choice(["current", "overdue", "none", ""])
+                data["vet_notes"] = generator.choice(notes)
+                animal["health_records"].append({"date": "2024-01-15T10:00:00", "data": data})
+
+            animals.append(animal)
+
+        return animals
+
+    @unittest.skipIf(zoo_health_batch.np is None, "NumPy is not installed")
+    def test_batch_matches_scalar_function(self):
+        """
+        Equivalence testing: every result matches calculate_health_status exactly
+        """
+        animals = self.make_population(2000)
+
+        expected = [calculate_health_status(animal) for animal in animals]
+
+        self.assertEqual(calculate_health_status_batch(animals), expected)
+
+    def test_fallback_without_numpy(self):
+        """
+        Test that the batch API still works when NumPy is missing
+        """
+        animals = self.make_population(50)
+
+        with mock.patch.object(zoo_health_batch, "np", None):
+            results = calculate_health_status_batch(animals)
+
+        self.assertEqual(results, [calculate_health_status(animal) for animal in animals])
+
+    def test_empty_population(self):
+        """
+        Boundary testing: no animals gives no results
+        """
+        self.assertEqual(calculate_health_status_batch([]), [])
@@ -0,0 +1,80 @@
+import unittest
+from d1_project_pitch.src.zoo_health_cache import HealthStatusCache
+from d1_project_pitch.src.zoo_health_tracking import record_health_check
+from d1_project_pitch.src.zoo_species_data import SPECIES_HEALTH_BASELINES, update_species_baseline
+
+class TestHealthStatusCache(unittest.TestCase):
+    """
+    Test suite for the cached health status
+    """
+
+    def setUp(self):
+        self.cache = HealthStatusCache()
+        self.animal = record_health_check(
+            {"animal_id": "LION001", "species": "Lion", "health_records": []},
+            {"weight_kg": 200.0, "temperature_c": 38.5, "heart_rate": 55})
+
+    def test_repeat_lookups_hit(self):
+        """
+        Test that asking again without changes is served from the cache
+        """
+        first = self.cache.get_status(self.animal)
+        second = self.cache.get_status(self.animal)
+
+        self.assertEqual(first, ("healthy", "All health indicators normal"))
+        self.assertEqual(second, first)
+        self.assertEqual(self.cache.get_stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_new_health_record_invalidates(self):
+        """
+        Test that a new health check is picked up
+        """
+        self.cache.get_status(self.animal)
+
+        updated = record_health_check(self.animal, {"weight_kg": 200.0, "temperature_c": 41.0, "heart_rate": 55})
+
+        self.assertEqual(self.cache.get_status(updated)[0], "critical")
+        self.assertEqual(self.cache.get_stats()["misses"], 2)
+
+    def test_baseline_change_invalidates(self):
+        """
+        Test that changing the species baselines recalculates the status
+        """
+        original_range = SPECIES_HEALTH_BASELINES["Lion"]["weight_range"]
+        self.cache.get_status(self.animal)
+
+        try:
+            update_species_baseline("Lion", weight_range=(210, 250))
+            self.assertEqual(self.cache.get_status(self.animal)[0], "needs attention")
+        finally:
+            update_species_baseline("Lion", weight_range=original_range)
+
+        self.assertEqual(self.cache.get_status(self.animal)[0], "healthy")
+        self.assertEqual(self.cache.get_stats()["hits"], 0)
+
+    def test_new_record_with_reused_id_recalculates(self):
+        """
+        Test that a different record is never mistaken for the cached one, even after the old one is gone
+        """
+        self.cache.get_status(self.animal)
+        del self.animal
+
+        for _ in range(50):
+            light = record_health_check({"animal_id": "LION001", "species": "Lion", "health_records": []},
+                                        {"weight_kg": 10.0, "temperature_c": 38.5, "heart_rate": 55})
+            self.assertEqual(self.cache.get_status(light)[0], "needs attention")
+
+    def test_least_recently_used_are_evicted(self):
+        """
+        Test that the cache drops the least recently used animals past its size
+        """
+        cache = HealthStatusCache(max_size=2)
+        animals = [dict(self.animal, animal_id=f"LION00{i}") for i in range(3)]
+
+        cache.get_status(animals[0])
+        cache.get_status(animals[1])
+        cache.get_status(animals[0])
+        cache.get_status(animals[2])
+
+        self.assertEqual(list(cache.entries), ["LION000", "LION002"])
+        self.assertEqual(cache.get_stats()["size"], 2)
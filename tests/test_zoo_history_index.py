@@ -0,0 +1,111 @@
+import datetime
+import unittest
+from d1_project_pitch.src.zoo_history_index import HistoryView, build_history_index
+from d1_project_pitch.src.zoo_health_tracking import record_health_check
+from d1_project_pitch.src.zoo_feeding import record_feeding
+from d1_project_pitch.src.zoo_timestamps import iso_to_epoch_us
+
+def make_health_record(date, weight):
+    return {"date": date, "data": {"weight_kg": weight}}
+
+class TestHistoryIndex(unittest.TestCase):
+    """
+    Test suite for time range queries over animal history
+    """
+
+    def setUp(self):
+        self.animal = {
+            "animal_id": "LION001",
+            "species": "Lion",
+            "health_records": [
+                make_health_record("2024-01-01T09:00:00", 190.0),
+                make_health_record("2024-02-01T09:00:00", 192.0),
+                make_health_record("2024-03-01T09:00:00", 195.0),
+                make_health_record("2024-04-01T09:00:00", 193.0)
+            ],
+            "feeding_history": [
+                {"amount_kg": 8.0, "timestamp": "2024-03-01T08:00:00"},
+                {"amount_kg": 7.5, "timestamp": "2024-03-02T08:00:00"}
+            ]
+        }
+        self.index = build_history_index([self.animal])
+
+    def test_range_query(self):
+        """
+        Test that both ends of the window are included
+        """
+        view = self.index.get_health_records_between(self.animal, "2024-02-01T09:00:00", "2024-03-01T09:00:00")
+
+        self.assertIsInstance(view, HistoryView)
+        self.assertEqual([record["data"]["weight_kg"] for record in view], [192.0, 195.0])
+        self.assertEqual(view[-1]["date"], "2024-03-01T09:00:00")
+        self.assertIs(view[0], self.animal["health_records"][1])
+
+    def test_open_ended_and_empty_windows(self):
+        """
+        Test windows with a missing end and windows with nothing in them
+        """
+        self.assertEqual(len(self.index.get_health_records_between(self.animal, start="2024-03-15T00:00:00")), 1)
+        self.assertEqual(len(self.index.get_health_records_between(self.animal, end="2023-12-31T00:00:00")), 0)
+        self.assertEqual(len(self.index.get_health_records_between(self.animal)), 4)
+
+    def test_accepts_datetimes_and_epochs(self):
+        """
+        Test that the window can be given as datetimes or microseconds
+        """
+        by_datetime = self.index.get_feedings_between(self.animal, datetime.datetime(2024, 3, 2))
+        by_epoch = self.index.get_feedings_between(self.animal, iso_to_epoch_us("2024-03-02T00:00:00"))
+
+        self.assertEqual(list(by_datetime), list(by_epoch))
+        self.assertEqual(by_datetime[0]["amount_kg"], 7.5)
+
+    def test_new_records_are_picked_up(self):
+        """
+        Test that records appended after the index was built are found
+        """
+        updated = record_health_check(self.animal, {"weight_kg": 196.0})
+        updated = record_feeding(updated, {"amount_kg": 9.0})
+
+        self.assertEqual(self.index.get_recent_records(updated, "health_records", 1)[0]["data"]["weight_kg"], 196.0)
+        self.assertEqual(len(self.index.get_recent_records(updated, "feeding_history", 1)), 1)
+
+    def test_legacy_history_sorted_at_load(self):
+        """
+        Test that out of order histories are read in time order, without reordering them, and bad timestamps are left out of windows
+        """
+        animal = {"animal_id": "ZEBRA001", "health_records": [
+            make_health_record("2024-03-01T00:00:00", 3.0),
+            make_health_record("not a date", 0.0),
+            make_health_record("2024-01-01T00:00:00", 1.0)
+        ]}
+        index = build_history_index([animal])
+
+        self.assertEqual([record["data"]["weight_kg"] for record in animal["health_records"]], [3.0, 0.0, 1.0])
+        self.assertEqual([record["data"]["weight_kg"] for record in index.get_health_records_between(animal)], [1.0, 3.0])
+        self.assertEqual(animal["feeding_history"], [])
+
+        animal["health_records"].append(make_health_record("2024-02-01T00:00:00", 2.0))
+        view = index.get_health_records_between(animal, "2024-01-15T00:00:00")
+        self.assertEqual([record["data"]["weight_kg"] for record in view], [2.0, 3.0])
+        self.assertEqual(animal["health_records"][-1]["data"]["weight_kg"], 2.0)
+
+    def test_bad_window_raises(self):
+        """
+        Test that a start or end that is not a time is refused instead of leaving the window open
+        """
+        with self.assertRaises(ValueError):
+            self.index.get_health_records_between(self.animal, "yesterday")
+        with self.assertRaises(ValueError):
+            self.index.count_records_between([self.animal], "feeding_history", None, "2024-13-45")
+
+    def test_count_records_between(self):
+        """
+        Test counting records in a window across animals
+        """
+        other = {"animal_id": "LION002", "health_records": [make_health_record("2024-02-15T00:00:00", 180.0)]}
+
+        self.assertEqual(self.index.count_records_between([self.animal, other], "health_records",
+                                                           "2024-02-01T00:00:00", "2024-03-01T00:00:00"), 2)
+
+if __name__ == '__main__':
+    unittest.main()
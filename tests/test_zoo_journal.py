@@ -0,0 +1,138 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from d1_project_pitch.src.zoo_journal import MutationJournal, get_journal_filename, read_journal
+from d1_project_pitch.src.zoo_file_management import load_animals_from_file, iter_animals_from_file
+
+class TestMutationJournal(unittest.TestCase):
+    """
+    Test suite for the append-only mutation journal
+    """
+
+    def setUp(self):
+        """
+        Set up a fresh data file location for each test
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "zoo_data.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_journal_replayed_without_snapshot(self):
+        """
+        Test that changes survive when the program never saved a snapshot
+        """
+        journal = MutationJournal(self.filename, batch_size=1)
+        journal.log_new_animal({"animal_id": "LION001", "name": "Leo", "species": "Lion", "health_records": []})
+        journal.log_health_check("LION001", {"date": "2024-01-15T10:00:00", "data": {"weight_kg": 190}})
+        journal.log_feeding("LION001", {"amount_kg": 5.0, "timestamp": "2024-01-15T11:00:00"})
+        journal.close()
+
+        with mock.patch('builtins.print'):
+            animals = load_animals_from_file(self.filename)
+
+        self.assertEqual(len(animals), 1)
+        self.assertEqual(animals[0]["health_records"][0]["data"]["weight_kg"], 190)
+        self.assertEqual(len(animals[0]["feeding_history"]), 1)
+
+    def test_habitat_assignments_replayed(self):
+        """
+        Test that habitat assignments and removals are applied in order
+        """
+        journal = MutationJournal(self.filename)
+        journal.log_new_animal({"animal_id": "ZEBRA001", "name": "Stripes", "species": "Zebra"})
+        journal.log_habitat_assignment("ZEBRA001", "savannah")
+        journal.log_habitat_assignment("ZEBRA001", "forest")
+        journal.log_habitat_removal("ZEBRA001", "savannah")
+        journal.close()
+
+        habitats = {"savannah": {"current_animals": []}, "forest": {"current_animals": []}}
+        with mock.patch('builtins.print'):
+            load_animals_from_file(self.filename, habitats)
+
+        self.assertEqual(habitats["savannah"]["current_animals"], [])
+        self.assertEqual(habitats["forest"]["current_animals"], ["ZEBRA001"])
+
+    def test_compact_writes_snapshot_and_resets_journal(self):
+        """
+        Test that compaction folds the journal into the data file
+        """
+        animals = [{"animal_id": "WOLF001", "name": "Fang", "species": "Wolf"}]
+        habitats = {"forest": {"current_animals": ["WOLF001"]}}
+
+        journal = MutationJournal(self.filename, compact_every=1)
+        journal.log_new_animal(animals[0])
+        self.assertTrue(journal.should_compact())
+
+        self.assertTrue(journal.compact(animals, habitats))
+        journal.close()
+
+        with open(self.filename) as file:
+            self.assertEqual(json.load(file), {"generation": 1, "animals": animals})
+
+        entries = read_journal(get_journal_filename(self.filename))
+        self.assertEqual(entries, [{"op": "assign", "id": "WOLF001", "habitat": "forest"}])
+
+    def test_damaged_last_record_is_skipped(self):
+        """
+        Test that a half written record from a crash does not stop the load
+        """
+        journal = MutationJournal(self.filename)
+        journal.log_new_animal({"animal_id": "KOALA001", "name": "Kip", "species": "Koala"})
+        journal.close()
+
+        with open(get_journal_filename(self.filename), 'a') as file:
+            file.write('{"op":"health","id":"KOA')
+
+        with mock.patch('builtins.print'):
+            animals = load_animals_from_file(self.filename)
+
+        self.assertEqual([a["animal_id"] for a in animals], ["KOALA001"])
+
+    def test_crash_before_new_journal_does_not_replay_twice(self):
+        """
+        Test that a journal left behind by a crash after the snapshot was replaced is skipped
+        """
+        animals = [{"animal_id": "LION001", "name": "Leo", "species": "Lion", "health_records": []}]
+        journal = MutationJournal(self.filename, batch_size=1)
+        journal.log_new_animal(animals[0])
+        journal.log_health_check("LION001", {"date": "2024-01-15T10:00:00", "data": {"weight_kg": 190}})
+        animals[0]["health_records"].append({"date": "2024-01-15T10:00:00", "data": {"weight_kg": 190}})
+
+        #keep the old journal as it was before compacting replaced it
+        with open(get_journal_filename(self.filename)) as file:
+            old_journal = file.read()
+        self.assertTrue(journal.compact(animals))
+        journal.close()
+        with open(get_journal_filename(self.filename), 'w') as file:
+            file.write(old_journal)
+
+        with mock.patch('builtins.print'):
+            loaded = load_animals_from_file(self.filename)
+            streamed = list(iter_animals_from_file(self.filename))
+
+        self.assertEqual(loaded, animals)
+        self.assertEqual(streamed, animals)
+
+    def test_new_journal_follows_snapshot(self):
+        """
+        Test that changes journalled after a compaction are replayed on top of the snapshot
+        """
+        journal = MutationJournal(self.filename, batch_size=1)
+        journal.log_new_animal({"animal_id": "WOLF001", "name": "Fang", "species": "Wolf"})
+        journal.compact([{"animal_id": "WOLF001", "name": "Fang", "species": "Wolf"}])
+        journal.close()
+        os.remove(get_journal_filename(self.filename))
+
+        journal = MutationJournal(self.filename, batch_size=1)
+        journal.log_feeding("WOLF001", {"amount_kg": 2.0, "timestamp": "2024-01-15T11:00:00"})
+        journal.close()
+
+        with mock.patch('builtins.print'):
+            animals = load_animals_from_file(self.filename)
+
+        self.assertEqual(len(animals[0]["feeding_history"]), 1)
+
@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+import unittest
+from d1_project_pitch.src.zoo_notes_index import (
+    NotesIndex, build_notes_index, get_notes_index_filename, load_notes_index, open_notes_index,
+    parse_query, save_notes_index, tokenize
+)
+from d1_project_pitch.src.zoo_health_tracking import record_health_check
+
+def make_record(date, vet_notes):
+    return {"date": date, "data": {"vet_notes": vet_notes}}
+
+class TestNotesIndex(unittest.TestCase):
+    """
+    Test suite for the vet notes full-text index
+    """
+
+    def setUp(self):
+        self.animals = [
+            {"animal_id": "LION001", "health_records": [
+                make_record("2023-03-01T09:00:00", "Slight limping on the left leg"),
+                make_record("2024-02-01T09:00:00", "Recovering well, no limping")
+            ]},
+            {"animal_id": "ZEBRA001", "health_records": [
+                make_record("2024-01-15T09:00:00", "Wound infection, limping badly, limping since Monday")
+            ]},
+            {"animal_id": "ELEPH001", "health_records": [
+                make_record("2024-03-10T09:00:00", "Ear infection treated"),
+                {"date": "2024-03-11T09:00:00", "data": {"weight_kg": 5000}}
+            ]}
+        ]
+        self.index = build_notes_index(self.animals)
+
+    def test_tokenize_and_parse_query(self):
+        """
+        Test that queries are split into clauses of words and phrases
+        """
+        self.assertEqual(tokenize("Not-eating, LIMPING!"), ["not", "eating", "limping"])
+        self.assertEqual(parse_query('limping OR "ear infection" -treated'), [
+            {"required": [["limping"]], "excluded": []},
+            {"required": [["ear", "infection"]], "excluded": [["treated"]]}
+        ])
+        self.assertEqual(parse_query("NOT limping"), [])
+
+    def test_indexes_only_notes(self):
+        """
+        Test that every note is indexed and records without notes are counted as seen
+        """
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.indexed_counts, {"LION001": 2, "ZEBRA001": 1, "ELEPH001": 2})
+
+    def test_boolean_search(self):
+        """
+        Test AND, OR and NOT queries
+        """
+        self.assertEqual(self.index.find_animals("limping infection"), ["ZEBRA001"])
+        self.assertEqual(sorted(self.index.find_animals("limping OR infection")), ["ELEPH001", "LION001", "ZEBRA001"])
+        self.assertEqual(self.index.find_animals("infection NOT wound"), ["ELEPH001"])
+        self.assertEqual(self.index.find_animals("tiger"), [])
+
+    def test_phrase_search(self):
+        """
+        Test that a phrase only matches the words in order
+        """
+        self.assertEqual(self.index.find_animals('"no limping"'), ["LION001"])
+        self.assertEqual(self.index.find_animals('"limping no"'), [])
+
+        result = self.index.search('"no limping"')[0]
+        self.assertEqual((result["animal_id"], result["record_offset"]), ("LION001", 1))
+
+    def test_date_filter(self):
+        """
+        Test that since and until limit the record dates
+        """
+        results = self.index.search("limping", since="2024-01-01T00:00:00")
+        self.assertEqual([(result["animal_id"], result["date"]) for result in results],
+                         [("ZEBRA001", "2024-01-15T09:00:00"), ("LION001", "2024-02-01T09:00:00")])
+
+        results = self.index.search("limping", until="2023-12-31T00:00:00")
+        self.assertEqual([result["record_offset"] for result in results], [0])
+
+    def test_ranking_and_limit(self):
+        """
+        Test that more mentions rank higher and the limit is applied
+        """
+        results = self.index.search("limping", limit=2)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["animal_id"], "ZEBRA001")
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_record_health_check_updates_index(self):
+        """
+        Test that a new health check is searchable straight away
+        """
+        updated = record_health_check(self.animals[2], {"vet_notes": "Lethargic this morning"}, notes_index=self.index)
+
+        self.assertEqual(self.index.find_animals("lethargic"), ["ELEPH001"])
+        self.assertEqual(self.index.search("lethargic")[0]["record_offset"], 2)
+        self.assertEqual(self.index.update([updated]), 0)
+
+    def test_save_and_open(self):
+        """
+        Test that the index round trips and catches up on records added since it was saved
+        """
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        filename = os.path.join(test_dir, "zoo_data.json")
+
+        self.assertIsNone(load_notes_index(filename))
+        self.assertTrue(save_notes_index(self.index, filename))
+        self.assertTrue(os.path.exists(get_notes_index_filename(filename)))
+
+        loaded = load_notes_index(filename)
+        self.assertEqual(loaded.search("limping"), self.index.search("limping"))
+
+        self.animals[0]["health_records"].append(make_record("2024-04-01T09:00:00", "Limping again"))
+        reopened = open_notes_index(filename, self.animals)
+
+        self.assertEqual(len(reopened), 5)
+        self.assertEqual(reopened.search("again")[0]["record_offset"], 2)
+
+    def test_empty_index(self):
+        """
+        Test that searching an empty index finds nothing
+        """
+        self.assertEqual(NotesIndex().search("limping"), [])
+
+if __name__ == '__main__':
+    unittest.main()
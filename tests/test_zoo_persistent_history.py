@@ -0,0 +1,159 @@
+import json
+import unittest
+from unittest import mock
+from d1_project_pitch.src.zoo_persistent_history import HistoryVector, AnimalVersionLog
+from d1_project_pitch.src.zoo_animal_record import Animal, animals_to_dicts, to_json_value
+from d1_project_pitch.src.zoo_health_tracking import record_health_check, calculate_health_status
+from d1_project_pitch.src.zoo_feeding import record_feeding
+from d1_project_pitch.src.zoo_history_index import build_history_index
+from d1_project_pitch.src.zoo_ui import record_health_check_in_system
+
+class TestHistoryVector(unittest.TestCase):
+    """
+    Test suite for the persistent history list
+    """
+
+    def test_versions_are_isolated(self):
+        """
+        Test that appending leaves older versions as they were
+        """
+        first = HistoryVector(["a"])
+        second = first.appended("b")
+        third = second.appended("c")
+
+        self.assertEqual(list(first), ["a"])
+        self.assertEqual(list(second), ["a", "b"])
+        self.assertEqual(third, ["a", "b", "c"])
+        self.assertIs(second.items, third.items)
+
+    def test_branching_copies(self):
+        """
+        Test that appending to an older version does not disturb newer ones
+        """
+        first = HistoryVector(["a"])
+        second = first.appended("b")
+        branch = first.appended("x")
+
+        self.assertEqual(second, ["a", "b"])
+        self.assertEqual(branch, ["a", "x"])
+        self.assertIsNot(branch.items, second.items)
+
+    def test_sequence_behaviour(self):
+        """
+        Test indexing, slicing and bounds
+        """
+        vector = HistoryVector([1, 2]).appended(3)
+
+        self.assertEqual(vector[-1], 3)
+        self.assertEqual(vector[1:], [2, 3])
+        self.assertIn(2, vector)
+        with self.assertRaises(IndexError):
+            HistoryVector.share(vector.items, 2)[2]
+
+class TestCopyOnWriteAnimal(unittest.TestCase):
+    """
+    Test suite for copy-on-write updates of compact animal records
+    """
+
+    def setUp(self):
+        self.animal = Animal("LION001", "Leo", "Lion", 5)
+
+    def test_health_check_shares_unchanged_fields(self):
+        """
+        Test that a health check makes a new version without touching the old one
+        """
+        updated = record_health_check(self.animal, {"weight_kg": 190, "temperature_c": 38.5, "heart_rate": 55})
+        newer = record_health_check(updated, {"weight_kg": 191, "temperature_c": 41.0, "heart_rate": 55})
+
+        self.assertEqual(len(self.animal["health_records"]), 0)
+        self.assertEqual(len(updated["health_records"]), 1)
+        self.assertEqual(len(newer["health_records"]), 2)
+        self.assertIs(updated["health_records"].items, newer["health_records"].items)
+        self.assertIs(updated.profile, newer.profile)
+        self.assertIs(updated["current_medications"], newer["current_medications"])
+
+        self.assertEqual(calculate_health_status(updated)[0], "healthy")
+        self.assertEqual(calculate_health_status(newer)[0], "critical")
+
+    def test_feeding_history(self):
+        """
+        Test that feedings are added the same way
+        """
+        updated = record_feeding(self.animal, {"time": "08:00", "amount_kg": 6.0})
+
+        self.assertEqual(self.animal["feeding_history"], [])
+        self.assertEqual(updated["feeding_history"][0]["amount_kg"], 6.0)
+
+    def test_saves_as_plain_lists(self):
+        """
+        Test that persistent histories are written out as JSON lists
+        """
+        updated = record_feeding(self.animal, {"time": "08:00", "amount_kg": 6.0})
+
+        self.assertIsInstance(animals_to_dicts([updated])[0]["feeding_history"], list)
+        self.assertEqual(json.loads(json.dumps(updated, default=to_json_value))["feeding_history"][0]["amount_kg"], 6.0)
+
+    def test_history_index_follows_new_versions(self):
+        """
+        Test that the time index keeps working as the history grows version by version
+        """
+        updated = record_health_check(self.animal, {"weight_kg": 190})
+        index = build_history_index([updated])
+
+        newer = record_health_check(updated, {"weight_kg": 191})
+
+        self.assertEqual(len(index.get_health_records_between(newer)), 2)
+        self.assertEqual(len(index.get_health_records_between(updated)), 1)
+
+    def test_version_log_undo(self):
+        """
+        Test that older versions can be gone back to
+        """
+        log = AnimalVersionLog()
+        log.record(self.animal)
+        updated = record_health_check(self.animal, {"weight_kg": 190})
+        log.record(updated)
+
+        self.assertIs(log.get_latest("LION001"), updated)
+        self.assertEqual(len(log.get_versions("LION001")), 2)
+        self.assertIs(log.undo("LION001"), self.animal)
+        self.assertIsNone(log.undo("LION001"))
+
+class TestDictAnimalVersions(unittest.TestCase):
+    """
+    Test suite for updates of animals kept as plain dicts
+    """
+
+    def test_dict_versions_do_not_share_lists(self):
+        """
+        Test that a health check or feeding on a dict leaves the original's lists alone
+        """
+        animal = {"animal_id": "ZEBRA001", "name": "Stripes", "species": "Zebra", "health_records": [], "feeding_history": []}
+
+        checked = record_health_check(animal, {"weight_kg": 300})
+        fed = record_feeding(checked, {"time": "08:00", "amount_kg": 6.0})
+
+        self.assertEqual(animal["health_records"], [])
+        self.assertEqual(animal["feeding_history"], [])
+        self.assertEqual(len(checked["health_records"]), 1)
+        self.assertEqual(checked["feeding_history"], [])
+        self.assertEqual(len(fed["feeding_history"]), 1)
+
+    def test_ui_logs_versions(self):
+        """
+        Test that a health check made through the UI keeps the earlier version in the log
+        """
+        animal = {"animal_id": "ZEBRA001", "name": "Stripes", "species": "Zebra", "health_records": []}
+        animals = [animal]
+        log = AnimalVersionLog()
+
+        with mock.patch('builtins.input', side_effect=['ZEBRA001', '300', '', '', 'current', '']), \
+                mock.patch('builtins.print'):
+            record_health_check_in_system(animals, version_log=log)
+
+        self.assertIs(log.get_latest("ZEBRA001"), animals[0])
+        self.assertIs(log.undo("ZEBRA001"), animal)
+        self.assertEqual(animal["health_records"], [])
+
+if __name__ == '__main__':
+    unittest.main()
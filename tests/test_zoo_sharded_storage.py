@@ -0,0 +1,69 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from d1_project_pitch.src import zoo_sharded_storage
+from d1_project_pitch.src.zoo_sharded_storage import get_shard_index, read_manifest, reshard_animals, load_sharded_animals, save_sharded_animals
+from d1_project_pitch.src.zoo_file_management import load_animals_from_file, save_changed_animals
+from d1_project_pitch.src.zoo_change_tracking import TrackedAnimalList
+
+class TestShardedStorage(unittest.TestCase):
+    """
+    Test suite for the hash sharded data layout
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.shard_dir = os.path.join(self.temp_dir.name, "zoo_shards")
+        self.animals = [{"animal_id": f"WOLF{i:03d}", "name": "Fang", "species": "Wolf"} for i in range(40)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_shard_index_is_stable(self):
+        """
+        Test that the same ID always lands in the same shard
+        """
+        self.assertEqual(get_shard_index("WOLF001", 8), get_shard_index("WOLF001", 8))
+        self.assertTrue(0 <= get_shard_index("WOLF001", 8) < 8)
+
+    def test_reshard_and_parallel_load(self):
+        """
+        Integration testing: a single file is resharded and loads back through the process pool
+        """
+        single_file = os.path.join(self.temp_dir.name, "zoo_data.json")
+        with open(single_file, 'w') as file:
+            json.dump(self.animals, file)
+
+        with mock.patch('builtins.print'):
+            self.assertTrue(reshard_animals(single_file, self.shard_dir, 4))
+
+        manifest = read_manifest(self.shard_dir)
+        self.assertEqual(manifest["shard_count"], 4)
+        self.assertEqual(sum(manifest["counts"]), 40)
+
+        loaded = load_sharded_animals(self.shard_dir, max_workers=2)
+        self.assertEqual(sorted(loaded, key=lambda a: a["animal_id"]), self.animals)
+
+        self.assertEqual(len(load_animals_from_file(self.shard_dir)), 40)
+
+    def test_changed_save_rewrites_only_affected_shard(self):
+        """
+        Test that an incremental save leaves untouched shards alone
+        """
+        save_sharded_animals(self.animals, self.shard_dir, 8)
+        manifest = read_manifest(self.shard_dir)
+
+        animals = TrackedAnimalList(self.animals)
+        animals[0] = {**animals[0], "age": 6}
+
+        changed_shard = manifest["shards"][get_shard_index("WOLF000", 8)]
+
+        with mock.patch.object(zoo_sharded_storage, 'write_json_atomically',
+                               wraps=zoo_sharded_storage.write_json_atomically) as mock_write:
+            self.assertTrue(save_changed_animals(animals, self.shard_dir))
+
+        written = [os.path.basename(call.args[0]) for call in mock_write.call_args_list]
+        self.assertEqual(written, [changed_shard, "manifest.json"])
+        self.assertIn({**self.animals[0], "age": 6}, load_sharded_animals(self.shard_dir, max_workers=1))
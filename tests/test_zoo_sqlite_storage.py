@@ -0,0 +1,150 @@
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from d1_project_pitch.src.zoo_sqlite_storage import save_animals_to_database, load_animals_from_database, is_database_filename
+from d1_project_pitch.src.zoo_file_management import save_animals_to_file, load_animals_from_file, migrate_json_to_database
+
+class TestSqliteStorage(unittest.TestCase):
+    """
+    Test suite for the SQLite storage backend
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.temp_dir.name, "zoo_data.db")
+
+        self.animals = [{
+            "animal_id": "TIGER001",
+            "name": "Raja",
+            "species": "Tiger",
+            "age": 9,
+            "health_records": [{
+                "date": "2025-10-31T16:52:10.714937",
+                "data": {"weight_kg": 167.0, "temperature_c": 38.1, "heart_rate": 60,
+                         "vaccination_status": "current", "vet_notes": "fine", "blood_test": "clear"}
+            }],
+            "current_medications": [{"name": "dewormer", "dose_mg": 20}],
+            "feeding_history": [{"time": "08:00", "amount_kg": 10.0, "food_type": "Meat",
+                                 "keeper": "me", "timestamp": "2025-10-31T16:53:12.191073"}],
+            "diet": "carnivore",
+            "habitat_type": "forest",
+            "temperament": "aggressive",
+            "social_needs": "solitary",
+            "genetic_diversity": "high"
+        }, {
+            "animal_id": "ZEBRA001",
+            "name": "Stripes",
+            "species": "Zebra",
+            "age": 4,
+            "health_records": [],
+            "current_medications": [],
+            "feeding_history": []
+        }]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_database_filename_detection(self):
+        """
+        Test which filenames are treated as databases
+        """
+        self.assertTrue(is_database_filename("zoo.db"))
+        self.assertTrue(is_database_filename("zoo.SQLITE"))
+        self.assertFalse(is_database_filename("zoo_data.json"))
+
+    def test_round_trip(self):
+        """
+        Test that animals come back out of the database unchanged
+        """
+        habitats = {"forest": {"current_animals": ["TIGER001"]}}
+        self.assertTrue(save_animals_to_file(self.animals, self.database, habitats))
+
+        loaded_habitats = {"forest": {"current_animals": []}}
+        loaded = load_animals_from_file(self.database, loaded_habitats)
+
+        self.assertEqual(loaded, self.animals)
+        self.assertEqual(loaded_habitats["forest"]["current_animals"], ["TIGER001"])
+
+    def test_resave_only_appends_new_history_rows(self):
+        """
+        Test that saving again keeps existing rows and adds new ones
+        """
+        save_animals_to_database(self.animals, self.database)
+
+        self.animals[1]["health_records"].append({"date": "2025-11-01T09:00:00", "data": {"weight_kg": 320.0}})
+        self.animals.pop(0)
+        save_animals_to_database(self.animals, self.database)
+
+        connection = sqlite3.connect(self.database)
+        rows = connection.execute("SELECT animal_id, seq FROM health_records").fetchall()
+        animal_count = connection.execute("SELECT COUNT(*) FROM animals").fetchone()[0]
+        connection.close()
+
+        self.assertEqual(rows, [("ZEBRA001", 0)])
+        self.assertEqual(animal_count, 1)
+        self.assertEqual(load_animals_from_database(self.database), self.animals)
+
+    def test_migrate_from_json(self):
+        """
+        Integration testing: Test the one-shot migration from the JSON format
+        """
+        json_filename = os.path.join(self.temp_dir.name, "zoo_data.json")
+        with open(json_filename, 'w') as file:
+            json.dump(self.animals, file)
+
+        with mock.patch('builtins.print'):
+            self.assertTrue(migrate_json_to_database(json_filename, self.database))
+
+        self.assertEqual(load_animals_from_database(self.database), self.animals)
+
+    def test_values_keep_their_types(self):
+        """
+        Test that None values and values of other types than their column come back unchanged
+        """
+        self.animals[0]["age"] = None
+        self.animals[0]["temperament"] = 3
+        self.animals[0]["health_records"][0]["data"]["weight_kg"] = 167
+        self.animals[0]["health_records"][0]["data"]["heart_rate"] = 60.5
+        self.animals[0]["health_records"].append({"data": {"weight_kg": None, "vet_notes": None}})
+        self.animals[0]["feeding_history"][0]["amount_kg"] = 10
+        self.animals[1]["age"] = "4"
+
+        self.assertTrue(save_animals_to_database(self.animals, self.database))
+        loaded = load_animals_from_database(self.database)
+
+        self.assertEqual(loaded, self.animals)
+        self.assertIs(type(loaded[0]["health_records"][0]["data"]["weight_kg"]), int)
+        self.assertIs(type(loaded[0]["feeding_history"][0]["amount_kg"]), int)
+        self.assertEqual(loaded[1]["age"], "4")
+
+    def test_migrate_aborts_on_bad_source(self):
+        """
+        Test that a missing or damaged JSON file migrates nothing
+        """
+        json_filename = os.path.join(self.temp_dir.name, "zoo_data.json")
+
+        with mock.patch('builtins.print'):
+            self.assertFalse(migrate_json_to_database(json_filename, self.database))
+
+            with open(json_filename, 'w') as file:
+                file.write('[{"animal_id": "TIGER001", "name": ')
+            self.assertFalse(migrate_json_to_database(json_filename, self.database))
+
+        self.assertEqual(load_animals_from_database(self.database), [])
+
+    def test_migrate_never_deletes(self):
+        """
+        Test that migrating into a database that already holds animals leaves it untouched
+        """
+        json_filename = os.path.join(self.temp_dir.name, "zoo_data.json")
+        with open(json_filename, 'w') as file:
+            json.dump(self.animals[:1], file)
+        self.assertTrue(save_animals_to_database(self.animals, self.database))
+
+        with mock.patch('builtins.print'):
+            self.assertFalse(migrate_json_to_database(json_filename, self.database))
+
+        self.assertEqual(load_animals_from_database(self.database), self.animals)
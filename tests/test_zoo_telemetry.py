@@ -0,0 +1,134 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from d1_project_pitch.src.zoo_telemetry import (
+    HOUR_US, TelemetryPipeline, bucket_to_health_data, ingest_telemetry_file, read_telemetry, validate_reading
+)
+
+JSONL_TELEMETRY = """{"animal_id": "LION001", "timestamp": 1735689600, "heart_rate": 50, "temperature_c": 38.0}
+{"animal_id": "LION001", "timestamp": 1735689630, "heart_rate": 60, "temperature_c": 38.4}
+{"animal_id": "LION001", "timestamp": "2025-01-01T00:01:10", "heart_rate": 54}
+{"animal_id": "LION001", "timestamp": 1735693200, "temperature_c": 41.0}
+{"animal_id": "LION001", "timestamp": 1735693205, "temperature_c": 41.5}
+{"animal_id": "ZEBRA001", "timestamp": 1735689600, "heart_rate": 70}
+{"animal_id": "LION001", "timestamp": 1735689600, "heart_rate": "fast"}
+not json
+"""
+
+CSV_TELEMETRY = """animal_id,timestamp,heart_rate,temperature_c
+LION001,1735689600,50,38.0
+LION001,1735689630,60,38.4
+LION001,1735689640,,
+LION001,1735689650,20,
+"""
+
+class TestTelemetry(unittest.TestCase):
+    """
+    Test suite for the telemetry ingestion pipeline
+    """
+
+    def setUp(self):
+        self.animals = [{"animal_id": "LION001", "species": "Lion"}]
+        self.alerts = []
+        self.emitted = []
+        self.pipeline = TelemetryPipeline(self.animals, batch_size=2, on_alert=self.alerts.append, on_bucket=self.emitted.append)
+
+    def test_validate_reading(self):
+        """
+        Test that readings are checked and converted
+        """
+        self.assertEqual(validate_reading("LION001", "1735689600", "55", ""), ("LION001", 1735689600000000, 55.0, None))
+        self.assertEqual(validate_reading("LION001", "2025-01-01T00:00:00", None, 38.5)[1], 1735689600000000)
+        self.assertEqual(validate_reading("LION001", "2025-01-01T02:00:00+02:00", None, 38.5)[1], 1735689600000000)
+        self.assertIsNone(validate_reading("", 1735689600, 55, 38.5))
+        self.assertIsNone(validate_reading("LION001", "yesterday", 55, 38.5))
+        self.assertIsNone(validate_reading("LION001", 1735689600, 55, 99.0))
+        self.assertIsNone(validate_reading("LION001", float("nan"), 55, 38.5))
+        self.assertIsNone(validate_reading("LION001", 1735689600, None, None))
+
+    def test_jsonl_minute_buckets(self):
+        """
+        Test that JSONL readings are validated and summarised per minute
+        """
+        accepted = self.pipeline.ingest(read_telemetry(io.StringIO(JSONL_TELEMETRY)))
+
+        self.assertEqual(accepted, 5)
+        self.assertEqual(self.pipeline.rejected, 3)
+
+        self.pipeline.flush()
+        buckets = self.emitted
+        self.assertEqual([(bucket["start"], bucket["readings"]) for bucket in buckets], [
+            ("2025-01-01T00:00:00+00:00", 2), ("2025-01-01T00:01:00+00:00", 1), ("2025-01-01T01:00:00+00:00", 2)
+        ])
+        self.assertEqual(buckets[0]["heart_rate"], {"mean": 55.0, "min": 50, "max": 60, "count": 2})
+        self.assertIsNone(buckets[1]["temperature_c"])
+
+    def test_buckets_emitted_past_watermark(self):
+        """
+        Test that buckets are emitted and dropped once the watermark passes them, and later readings for them are late
+        """
+        self.pipeline.ingest(read_telemetry(io.StringIO(JSONL_TELEMETRY)))
+
+        self.assertEqual(len(self.emitted), 2)
+        self.assertEqual(list(self.pipeline.buckets), [1735693200000000])
+        self.assertEqual(len(self.pipeline.get_buckets()), 1)
+
+        self.pipeline.ingest(read_telemetry(io.StringIO('{"animal_id": "LION001", "timestamp": 1735689605, "heart_rate": 50}')))
+        self.assertEqual(self.pipeline.late, 1)
+        self.assertEqual(self.pipeline.flush(), 3)
+        self.assertEqual(self.pipeline.buckets, {})
+
+    def test_hour_rollup(self):
+        """
+        Test that minute buckets roll up into hours
+        """
+        self.pipeline = TelemetryPipeline(self.animals, lateness_us=2 * HOUR_US)
+        self.pipeline.ingest(read_telemetry(io.StringIO(JSONL_TELEMETRY)))
+
+        buckets = self.pipeline.get_buckets(HOUR_US)
+
+        self.assertEqual(len(buckets), 2)
+        self.assertEqual(buckets[0]["readings"], 3)
+        self.assertEqual(buckets[0]["heart_rate"]["min"], 50)
+        self.assertEqual(bucket_to_health_data(buckets[0]), {"heart_rate": 55, "temperature_c": 38.2})
+
+    def test_alert_once_per_excursion(self):
+        """
+        Test that going out of range raises one alert using the existing rules
+        """
+        self.pipeline.ingest(read_telemetry(io.StringIO(JSONL_TELEMETRY)))
+
+        self.assertEqual(len(self.alerts), 1)
+        self.assertEqual(self.alerts[0]["vital"], "temperature_c")
+        self.assertEqual(self.alerts[0]["issue"], "high temperature (41.0°C > 39.5°C)")
+        self.assertEqual(self.pipeline.alerts, self.alerts)
+
+    def test_csv(self):
+        """
+        Test that CSV telemetry is read the same way
+        """
+        self.pipeline.ingest(read_telemetry(io.StringIO(CSV_TELEMETRY), "csv"))
+
+        self.assertEqual(self.pipeline.accepted, 3)
+        self.assertEqual(self.pipeline.rejected, 1)
+        self.assertEqual(self.alerts[0]["issue"], "low heart rate (20.0bpm < 40bpm)")
+
+    def test_ingest_file(self):
+        """
+        Test that the format is taken from the file extension
+        """
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        filename = os.path.join(test_dir, "collars.csv")
+        with open(filename, 'w') as file:
+            file.write(CSV_TELEMETRY)
+
+        pipeline = ingest_telemetry_file(filename, self.animals, on_bucket=self.emitted.append)
+
+        self.assertEqual(pipeline.accepted, 3)
+        self.assertEqual(len(self.emitted), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from d1_project_pitch.src.zoo_text_matching import TermMatcher
+from d1_project_pitch.src.zoo_health_tracking import (
+    CONCERNING_TERMS, calculate_health_status, find_concerning_term, scan_vet_notes, set_concerning_terms
+)
+
+class TestTermMatcher(unittest.TestCase):
+    """
+    Test suite for the multi-pattern term matcher
+    """
+
+    def test_finds_every_term(self):
+        """
+        Test that all terms in a text are found in one pass
+        """
+        matcher = TermMatcher(["he", "she", "his", "hers"])
+
+        self.assertEqual(matcher.find_terms("ushers"), ["he", "she", "hers"])
+        self.assertEqual(matcher.find_terms("nothing here"), ["he"])
+        self.assertEqual(matcher.find_terms("xyz"), [])
+
+    def test_overlapping_and_nested_terms(self):
+        """
+        Test that terms inside other terms are reported through the fail links
+        """
+        matcher = TermMatcher(["lethargic", "lethargy", "argic", "arg"])
+
+        self.assertEqual(matcher.find_terms("Very LETHARGIC today"), ["lethargic", "argic", "arg"])
+        self.assertEqual(list(matcher.iter_matches("arg")), [(2, 3)])
+
+    def test_first_term_follows_list_order(self):
+        """
+        Test that the earliest listed term wins, not the earliest in the text
+        """
+        matcher = TermMatcher(["infection", "limping"])
+
+        self.assertEqual(matcher.find_first_term_index("limping from an infection"), 0)
+        self.assertEqual(matcher.find_first_term_index("limping"), 1)
+        self.assertEqual(matcher.find_first_term_index(""), -1)
+
+    def test_matches_substring_scan(self):
+        """
+        Test that the matcher agrees with checking each term with in
+        """
+        notes = ["not eating, lethargy noted", "Injured paw", "fine", "anorexic and limping", "lethargic"]
+        matcher = TermMatcher(CONCERNING_TERMS)
+
+        for note in notes:
+            expected = [term for term in CONCERNING_TERMS if term in note.lower()]
+            self.assertEqual(matcher.find_terms(note), expected)
+
+class TestConcerningTerms(unittest.TestCase):
+    """
+    Test suite for the concerning vet note terms used by the health checks
+    """
+
+    def setUp(self):
+        self.original_terms = list(CONCERNING_TERMS)
+
+    def tearDown(self):
+        set_concerning_terms(self.original_terms)
+
+    def make_animal(self, vet_notes):
+        return {
+            "animal_id": "LION001",
+            "species": "Lion",
+            "health_records": [{
+                "date": "2024-01-01T00:00:00",
+                "data": {"weight_kg": 200.0, "temperature_c": 38.5, "heart_rate": 55, "vet_notes": vet_notes}
+            }]
+        }
+
+    def test_status_reports_first_listed_term(self):
+        """
+        Test that the health status names the same term as before
+        """
+        status, details = calculate_health_status(self.make_animal("Limping and lethargic"))
+
+        self.assertEqual(status, "needs attention")
+        self.assertEqual(details, "Minor issues: noted: lethargic")
+
+    def test_set_concerning_terms(self):
+        """
+        Test that new terms are picked up once set
+        """
+        self.assertEqual(find_concerning_term("mild cough"), -1)
+
+        set_concerning_terms(self.original_terms + ["cough"])
+
+        self.assertEqual(CONCERNING_TERMS[find_concerning_term("mild cough")], "cough")
+        self.assertEqual(calculate_health_status(self.make_animal("mild cough"))[1], "Minor issues: noted: cough")
+
+    def test_scan_vet_notes(self):
+        """
+        Test that every record with concerning notes is reported
+        """
+        animal = self.make_animal("injured, infection")
+        animal["health_records"].append({"date": "2024-01-02T00:00:00", "data": {"vet_notes": "recovering well"}})
+        animal["health_records"].append({"date": "2024-01-03T00:00:00", "data": {}})
+
+        self.assertEqual(list(scan_vet_notes([animal])),
+                         [("LION001", "2024-01-01T00:00:00", ["injured", "infection"])])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,11 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
-from d1_project_pitch.src.zoo_ui import display_main_menu, get_menu_choice, add_new_animal_to_system, record_health_check_in_system, find_animal_by_id, process_feeding_in_system, check_breeding_eligibility_in_system, assign_to_habitat_in_system, view_habitat_report_in_system
+from d1_project_pitch.src.zoo_sqlite_storage import save_animals_to_database, load_animals_from_database
+from d1_project_pitch.src.zoo_journal import get_journal_filename
+from d1_project_pitch.src.zoo_notes_index import get_notes_index_filename
+from d1_project_pitch.src.zoo_ui import run_zoo_program, display_main_menu, get_menu_choice, add_new_animal_to_system, record_health_check_in_system, find_animal_by_id, process_feeding_in_system, check_breeding_eligibility_in_system, assign_to_habitat_in_system, view_habitat_report_in_system
 
 class TestZooUI(unittest.TestCase):
     """
@@ -288,4 +293,39 @@ class TestZooUI(unittest.TestCase):
         report_printed = any('Habitat Report' in str(call) for call in mock_print.call_args_list) 
         self.assertTrue(report_printed)
 
-        
\ No newline at end of file
+        
+
+class TestZooProgramStorage(unittest.TestCase):
+    """
+    Test suite for running the program on a chosen data file
+    """
+    def test_run_on_database(self):
+        """
+        Test that a database data file is loaded and saved without a journal
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database = os.path.join(temp_dir, "zoo_data.db")
+            animals = [{"animal_id": "ZEBRA001", "name": "Stripes", "species": "Zebra", "health_checks": [], "feeding_history": []}]
+            self.assertTrue(save_animals_to_database(animals, database))
+            stored = load_animals_from_database(database)
+
+            with patch('builtins.input', side_effect=["5", "7"]), patch('builtins.print'):
+                result = run_zoo_program(database)
+
+            self.assertEqual([animal["animal_id"] for animal in result], ["ZEBRA001"])
+            self.assertEqual(load_animals_from_database(database), stored)
+            self.assertFalse(os.path.exists(get_journal_filename(database)))
+            self.assertTrue(os.path.exists(get_notes_index_filename(database)))
+
+    def test_notes_index_not_saved_after_failed_save(self):
+        """
+        Test that quitting after a failed data save leaves no notes index behind
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database = os.path.join(temp_dir, "zoo_data.db")
+
+            with patch('builtins.input', side_effect=["7"]), patch('builtins.print'), \
+                 patch('d1_project_pitch.src.zoo_ui.save_zoo_data', return_value=False):
+                run_zoo_program(database)
+
+            self.assertFalse(os.path.exists(get_notes_index_filename(database)))
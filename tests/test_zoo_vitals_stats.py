@@ -0,0 +1,122 @@
+import statistics
+import unittest
+from d1_project_pitch.src.zoo_vitals_stats import RollingStats, VitalsStatsTracker, build_vitals_stats
+from d1_project_pitch.src.zoo_health_tracking import record_health_check
+
+class TestRollingStats(unittest.TestCase):
+    """
+    Test suite for the running statistics of one vital
+    """
+
+    def test_mean_and_variance(self):
+        """
+        Test that Welford's method matches the statistics module
+        """
+        values = [180.0, 185.5, 179.2, 190.1, 183.3, 188.8]
+        stats = RollingStats()
+        for value in values:
+            stats.update(value)
+
+        self.assertEqual(stats.count, 6)
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.get_variance(), statistics.variance(values))
+
+    def test_ewma(self):
+        """
+        Test that the moving average weights recent readings
+        """
+        stats = RollingStats(smoothing=0.5)
+        for value in [10, 20, 30]:
+            stats.update(value)
+
+        self.assertAlmostEqual(stats.ewma, 22.5)
+
+    def test_window_min_max(self):
+        """
+        Test that the min and max only cover the last window of readings
+        """
+        stats = RollingStats(window_size=3)
+        values = [5, 1, 4, 3, 9, 2, 2, 8]
+
+        for i, value in enumerate(values):
+            stats.update(value)
+            window = values[max(0, i - 2):i + 1]
+            self.assertEqual(stats.get_window_min(), min(window))
+            self.assertEqual(stats.get_window_max(), max(window))
+
+    def test_empty_stats(self):
+        """
+        Test that empty stats do not give a z score
+        """
+        stats = RollingStats()
+
+        self.assertIsNone(stats.get_z_score(5))
+        self.assertIsNone(stats.get_window_min())
+        self.assertEqual(stats.get_variance(), 0.0)
+
+class TestVitalsStatsTracker(unittest.TestCase):
+    """
+    Test suite for the per animal anomaly flags
+    """
+
+    def setUp(self):
+        self.tracker = VitalsStatsTracker()
+        for weight in [190.0, 191.0, 189.5, 190.5, 190.2, 189.8]:
+            self.tracker.record("LION001", {"weight_kg": weight, "heart_rate": 55})
+
+    def test_normal_reading_not_flagged(self):
+        """
+        Test that a reading in line with the animal's history is fine
+        """
+        self.assertEqual(self.tracker.record("LION001", {"weight_kg": 190.4, "heart_rate": 55}), [])
+
+    def test_drift_is_flagged(self):
+        """
+        Test that a reading inside the species range but far from the animal's mean is flagged
+        """
+        anomalies = self.tracker.record("LION001", {"weight_kg": 200.0})
+
+        self.assertEqual(len(anomalies), 1)
+        self.assertIn("unusual weight_kg", anomalies[0])
+        self.assertIn("above", anomalies[0])
+        self.assertEqual(self.tracker.get_latest_anomalies("LION001"), anomalies)
+
+    def test_change_after_identical_readings_is_flagged(self):
+        """
+        Test that a jump after readings that never changed is flagged instead of skipped
+        """
+        anomalies = self.tracker.record("LION001", {"weight_kg": 190.0, "heart_rate": 80})
+
+        self.assertEqual(len(anomalies), 1)
+        self.assertIn("unusual heart_rate", anomalies[0])
+        self.assertEqual(self.tracker.record("LION001", {"weight_kg": 190.0, "heart_rate": 55.5}), [])
+
+    def test_needs_enough_readings(self):
+        """
+        Test that animals with a short history are not flagged
+        """
+        tracker = VitalsStatsTracker()
+        for weight in [100.0, 101.0, 100.5]:
+            tracker.record("ZEBRA001", {"weight_kg": weight})
+
+        self.assertEqual(tracker.record("ZEBRA001", {"weight_kg": 300.0}), [])
+
+    def test_record_health_check_updates_stats(self):
+        """
+        Test that recording a health check feeds the tracker
+        """
+        animal = {"animal_id": "ZEBRA001", "species": "Zebra", "health_records": [
+            {"date": "2024-01-01T00:00:00", "data": {"weight_kg": 300.0}},
+            {"date": "2024-01-02T00:00:00", "data": {"weight_kg": 310.0}}
+        ]}
+        tracker = build_vitals_stats([animal])
+
+        record_health_check(animal, {"weight_kg": 320.0}, vitals_stats=tracker)
+
+        stats = tracker.get_stats("ZEBRA001", "weight_kg")
+        self.assertEqual(stats.count, 3)
+        self.assertAlmostEqual(stats.mean, 310.0)
+        self.assertIsNone(tracker.get_stats("ZEBRA001", "heart_rate"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from d1_project_pitch.src.zoo_vitals_store import VitalsStore, build_vitals_store
+from d1_project_pitch.src.zoo_health_tracking import record_health_check, calculate_health_status
+
+class TestVitalsStore(unittest.TestCase):
+    """
+    Test suite for the columnar vitals store
+    """
+
+    def setUp(self):
+        self.store = VitalsStore()
+        self.animal = {"animal_id": "LION001", "name": "Leo", "species": "Lion", "health_records": []}
+
+    def test_readings_are_stored_in_typed_columns(self):
+        """
+        Test that readings go into the arrays with missing values marked
+        """
+        self.store.append("LION001", {"weight_kg": 190.0, "heart_rate": 55, "vaccination_status": "current"}, 1000)
+        self.store.append("LION001", {"temperature_c": 38.5, "vaccination_status": "current"}, 2000)
+
+        columns = self.store.get_columns("LION001")
+        self.assertEqual(columns.timestamps.typecode, 'q')
+        self.assertEqual(columns.heart_rate.typecode, 'H')
+        self.assertEqual(list(columns.timestamps), [1000, 2000])
+        self.assertEqual(list(columns.vaccination_status), [1, 1])
+        self.assertEqual(self.store.vaccination_values, [None, "current"])
+
+        latest = self.store.get_latest("LION001")
+        self.assertNotIn("weight_kg", latest)
+        self.assertNotIn("heart_rate", latest)
+        self.assertEqual(latest["temperature_c"], 38.5)
+
+    def test_status_from_store_matches_records(self):
+        """
+        Equivalence testing: the status read from the store matches the dict path
+        """
+        readings = [
+            {"weight_kg": 200.0, "temperature_c": 38.5, "heart_rate": 55, "vaccination_status": "current", "vet_notes": "fine"},
+            {"weight_kg": 140.0, "temperature_c": 38.5, "heart_rate": 55, "vaccination_status": "overdue"},
+            {"weight_kg": 200.0, "temperature_c": 40.5, "heart_rate": 0, "vet_notes": "Limping on left leg"},
+            {"vaccination_status": "none", "vet_notes": "not eating"},
+        ]
+
+        animal = self.animal
+        for reading in readings:
+            animal = record_health_check(animal, reading, self.store)
+            self.assertEqual(calculate_health_status(animal, self.store), calculate_health_status(animal))
+
+        self.assertEqual(self.store.count("LION001"), 4)
+
+    def test_details_match_records_for_ints_and_odd_values(self):
+        """
+        Equivalence testing: int weights and heart rates that do not fit the column read back as they went in
+        """
+        readings = [
+            {"weight_kg": 140, "temperature_c": 40, "heart_rate": 130.7},
+            {"weight_kg": 300, "heart_rate": -5},
+            {"weight_kg": 150.5, "heart_rate": 70000},
+        ]
+
+        animal = self.animal
+        details = []
+        for reading in readings:
+            animal = record_health_check(animal, reading, self.store)
+            self.assertEqual(calculate_health_status(animal, self.store), calculate_health_status(animal))
+            details.append(calculate_health_status(animal, self.store)[1])
+
+        self.assertIn("underweight (140kg < 150kg)", details[0])
+        self.assertIn("high heart rate (130.7bpm > 70bpm)", details[0])
+        self.assertEqual(self.store.get_latest("LION001")["heart_rate"], 70000)
+
+    def test_build_from_existing_records(self):
+        """
+        Test loading existing health records into a store
+        """
+        self.animal["health_records"] = [{"date": "2024-01-15T10:00:00", "data": {"weight_kg": 300.0}}]
+
+        store = build_vitals_store([self.animal])
+
+        self.assertEqual(store.get_latest("LION001")["weight_kg"], 300.0)
+        self.assertEqual(store.get_latest("LION001").get_timestamp(), 1705312800000000)
+        self.assertIsNone(store.get_latest("ZEBRA001"))